@@ -0,0 +1,45 @@
+import numpy as np
+
+
+# =====================================================
+# Multi-timeframe as-of alignment
+# =====================================================
+class AsOf:
+    """
+    As-of positions of other timeframes for every bar of a base frame.
+
+    ends[name][i] is the number of rows of frames[name] opened at or before
+    base bar i, computed once with searchsorted. upto() then hands out a
+    positional slice instead of a boolean-masked copy, so
+
+        df_m1[df_m1.index <= t]            -> asof.upto("m1", i)
+        df_m5[df_m5.index <= t].iloc[-25:] -> asof.upto("m5", i, 25)
+    """
+
+    def __init__(self, base_index, **frames):
+        base = _keys(base_index)
+        self.frames = frames
+        self.ends = {
+            name: np.searchsorted(_keys(df.index), base, side="right")
+            for name, df in frames.items()
+        }
+
+    def end(self, name, i):
+        return int(self.ends[name][i])
+
+    def bounds(self, name, i, tail=None):
+        # (lo, hi) row range of frames[name] visible at base bar i
+        hi = self.end(name, i)
+        lo = 0 if tail is None else max(hi - tail, 0)
+        return lo, hi
+
+    def upto(self, name, i, tail=None):
+        lo, hi = self.bounds(name, i, tail)
+        return self.frames[name].iloc[lo:hi]
+
+
+def _keys(index):
+    # datetimes as ns integers: CandleStore frames are [ms], parsed strings [us]
+    if hasattr(index, "as_unit"):
+        return index.as_unit("ns").asi8
+    return np.asarray(index)
@@ -0,0 +1,241 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from importlib import import_module
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backtest import daily_breakout
+from backtest.ict import kernel
+from backtest.ict.engine import Bars
+from backtest.ict.poi import find_pois_displacement, find_pois_ict
+from backtest.ict.signals import choch_columns, engulfing_columns, reversal_columns
+from backtest.ict.structure import find_swings, label_breakout, label_structure
+from backtest.outcome import FirstPassage, resolve_outcomes
+from candle.synthetic import synthetic_mtf, synthetic_ohlcv
+
+# =====================================================
+# Setting
+# =====================================================
+SIZES = [10_000, 100_000, 1_000_000]
+REPEAT = 3
+SEED = 7
+GAPS = 20  # holes cut into every synthetic series (per 10k bars)
+RESULTS = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "data",
+    "bench",
+    "results.jsonl",
+)
+STRATEGIES = ["h1_ict_1", "h1_ict_2", "h1_poi_m1_m5", "h1_fvg_m1"]
+
+
+# =====================================================
+# Synthetic data (cached per size)
+# =====================================================
+@lru_cache(maxsize=None)
+def candles(size, interval):
+    # `size` bars of one timeframe
+    return synthetic_ohlcv(size, interval, SEED, gaps=GAPS * max(1, size // 10_000))
+
+
+@lru_cache(maxsize=None)
+def mtf(size):
+    # `size` M1 bars with the matching M5 / H1 frames
+    data = synthetic_mtf(size, SEED, gaps=GAPS * max(1, size // 10_000))
+    return data["1h"], data["5m"], data["1m"]
+
+
+# =====================================================
+# Stages : size -> zero-argument callable to time
+# =====================================================
+# Indicator stages get `size` bars of their own timeframe; pipeline stages
+# (align, engine.*) get `size` M1 bars plus the resampled M5 / H1.
+def _outcomes(size):
+    df = candles(size, "5m")
+    close = df["close"].to_numpy()
+    start = np.arange(1, len(df), 10)
+    side = np.where(start % 20 == 1, "LONG", "SHORT")
+    risk = close[start - 1] * 0.004
+    sign = np.where(side == "LONG", 1.0, -1.0)
+    tp = close[start - 1] + sign * risk * 3
+    sl = close[start - 1] - sign * risk
+
+    def run():
+        fp = FirstPassage(df["high"], df["low"])
+        resolve_outcomes(fp, start, side, tp, sl)
+
+    return run
+
+
+def _engine(name, jit):
+    def setup(size):
+        module = import_module(f"backtest.ict.{name}")
+        frames = mtf(size)
+        if jit:
+            module.make_engine(jit=True).run(*mtf(10_000))  # compile outside the timer
+        return lambda: module.make_engine(jit=jit).run(*frames)
+
+    return setup
+
+
+def _daily(stage):
+    def setup(size):
+        df = candles(size, "1d")
+        if stage is daily_breakout.prepare:
+            return lambda: daily_breakout.prepare(df)
+        ready = daily_breakout.prepare(df)
+        if stage is daily_breakout.add_returns:
+            ready = daily_breakout.add_signals(ready)
+        # both steps only (re)assign columns, so repeats start from the same frame
+        return lambda: stage(ready)
+
+    return setup
+
+
+STAGES = {
+    "ict.align": lambda size: lambda: Bars(*mtf(size)),
+    "ict.find_pois_ict": lambda size: lambda: find_pois_ict(candles(size, "1h")),
+    "ict.find_pois_displacement": lambda size: lambda: find_pois_displacement(
+        candles(size, "1h")
+    ),
+    "ict.find_swings": lambda size: lambda: find_swings(candles(size, "1h")),
+    "ict.label_structure": lambda size: lambda: label_structure(candles(size, "1h")),
+    "ict.label_breakout": lambda size: lambda: label_breakout(candles(size, "1h")),
+    "ict.choch_columns": lambda size: lambda: choch_columns(candles(size, "1m")),
+    "ict.engulfing_columns": lambda size: lambda: engulfing_columns(
+        candles(size, "5m")
+    ),
+    "ict.reversal_columns": lambda size: lambda: reversal_columns(candles(size, "5m")),
+    "ict.outcomes": _outcomes,
+    **{f"engine.{name}": _engine(name, False) for name in STRATEGIES},
+    **{
+        f"engine.{name}.jit": _engine(name, True)
+        for name in STRATEGIES
+        if kernel.njit is not None
+    },
+    "daily.prepare": _daily(daily_breakout.prepare),
+    "daily.add_signals": _daily(daily_breakout.add_signals),
+    "daily.add_returns": _daily(daily_breakout.add_returns),
+}
+
+
+# =====================================================
+# Runner
+# =====================================================
+def timeit(fn, repeat=REPEAT):
+    # best of `repeat` wall-clock runs
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmarks(sizes=SIZES, stages=None, repeat=REPEAT, on_result=None):
+    """
+    Time every selected stage at every size -> list of result rows.
+
+    stages are name prefixes ("ict", "engine.h1_ict_1", ...); None runs all.
+    Data generation and numba compilation happen outside the timer.
+    """
+    names = [n for n in STAGES if not stages or any(n.startswith(s) for s in stages)]
+    rows = []
+    for size in sizes:
+        for name in names:
+            seconds = timeit(STAGES[name](size), repeat)
+            row = {
+                "stage": name,
+                "size": size,
+                "seconds": seconds,
+                "bars_per_sec": size / seconds if seconds else None,
+            }
+            rows.append(row)
+            if on_result:
+                on_result(row)
+    return rows
+
+
+def _commit():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def last_record(path=RESULTS):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        lines = [line for line in f if line.strip()]
+    return json.loads(lines[-1]) if lines else None
+
+
+def save_record(rows, path=RESULTS):
+    # one JSON line per run, so runs can be compared commit to commit
+    record = {
+        "commit": _commit(),
+        "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "numba": kernel.njit is not None,
+        "results": rows,
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps(record) + "\n")
+    return record
+
+
+def print_report(rows, previous=None):
+    before = {}
+    if previous:
+        before = {(r["stage"], r["size"]): r["seconds"] for r in previous["results"]}
+        print(f"\ncompared with {previous['commit']} ({previous['time']})")
+    print(f"\n{'stage':<32}{'size':>10}{'seconds':>12}{'bars/s':>14}{'change':>10}")
+    for r in rows:
+        old = before.get((r["stage"], r["size"]))
+        change = f"{(r['seconds'] / old - 1) * 100:+.1f}%" if old else ""
+        print(
+            f"{r['stage']:<32}{r['size']:>10,}{r['seconds']:>12.4f}"
+            f"{r['bars_per_sec'] or 0:>14,.0f}{change:>10}"
+        )
+
+
+# =====================================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline backtest benchmarks")
+    parser.add_argument("stages", nargs="*", help="stage name prefixes (default: all)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--out", default=RESULTS, help="JSON lines history file")
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args()
+
+    previous = last_record(args.out)
+    print(f"🚀 Benchmarking sizes {args.sizes} (best of {args.repeat})...")
+    rows = run_benchmarks(
+        args.sizes,
+        args.stages,
+        args.repeat,
+        on_result=lambda r: print(
+            f"⏱️  {r['stage']} @ {r['size']:,}: {r['seconds']:.4f}s"
+        ),
+    )
+    print_report(rows, previous)
+    if not args.no_save:
+        save_record(rows, args.out)
+        print(f"\n💾 Saved to {args.out}")
@@ -1,43 +1,43 @@
-import pandas as pd
-import time
-from hyperliquid.info import Info
-from hyperliquid.utils import constants
+import os
+import sys
 
-info = Info(constants.TESTNET_API_URL, skip_ws=True)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backtest.instrument import instrument, stage, timed
+from candle.store import CandleStore
+from live.ratelimit import limited_info
 
 
-def run_backtest(coin, interval):
-    # 1. Fetch historical candle data
-    # snapshot fetches up to 5000 candles
-    candles = info.candles_snapshot(coin, interval, 0, int(time.time() * 5000))
-    df = pd.DataFrame(candles)
-
-    # 2. Data Preprocessing
-    # Convert Unix timestamp (ms) to readable KST timezone
-    df["Time"] = (
-        pd.to_datetime(df["t"], unit="ms")
-        .dt.tz_localize("UTC")
-        .dt.tz_convert("Asia/Seoul")
-    )
+# 2. Data Preprocessing
+@timed()
+def prepare(df):
+    df = df.reset_index()
+
+    # Convert UTC timestamp to readable KST timezone
+    df["Time"] = df["timestamp"].dt.tz_localize("UTC").dt.tz_convert("Asia/Seoul")
 
     # Format date string for better readability
     df["Time"] = df["Time"].dt.strftime("%Y-%m-%d %H:%M")
 
-    # Select necessary columns and convert to float
-    df = df[["Time", "o", "h", "l", "c"]].copy()
+    # Select necessary columns
+    df = df[["Time", "open", "high", "low", "close"]].copy()
     df.columns = ["Date", "Open", "High", "Low", "Close"]
-    df[["Open", "High", "Low", "Close"]] = df[["Open", "High", "Low", "Close"]].astype(
-        float
-    )
+    return df
 
-    # 3. Strategy Logic: Daily High Breakout
+
+# 3. Strategy Logic: Daily High Breakout
+@timed()
+def add_signals(df):
     # Prev_High is the high price of the previous candle
     df["Prev_High"] = df["High"].shift(1)
 
     # Buy Signal: If current candle's High is greater than previous High
     df["Signal"] = df["High"] > df["Prev_High"]
+    return df
+
 
-    # 4. Performance Calculation
+# 4. Performance Calculation
+@timed()
+def add_returns(df):
     df["Return"] = 1.0
 
     # Calculate daily return if signal is triggered
@@ -46,6 +46,20 @@ def run_backtest(coin, interval):
 
     # Cumulative return (compounding)
     df["Total_Return"] = df["Return"].cumprod()
+    return df
+
+
+def run_backtest(coin, interval):
+    # 1. Fetch historical candle data
+    # full history from the local candle store, only new bars hit the API
+    with stage("fetch"):
+        df = CandleStore(connect=limited_info).load(coin, interval, 0)
+    if df is None:
+        print("No data found.")
+        return
+
+    instrument.count("bars", len(df))
+    df = add_returns(add_signals(prepare(df)))
 
     print(f"--- {coin} Backtest Result ({interval}) ---")
     print(df[["Date", "Prev_High", "High", "Close", "Total_Return"]].tail(10))
@@ -53,4 +67,5 @@ def run_backtest(coin, interval):
 
 
 if __name__ == "__main__":
-    run_backtest("BTC", "1d")
+    with instrument.run("daily_breakout"):
+        run_backtest("BTC", "1d")
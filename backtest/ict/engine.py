@@ -0,0 +1,453 @@
+import numpy as np
+import pandas as pd
+
+from backtest.align import AsOf
+from backtest.instrument import count, stage
+from backtest.ict.poi import DETECTORS, FINDERS
+from backtest.ict.signals import (
+    choch_columns,
+    direction_at,
+    engulfing_columns,
+    reversal_columns,
+    signal_at,
+)
+from backtest.ict.structure import BULLISH, NEUTRAL, label_breakout, label_structure
+from backtest.ict.kernel import ict_loop
+from backtest.ict.zone_index import ZoneIndex
+from backtest.outcome import OPEN, RESULT_NAMES, FirstPassage, resolve_outcomes
+
+
+# =====================================================
+# Bars : H1 / M5 / M1 merged on the M5 clock
+# =====================================================
+class Bars:
+    """
+    One run's candles. The M5 frame drives the event loop; h1_end[i] / m1_end[i]
+    are the number of H1 / M1 candles opened at or before M5 bar i.
+
+    Indicator arrays are memoized per Bars (see memo), so engines that share
+    one Bars -- several parameter sets, or several windows of the same data
+    -- compute each indicator once.
+    """
+
+    def __init__(self, df_h1, df_m5, df_m1):
+        self.h1, self.m5, self.m1 = df_h1, df_m5, df_m1
+        self.asof = AsOf(df_m5.index, h1=df_h1, m1=df_m1)
+        self.h1_end = self.asof.ends["h1"]
+        self.m1_end = self.asof.ends["m1"]
+        self.time = df_m5.index
+        self.close = df_m5["close"].to_numpy(dtype=float)
+        self.cache = {}
+
+    def memo(self, key, fn):
+        # fn() once per key; key names the indicator and its parameters
+        if key not in self.cache:
+            self.cache[key] = fn()
+        return self.cache[key]
+
+
+def _key(component, *extra):
+    return (type(component).__name__, tuple(sorted(component.params.items())), *extra)
+
+
+# =====================================================
+# POI source
+# =====================================================
+class POISource:
+    """
+    H1 zones kept in a price index until consumed.
+
+    The backtest knows the whole H1 frame up front, so zones are detected in
+    one vectorized pass and released once the candles they need have opened;
+    this yields the same zones, in the same order, as feeding POITracker one
+    candle at a time.
+    """
+
+    def __init__(self, kind, group, **params):
+        self.kind = kind
+        self.group = group
+        self.params = params
+
+    def prepare(self, bars):
+        self.bars = bars
+        self.index = ZoneIndex(group=self.group)
+        self.pending, self.ready_at = bars.memo(_key(self, self.kind), self._find)
+        self.next = 0
+
+    def _find(self):
+        found = FINDERS[self.kind](self.bars.h1, **self.params)
+        warmup = DETECTORS[self.kind][1](self.params)
+        ready_at = np.maximum(found["pos"].to_numpy(dtype=np.int64) + 1, warmup)
+        return found.to_dict("records"), ready_at
+
+    def advance(self, i):
+        # H1 candle events up to M5 bar i
+        end = self.bars.h1_end[i]
+        while self.next < len(self.pending) and self.ready_at[self.next] <= end:
+            self.index.insert(self.pending[self.next])
+            self.next += 1
+
+    def zones(self, price):
+        return self.index.stab(price)
+
+    def columns(self):
+        return self.bars.memo(_key(self, self.kind, self.group), self._columns)
+
+    def _columns(self):
+        # zone arrays for the compiled loop, in insertion order
+        groups, _ = pd.factorize(pd.Series([self.group(z) for z in self.pending]))
+        return (
+            np.array([1 if z["side"] == "LONG" else -1 for z in self.pending]),
+            np.array([z["top"] for z in self.pending], dtype=float),
+            np.array([z["bottom"] for z in self.pending], dtype=float),
+            self.ready_at,
+            groups.astype(np.int64),
+            len(set(groups)),
+        )
+
+    def consume(self, zone):
+        self.index.consume(zone)
+
+
+# =====================================================
+# Trend filters : M5 bar -> BULLISH / BEARISH / NEUTRAL
+# =====================================================
+class SwingTrend:
+    # H1 swing structure (h1_poi_m1_m5 / h1_fvg_m1)
+    def __init__(self, min_dist=0.003, left=2, right=2):
+        self.params = dict(left=left, right=right, min_dist=min_dist)
+
+    label = staticmethod(label_structure)
+
+    def prepare(self, bars):
+        self.bars = bars
+        self.labels = bars.memo(
+            _key(self), lambda: self.label(bars.h1, **self.params).to_numpy()
+        )
+        self.end = bars.h1_end
+
+    def __call__(self, i):
+        n = self.end[i]
+        return self.labels[n - 1] if n else NEUTRAL
+
+    def columns(self):
+        return self.bars.memo(_key(self, "columns"), self._columns)
+
+    def _columns(self):
+        # +1 / -1 / 0 for every M5 bar
+        codes = np.where(
+            self.labels == BULLISH, 1, np.where(self.labels == NEUTRAL, 0, -1)
+        )
+        codes = np.append(codes, 0)  # end == 0 reads index -1
+        return codes[self.end - 1].astype(np.int64)
+
+
+class BreakoutTrend(SwingTrend):
+    # close beyond the previous H1 range (h1_ict_2)
+    def __init__(self, lookback=48, min_bars=40):
+        self.params = dict(lookback=lookback, min_bars=min_bars)
+
+    label = staticmethod(label_breakout)
+
+
+# =====================================================
+# Triggers : (M5 bar, zone side) -> (signal side or None, stop)
+# =====================================================
+def side_columns(long, long_sl, short, short_sl):
+    # fired masks -> (+1 / 0 state, stop) per side for the compiled loop
+    return (
+        long.astype(np.int64),
+        np.asarray(long_sl, dtype=float),
+        short.astype(np.int64),
+        np.asarray(short_sl, dtype=float),
+    )
+
+
+class CHoCH:
+    # M1 change of character on the zone side
+    def __init__(self, swing=9, stop=5, min_len=15):
+        self.params = dict(swing=swing, stop=stop, min_len=min_len)
+
+    def prepare(self, bars):
+        self.bars = bars
+        self.cols = bars.memo(_key(self), lambda: choch_columns(bars.m1, **self.params))
+        self.end = bars.m1_end
+
+    def __call__(self, i, side):
+        ok, sl = signal_at(self.cols, self.end[i] - 1, side)
+        return (side, sl) if ok else (None, None)
+
+    def columns(self):
+        return self.bars.memo(_key(self, "columns"), self._columns)
+
+    def _columns(self):
+        k = self.end - 1
+        seen = k >= 0
+        return side_columns(
+            seen & self.cols["long"][k],
+            self.cols["long_sl"][k],
+            seen & self.cols["short"][k],
+            self.cols["short_sl"][k],
+        )
+
+
+class Engulfing:
+    # M5 displacement engulfing on the zone side
+    def __init__(self, lookback=20, factor=1.5):
+        self.params = dict(lookback=lookback, factor=factor)
+
+    def prepare(self, bars):
+        self.cols = bars.memo(
+            _key(self), lambda: engulfing_columns(bars.m5, **self.params)
+        )
+
+    def __call__(self, i, side):
+        ok, sl = signal_at(self.cols, i, side)
+        return (side, sl) if ok else (None, None)
+
+    def columns(self):
+        c = self.cols
+        return side_columns(c["long"], c["long_sl"], c["short"], c["short_sl"])
+
+
+class Reversal:
+    # M5 two-candle reversal in either direction
+    params = {}
+
+    def prepare(self, bars):
+        self.cols = bars.memo(_key(self), lambda: reversal_columns(bars.m5))
+
+    def __call__(self, i, side):
+        return direction_at(self.cols, i)
+
+    def columns(self):
+        # a reversal answers for both sides: the other direction is a -1
+        c = self.cols
+        long = c["long"].astype(np.int64) - c["short"]
+        return long, c["long_sl"], -long, c["short_sl"]
+
+
+class FirstOf:
+    # the first trigger that fires decides the signal and its stop
+    def __init__(self, *triggers):
+        self.triggers = triggers
+
+    def prepare(self, bars):
+        for trigger in self.triggers:
+            trigger.prepare(bars)
+
+    def __call__(self, i, side):
+        for trigger in self.triggers:
+            signal, sl = trigger(i, side)
+            if signal:
+                return signal, sl
+        return None, None
+
+    def columns(self):
+        cols = [trigger.columns() for trigger in self.triggers]
+        long, long_sl, short, short_sl = cols[-1]
+        for l_state, l_sl, s_state, s_sl in reversed(cols[:-1]):
+            long_sl = np.where(l_state != 0, l_sl, long_sl)
+            long = np.where(l_state != 0, l_state, long)
+            short_sl = np.where(s_state != 0, s_sl, short_sl)
+            short = np.where(s_state != 0, s_state, short)
+        return long, long_sl, short, short_sl
+
+
+# =====================================================
+# Engine
+# =====================================================
+class Engine:
+    """
+    Bar-event backtest loop shared by the ICT strategies.
+
+    For every M5 bar: skip while a position is open (single_position), ask
+    the trend filter for a direction, feed new H1 candles to the POI source,
+    then try the trigger on every zone containing the close. A fill enters at
+    the close, sizes TP off the stop with rr and exits on the first touch of
+    either level (backtest.outcome). The filled zone is consumed.
+
+    jit=True runs the same loop through backtest.ict.kernel over plain
+    arrays (numba-compiled when numba is installed) with identical trades.
+
+    run_bars(bars, start, end) restricts entries and exits to M5 bars
+    [start, end) of a prepared Bars, for walk-forward windows; indicators
+    still see the full history before start.
+    """
+
+    def __init__(
+        self,
+        poi,
+        trigger,
+        trend=None,
+        rr=3.0,
+        min_risk=5,
+        warmup=50,
+        single_position=True,
+        verbose=False,
+        jit=False,
+    ):
+        self.poi = poi
+        self.trigger = trigger
+        self.trend = trend
+        self.rr = rr
+        self.min_risk = min_risk
+        self.warmup = warmup
+        self.single_position = single_position
+        self.verbose = verbose
+        self.jit = jit
+        self.open_trade = None
+
+    def run(self, df_h1, df_m5, df_m1):
+        return self.run_bars(Bars(df_h1, df_m5, df_m1))
+
+    def run_bars(self, bars, start=0, end=None):
+        for name, component in (
+            ("poi_detection", self.poi),
+            ("structure_detection", self.trend),
+            ("trigger_columns", self.trigger),
+        ):
+            if component is not None:
+                with stage(name):
+                    component.prepare(bars)
+        end = len(bars.m5) if end is None else end
+        count("bars", max(0, end - max(self.warmup, start)))
+        if self.jit:
+            with stage("kernel"):
+                trades = self.run_compiled(bars, start, end)
+        else:
+            with stage("loop"):
+                trades = self._loop(bars, start, end)
+        count("trades", len(trades))
+        return trades
+
+    def _loop(self, bars, start, end):
+        with stage("outcome_index"):
+            outcomes = bars.memo(
+                "outcomes", lambda: FirstPassage(bars.m5["high"], bars.m5["low"])
+            )
+
+        trades = []
+        self.open_trade = None
+        flat_from = 0  # first bar a new position may be opened on
+        total = len(bars.m5)
+        for i in range(max(self.warmup, start), end):
+            if self.verbose and i % 500 == 0:
+                print(f"⏳ Progress: {i}/{total} ({(i/total)*100:.1f}%)")
+            if i < flat_from:
+                continue
+
+            want = None
+            if self.trend is not None:
+                state = self.trend(i)
+                if state == NEUTRAL:
+                    continue
+                want = "LONG" if state == BULLISH else "SHORT"
+
+            self.poi.advance(i)
+            price = bars.close[i]
+            for zone in self.poi.zones(price):
+                side = zone["side"]
+                if want is not None and side != want:
+                    continue
+
+                with stage("trigger_check"):
+                    signal, sl = self.trigger(i, side)
+                if signal != side:
+                    continue
+                risk = abs(price - sl)
+                if risk < self.min_risk:
+                    continue
+                tp = (
+                    price + risk * self.rr if side == "LONG" else price - risk * self.rr
+                )
+
+                with stage("outcome"):
+                    result, exit_idx = resolve_outcomes(
+                        outcomes, i + 1, side, tp, sl, end=end
+                    )
+                result, exit_idx = int(result[0]), int(exit_idx[0])
+                trade = {
+                    "time": bars.time[i],
+                    "side": side,
+                    "entry": price,
+                    "sl": sl,
+                    "tp": tp,
+                    "result": RESULT_NAMES[result],
+                    "exit_time": bars.time[exit_idx] if result != OPEN else None,
+                }
+                if self.single_position:
+                    # an OPEN trade holds the position until the range runs out
+                    flat_from = exit_idx
+                if result == OPEN:
+                    self.open_trade = trade
+                    if self.single_position:
+                        break
+                    continue
+
+                trades.append(trade)
+                self.poi.consume(zone)
+                break
+
+        return trades
+
+    def run_compiled(self, bars, start=0, end=None):
+        m5 = bars.m5
+        total = len(m5)
+        if self.trend is not None:
+            trend = self.trend.columns()
+        else:
+            trend = np.zeros(total, dtype=np.int64)
+        z_side, z_top, z_bot, z_ready, z_group, n_groups = self.poi.columns()
+        long, long_sl, short, short_sl = self.trigger.columns()
+
+        entry, side, sl, tp, result, exit_idx, open_trade = ict_loop(
+            bars.close,
+            m5["high"].to_numpy(dtype=float),
+            m5["low"].to_numpy(dtype=float),
+            self.trend is not None,
+            trend,
+            bars.h1_end,
+            z_side,
+            z_top,
+            z_bot,
+            z_ready,
+            z_group,
+            n_groups,
+            long,
+            long_sl,
+            short,
+            short_sl,
+            float(self.rr),
+            float(self.min_risk),
+            self.warmup,
+            self.single_position,
+            start,
+            total if end is None else end,
+        )
+
+        def record(i, s, stop, target, res, j):
+            return {
+                "time": bars.time[i],
+                "side": "LONG" if s == 1 else "SHORT",
+                "entry": bars.close[i],
+                "sl": stop,
+                "tp": target,
+                "result": RESULT_NAMES[int(res)],
+                "exit_time": bars.time[j] if res != OPEN else None,
+            }
+
+        self.open_trade = None
+        if open_trade[0] >= 0:
+            self.open_trade = record(*open_trade, OPEN, -1)
+        return [
+            record(*row)
+            for row in zip(
+                entry.tolist(),
+                side.tolist(),
+                sl,
+                tp,
+                result.tolist(),
+                exit_idx.tolist(),
+            )
+        ]
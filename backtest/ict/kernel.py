@@ -0,0 +1,166 @@
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional
+    njit = None
+
+
+# =====================================================
+# Compiled ICT bar loop
+# =====================================================
+def _ict_loop(
+    close,
+    high,
+    low,
+    has_trend,
+    trend,
+    h1_end,
+    z_side,
+    z_top,
+    z_bot,
+    z_ready,
+    z_group,
+    n_groups,
+    long_state,
+    long_sl,
+    short_state,
+    short_sl,
+    rr,
+    min_risk,
+    warmup,
+    single_position,
+    start,
+    end,
+):
+    """
+    Engine.run over plain arrays, one M5 bar at a time.
+
+    trend is +1 / -1 / 0 per M5 bar, zones are in insertion order with
+    side +1 / -1, the bar at which they are released (z_ready vs h1_end)
+    and an integer group id. *_state is 1 when the trigger fires for that
+    side, -1 when it picks the other side and 0 otherwise.
+
+    Entries are taken on bars [max(warmup, start), end) and exits are only
+    looked for before end. Returns the closed trades as (entry bar, side, sl,
+    tp, result, exit bar) arrays plus the last unresolved trade (entry bar -1
+    when there is none).
+    """
+    n = close.shape[0]
+    nz = z_side.shape[0]
+
+    t_entry = np.empty(n, np.int64)
+    t_side = np.empty(n, np.int64)
+    t_sl = np.empty(n, np.float64)
+    t_tp = np.empty(n, np.float64)
+    t_result = np.empty(n, np.int64)
+    t_exit = np.empty(n, np.int64)
+    count = 0
+
+    open_entry, open_side, open_sl, open_tp = -1, 0, 0.0, 0.0
+
+    active = np.empty(nz, np.int64)  # released, unconsumed zones in insertion order
+    n_active = 0
+    used = np.zeros(n_groups, np.bool_)
+    nxt = 0
+    flat_from = 0
+
+    for i in range(max(warmup, start), end):
+        if i < flat_from:
+            continue
+
+        want = 0
+        if has_trend:
+            want = trend[i]
+            if want == 0:
+                continue
+
+        h1_seen = h1_end[i]
+        while nxt < nz and z_ready[nxt] <= h1_seen:
+            if not used[z_group[nxt]]:
+                active[n_active] = nxt
+                n_active += 1
+            nxt += 1
+
+        price = close[i]
+        for a in range(n_active):
+            z = active[a]
+            if z_bot[z] > price or z_top[z] < price:
+                continue
+            side = z_side[z]
+            if want != 0 and side != want:
+                continue
+
+            if side == 1:
+                if long_state[i] != 1:
+                    continue
+                sl = long_sl[i]
+            else:
+                if short_state[i] != 1:
+                    continue
+                sl = short_sl[i]
+            risk = abs(price - sl)
+            if risk < min_risk:
+                continue
+            tp = price + risk * rr if side == 1 else price - risk * rr
+
+            # first touch, TP checked first (backtest.outcome, ambiguous="tp")
+            result = 0
+            exit_idx = end
+            for j in range(i + 1, end):
+                if side == 1:
+                    if high[j] >= tp:
+                        result = 1
+                    elif low[j] <= sl:
+                        result = -1
+                else:
+                    if low[j] <= tp:
+                        result = 1
+                    elif high[j] >= sl:
+                        result = -1
+                if result != 0:
+                    exit_idx = j
+                    break
+
+            if single_position:
+                flat_from = exit_idx
+            if result == 0:
+                open_entry, open_side, open_sl, open_tp = i, side, sl, tp
+                if single_position:
+                    break
+                continue
+
+            t_entry[count] = i
+            t_side[count] = side
+            t_sl[count] = sl
+            t_tp[count] = tp
+            t_result[count] = result
+            t_exit[count] = exit_idx
+            count += 1
+
+            # consume every live zone of the group
+            g = z_group[z]
+            used[g] = True
+            k = 0
+            for b in range(n_active):
+                if z_group[active[b]] != g:
+                    active[k] = active[b]
+                    k += 1
+            n_active = k
+            break
+
+    return (
+        t_entry[:count],
+        t_side[:count],
+        t_sl[:count],
+        t_tp[:count],
+        t_result[:count],
+        t_exit[:count],
+        (open_entry, open_side, open_sl, open_tp),
+    )
+
+
+if njit is not None:
+    ict_loop = njit(cache=True)(_ict_loop)
+else:
+    ict_loop = _ict_loop
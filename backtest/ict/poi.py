@@ -0,0 +1,271 @@
+from collections import deque
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# created: open time of c3, the candle that completes the pattern; pos: its row
+# in the H1 frame. Engine arms a zone from H1 row pos + 1 and the displacement
+# variants' poi_id keys on created. The old h1_ict_1 / h1_ict_2 loops emitted
+# neither key; their other fields are unchanged (tests/test_poi_parity.py).
+ZONE_COLUMNS = ["type", "side", "top", "bottom", "created", "pos"]
+
+
+# =====================================================
+# Helpers
+# =====================================================
+def candle_arrays(df):
+    return (
+        df["open"].to_numpy(dtype=float),
+        df["high"].to_numpy(dtype=float),
+        df["low"].to_numpy(dtype=float),
+        df["close"].to_numpy(dtype=float),
+    )
+
+
+def window_mean(x, start, width):
+    # mean of x[start[k] : start[k] + width] for every k, NaN where start < 0
+    out = np.full(len(start), np.nan)
+    if len(x) < width:
+        return out
+    means = sliding_window_view(x, width).mean(axis=1)
+    ok = (start >= 0) & (start < len(means))
+    out[ok] = means[start[ok]]
+    return out
+
+
+def first_wick_overlap(rows, width, color_ok, wick_top, wick_bot, fvg_top, fvg_bot):
+    """
+    For every gap row i, scan candles j in [i - width, i - 3] and return the
+    first one whose wick overlaps the gap, as (found, top, bottom) arrays.
+    """
+    if len(rows) == 0:
+        empty = np.zeros(0)
+        return np.zeros(0, dtype=bool), empty, empty
+    j = rows[:, None] - width + np.arange(width - 2)[None, :]
+    top = np.minimum(fvg_top[:, None], wick_top[j])
+    bot = np.maximum(fvg_bot[:, None], wick_bot[j])
+    hit = color_ok[j] & (top > bot)
+    first = hit.argmax(axis=1)
+    found = hit.any(axis=1)
+    k = np.arange(len(rows))
+    return found, top[k, first], bot[k, first]
+
+
+def make_zones(index, parts):
+    # parts: list of (type, side, pos, top, bottom) array tuples
+    frames = [
+        pd.DataFrame(
+            {
+                "type": t,
+                "side": s,
+                "top": top,
+                "bottom": bot,
+                "created": index[pos],
+                "pos": pos,
+                # keeps the row-by-row append order on ties
+                "_order": order,
+            }
+        )
+        for order, (t, s, pos, top, bot) in enumerate(parts)
+        if len(pos)
+    ]
+    if not frames:
+        return pd.DataFrame(columns=ZONE_COLUMNS)
+    zones = pd.concat(frames, ignore_index=True)
+    zones = zones.sort_values(["pos", "_order"], kind="stable")
+    return zones[ZONE_COLUMNS].reset_index(drop=True)
+
+
+# =====================================================
+# H1 POI : h1_ict_1 / h1_ict_2
+# =====================================================
+def find_pois_ict(df, n=24, factor=2.0, fvg_type="FVG", ob_type="OB"):
+    """
+    Vectorized POI detector for h1_ict_1 / h1_ict_2.
+
+    Displacement is measured against the mean body of the n candles before
+    c2. Same-colored 3-candle gaps become FVG zones clipped to the first
+    opposite-colored wick in the tail search range, 2-vs-1 colored gaps become
+    OB zones on c1.
+    """
+    if len(df) < n + 5:
+        return make_zones(df.index, [])
+    o, h, l, c = candle_arrays(df)
+    return make_zones(df.index, ict_parts(o, h, l, c, n, factor, fvg_type, ob_type))
+
+
+def ict_parts(o, h, l, c, n=24, factor=2.0, fvg_type="FVG", ob_type="OB"):
+    bull, bear = c > o, c < o
+    body = np.abs(c - o)
+
+    i = np.arange(n, len(o))
+    # i == n reads an empty slice in the row-by-row version, so its mean is
+    # NaN and the displacement filter lets it through
+    avg = window_mean(body, i - (n + 1), n)
+    disp = ~(body[i - 1] < avg * factor)
+
+    long_gap = l[i] > h[i - 2]
+    short_gap = h[i] < l[i - 2]
+    b1, b2, b3 = bull[i - 2], bull[i - 1], bull[i]
+    s1, s2, s3 = bear[i - 2], bear[i - 1], bear[i]
+
+    # ---------- FVG (candle tail overlap) ----------
+    fvg_long = i[disp & long_gap & b1 & b2 & b3]
+    found, top, bot = first_wick_overlap(
+        fvg_long, n, bear, h, np.maximum(o, c), l[fvg_long], h[fvg_long - 2]
+    )
+    fvg_long_parts = (fvg_type, "LONG", fvg_long[found], top[found], bot[found])
+
+    fvg_short = i[disp & short_gap & s1 & s2 & s3]
+    found, top, bot = first_wick_overlap(
+        fvg_short, n, bull, np.minimum(o, c), l, l[fvg_short - 2], h[fvg_short]
+    )
+    fvg_short_parts = (fvg_type, "SHORT", fvg_short[found], top[found], bot[found])
+
+    # ---------- OB ----------
+    ob_long = i[disp & long_gap & ((s1 & b2 & b3) | (b1 & b2 & s3))]
+    ob_short = i[disp & short_gap & ((b1 & s2 & s3) | (s1 & s2 & b3))]
+
+    return [
+        fvg_long_parts,
+        fvg_short_parts,
+        (ob_type, "LONG", ob_long, h[ob_long - 2], l[ob_long - 2]),
+        (ob_type, "SHORT", ob_short, h[ob_short - 2], l[ob_short - 2]),
+    ]
+
+
+# =====================================================
+# H1 POI : h1_poi_m1_m5 / h1_fvg_m1
+# =====================================================
+def find_pois_displacement(df, lookback=30, factor=2.0, fvg=True):
+    """
+    Vectorized POI detector for h1_poi_m1_m5 / h1_fvg_m1.
+
+    c2 must be a displacement candle against the lookback window. Any gap
+    with a 2-vs-1 color split is an OB on c1; with fvg=True a same-colored gap
+    becomes an FVG clipped to the first opposite-colored wick.
+    """
+    if len(df) <= lookback:
+        return make_zones(df.index, [])
+    o, h, l, c = candle_arrays(df)
+    return make_zones(df.index, displacement_parts(o, h, l, c, lookback, factor, fvg))
+
+
+def displacement_parts(o, h, l, c, lookback=30, factor=2.0, fvg=True):
+    bull = c > o
+    body = np.abs(c - o)
+
+    i = np.arange(lookback, len(o))
+    avg = window_mean(body, i - lookback, lookback - 1)
+    disp = body[i - 1] >= avg * factor
+
+    bull_gap = l[i] > h[i - 2]
+    bear_gap = h[i] < l[i - 2]
+    bulls = bull[i - 2].astype(int) + bull[i - 1] + bull[i]
+    base = disp & (bull_gap | bear_gap)
+
+    # ---------- OB ----------
+    ob_long = i[base & (bulls == 2)]
+    ob_short = i[base & (bulls == 1)]
+    parts = [
+        ("OB", "LONG", ob_long, h[ob_long - 2], l[ob_long - 2]),
+        ("OB", "SHORT", ob_short, h[ob_short - 2], l[ob_short - 2]),
+    ]
+
+    # ---------- Enhanced FVG ----------
+    if fvg:
+        fvg_long = i[base & (bulls == 3) & bull_gap]
+        found, top, bot = first_wick_overlap(
+            fvg_long, lookback, c < o, h, np.maximum(o, c), l[fvg_long], h[fvg_long - 2]
+        )
+        parts.append(("FVG", "LONG", fvg_long[found], top[found], bot[found]))
+
+        fvg_short = i[base & (bulls == 0) & bear_gap]
+        found, top, bot = first_wick_overlap(
+            fvg_short,
+            lookback,
+            bull,
+            np.minimum(o, c),
+            l,
+            l[fvg_short - 2],
+            h[fvg_short],
+        )
+        parts.append(("FVG", "SHORT", fvg_short[found], top[found], bot[found]))
+
+    return parts
+
+
+# =====================================================
+# Incremental POI tracker
+# =====================================================
+DETECTORS = {
+    # kind: (parts function, rows needed before the first zone can exist)
+    "ict": (ict_parts, lambda p: p.get("n", 24) + 5),
+    "displacement": (displacement_parts, lambda p: p.get("lookback", 30) + 1),
+}
+FINDERS = {"ict": find_pois_ict, "displacement": find_pois_displacement}
+
+
+class POITracker:
+    """
+    Stateful POI detector fed one H1 candle at a time.
+
+    Every update only evaluates the newest candle against a short tail of
+    history, so zones are found in O(1) per candle instead of re-scanning the
+    whole frame. The zones list always equals find_pois_*(all candles so far).
+    """
+
+    def __init__(self, kind="displacement", **params):
+        self.parts_fn, warmup = DETECTORS[kind]
+        self.params = params
+        self.warmup = warmup(params)
+        self.buf = deque(maxlen=self.warmup)
+        self.count = 0
+        self.zones = []
+
+    def update(self, ts, o, h, l, c):
+        self.buf.append((ts, o, h, l, c))
+        self.count += 1
+        if self.count < self.warmup:
+            return []
+
+        ts_buf = [row[0] for row in self.buf]
+        arr = np.array([row[1:] for row in self.buf], dtype=float)
+        parts = self.parts_fn(arr[:, 0], arr[:, 1], arr[:, 2], arr[:, 3], **self.params)
+
+        # first full window: emit everything found so far, then only the newest row
+        last = len(self.buf) - 1
+        offset = self.count - len(self.buf)
+        new = []
+        for order, (t, side, pos, top, bot) in enumerate(parts):
+            for k in range(len(pos)):
+                if self.count > self.warmup and pos[k] != last:
+                    continue
+                new.append(
+                    (
+                        int(pos[k]),
+                        order,
+                        {
+                            "type": t,
+                            "side": side,
+                            "top": float(top[k]),
+                            "bottom": float(bot[k]),
+                            "created": ts_buf[pos[k]],
+                            "pos": offset + int(pos[k]),
+                        },
+                    )
+                )
+        new = [z for _, _, z in sorted(new, key=lambda x: (x[0], x[1]))]
+        self.zones.extend(new)
+        return new
+
+    def advance(self, df, t):
+        # ingest every candle of df opened at or before t that is not seen yet,
+        # returns the zones formed by those candles
+        new = []
+        while self.count < len(df) and df.index[self.count] <= t:
+            row = df.iloc[self.count]
+            new += self.update(
+                df.index[self.count], row["open"], row["high"], row["low"], row["close"]
+            )
+        return new
@@ -0,0 +1,190 @@
+from collections import deque
+import numpy as np
+import pandas as pd
+
+from backtest.ict.poi import candle_arrays, window_mean
+
+
+# =====================================================
+# Helpers
+# =====================================================
+def rolling(x, width, op):
+    # op over x[k - width + 1 : k + 1] for every k, NaN until the window fits
+    return pd.Series(x).rolling(width).agg(op).to_numpy()
+
+
+def shift(x):
+    # x[k - 1] at row k, NaN at row 0 (np.roll would wrap the last row in)
+    out = np.full(len(x), np.nan)
+    out[1:] = x[:-1]
+    return out
+
+
+def signal_columns(long, long_sl, short, short_sl):
+    return {"long": long, "long_sl": long_sl, "short": short, "short_sl": short_sl}
+
+
+# =====================================================
+# Precomputed trigger columns
+# =====================================================
+def choch_columns(df, swing=9, stop=5, min_len=15):
+    """
+    CHoCH trigger evaluated at every bar in one pass.
+
+    Row k answers check_m1_choch(df.iloc[: k + 1]): close breaks the extreme
+    of the `swing` bars before it and the stop is the `stop`-bar extreme
+    ending at k. Rows with fewer than min_len bars of history never fire.
+    """
+    o, h, l, c = candle_arrays(df)
+    valid = np.arange(len(df)) + 1 >= min_len
+    swing_high = shift(rolling(h, swing, "max"))
+    swing_low = shift(rolling(l, swing, "min"))
+    with np.errstate(invalid="ignore"):
+        return signal_columns(
+            valid & (c > swing_high),
+            rolling(l, stop, "min"),
+            valid & (c < swing_low),
+            rolling(h, stop, "max"),
+        )
+
+
+def engulfing_columns(df, lookback=20, factor=1.5):
+    """
+    Displacement engulfing (h1_poi_m1_m5) evaluated at every bar.
+
+    The current body must be at least factor x the mean body of the last
+    lookback bars (itself included) and fully engulf the previous,
+    opposite-colored body. Stops are the two-bar extremes.
+    """
+    o, h, l, c = candle_arrays(df)
+    n = len(df)
+    k = np.arange(n)
+    body = np.abs(c - o)
+    avg_body = window_mean(body, k - lookback + 1, lookback)
+
+    po, pc = shift(o), shift(c)
+    with np.errstate(invalid="ignore"):
+        strong = (k + 1 >= lookback + 2) & ~(body < avg_body * factor)
+    long = strong & (pc < po) & (c > o) & (o <= pc) & (c >= po)
+    short = strong & (pc > po) & (c < o) & (o >= pc) & (c <= po)
+    return signal_columns(long, np.fmin(shift(l), l), short, np.fmax(shift(h), h))
+
+
+def reversal_columns(df):
+    """
+    Two-candle reversal (h1_ict_1 check_m5_engulfing) evaluated at every bar.
+
+    Long when a bearish candle is followed by a bullish one closing above its
+    open, stop at the current low. Short is the mirror image.
+    """
+    o, h, l, c = candle_arrays(df)
+    po, pc = shift(o), shift(c)
+    valid = np.arange(len(df)) >= 1
+    long = valid & (pc < po) & (c > o) & (c > po)
+    short = valid & (pc > po) & (c < o) & (c < po)
+    return signal_columns(long, l, short, h)
+
+
+# =====================================================
+# O(1) lookups
+# =====================================================
+def signal_at(cols, k, side):
+    # (fired, stop) for `side` at row k; k < 0 means no rows visible yet
+    if k < 0:
+        return False, None
+    if side == "LONG" and cols["long"][k]:
+        return True, cols["long_sl"][k]
+    if side == "SHORT" and cols["short"][k]:
+        return True, cols["short_sl"][k]
+    return False, None
+
+
+def direction_at(cols, k):
+    # (side, stop) of whichever direction fired at row k, else (None, None)
+    for side in ("LONG", "SHORT"):
+        ok, sl = signal_at(cols, k, side)
+        if ok:
+            return side, sl
+    return None, None
+
+
+# =====================================================
+# Streaming triggers (live)
+# =====================================================
+class _Stream:
+    # latest row as (long, long_sl, short, short_sl), same as the columns
+    def __init__(self):
+        self.count = 0
+        self.last = (False, None, False, None)
+
+    def signal(self, side):
+        # signal_at for the newest bar
+        long, long_sl, short, short_sl = self.last
+        if side == "LONG" and long:
+            return True, long_sl
+        if side == "SHORT" and short:
+            return True, short_sl
+        return False, None
+
+
+class CHoCHStream(_Stream):
+    """
+    choch_columns one closed bar at a time.
+
+    Keeps the last swing + 1 bars, so update() costs O(swing) whatever the
+    history length; after every update `last` equals the newest row of
+    choch_columns(all bars so far).
+    """
+
+    def __init__(self, swing=9, stop=5, min_len=15):
+        super().__init__()
+        self.swing, self.stop, self.min_len = swing, stop, min_len
+        self.buf = deque(maxlen=max(swing + 1, stop))  # (high, low)
+
+    def update(self, o, h, l, c):
+        self.buf.append((h, l))
+        self.count += 1
+        bars = list(self.buf)
+        long = short = False
+        if self.count >= self.min_len and len(bars) > self.swing:
+            prev = bars[-self.swing - 1 : -1]
+            long = c > max(x[0] for x in prev)
+            short = c < min(x[1] for x in prev)
+        tail = bars[-self.stop :] if len(bars) >= self.stop else None
+        self.last = (
+            long,
+            min(x[1] for x in tail) if tail else None,
+            short,
+            max(x[0] for x in tail) if tail else None,
+        )
+        return self.last
+
+
+class EngulfingStream(_Stream):
+    """
+    engulfing_columns one closed bar at a time, in O(lookback) per bar.
+    """
+
+    def __init__(self, lookback=20, factor=1.5):
+        super().__init__()
+        self.lookback, self.factor = lookback, factor
+        self.bodies = deque(maxlen=lookback)
+        self.prev = None  # (open, high, low, close) of the previous bar
+
+    def update(self, o, h, l, c):
+        body = abs(c - o)
+        self.bodies.append(body)
+        self.count += 1
+        long = short = False
+        if self.prev is not None:
+            po, ph, pl, pc = self.prev
+            if self.count >= self.lookback + 2:
+                avg = sum(self.bodies) / self.lookback
+                if not body < avg * self.factor:
+                    long = pc < po and c > o and o <= pc and c >= po
+                    short = pc > po and c < o and o >= pc and c <= po
+            self.last = (long, min(pl, l), short, max(ph, h))
+        else:
+            self.last = (False, l, False, h)
+        self.prev = (o, h, l, c)
+        return self.last
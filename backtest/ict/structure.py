@@ -0,0 +1,198 @@
+from collections import deque
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+NEUTRAL, BULLISH, BEARISH = "NEUTRAL", "BULLISH", "BEARISH"
+
+
+# =====================================================
+# One-shot helpers (h1_poi_m1_m5 / h1_fvg_m1)
+# =====================================================
+def swing_mask(x, left=2, right=2, op=np.max):
+    # x[i] is a swing point when it equals op() of x[i - left : i + right + 1]
+    mask = np.zeros(len(x), dtype=bool)
+    width = left + right + 1
+    if len(x) < width:
+        return mask
+    mask[left : len(x) - right] = x[left : len(x) - right] == op(
+        sliding_window_view(x, width), axis=1
+    )
+    return mask
+
+
+def find_swings(df, left=2, right=2):
+    high = df["high"].to_numpy(dtype=float)
+    low = df["low"].to_numpy(dtype=float)
+    hi = np.nonzero(swing_mask(high, left, right, np.max))[0]
+    lo = np.nonzero(swing_mask(low, left, right, np.min))[0]
+    highs = list(zip(df.index[hi], high[hi].tolist()))
+    lows = list(zip(df.index[lo], low[lo].tolist()))
+    return highs, lows
+
+
+def filter_swings(swings, min_dist=0.003):
+    out = []
+    for t, p in swings:
+        if not out or abs(p - out[-1][1]) / out[-1][1] > min_dist:
+            out.append((t, p))
+    return out
+
+
+def classify(lh, ph, ll, pl, close):
+    if lh > ph and ll > pl and close > lh:
+        return BULLISH
+    if ll < pl and lh < ph and close < ll:
+        return BEARISH
+    return NEUTRAL
+
+
+def get_h1_structure(df, left=2, right=2, min_dist=0.003):
+    highs, lows = find_swings(df, left, right)
+    highs = filter_swings(highs, min_dist)
+    lows = filter_swings(lows, min_dist)
+
+    if len(highs) < 2 or len(lows) < 2:
+        return NEUTRAL
+
+    return classify(
+        highs[-1][1], highs[-2][1], lows[-1][1], lows[-2][1], df["close"].iloc[-1]
+    )
+
+
+# =====================================================
+# Batch mode : structure after every bar
+# =====================================================
+def _filtered(x, mask, min_dist):
+    # filter_swings over the swing points of x -> (bar positions, prices)
+    pos, price = [], []
+    for i in np.nonzero(mask)[0]:
+        p = x[i]
+        if not price or abs(p - price[-1]) / price[-1] > min_dist:
+            pos.append(i)
+            price.append(p)
+    return np.array(pos, dtype=np.int64), np.array(price, dtype=float)
+
+
+def label_structure(df, left=2, right=2, min_dist=0.003):
+    """
+    get_h1_structure(df.iloc[: k + 1]) for every k, in one pass.
+
+    A swing at bar i is only visible once bar i + right exists, so every bar
+    k sees the filtered swings confirmed at or before k. Returns a Series of
+    BULLISH / BEARISH / NEUTRAL aligned with df.index.
+    """
+    high = df["high"].to_numpy(dtype=float)
+    low = df["low"].to_numpy(dtype=float)
+    close = df["close"].to_numpy(dtype=float)
+    k = np.arange(len(df))
+
+    hi_pos, hi_px = _filtered(high, swing_mask(high, left, right, np.max), min_dist)
+    lo_pos, lo_px = _filtered(low, swing_mask(low, left, right, np.min), min_dist)
+
+    # number of filtered swings confirmed by bar k
+    n_hi = np.searchsorted(hi_pos + right, k, side="right")
+    n_lo = np.searchsorted(lo_pos + right, k, side="right")
+    ok = (n_hi >= 2) & (n_lo >= 2)
+
+    out = np.full(len(df), NEUTRAL, dtype=object)
+    if ok.any():
+        lh, ph = hi_px[n_hi[ok] - 1], hi_px[n_hi[ok] - 2]
+        ll, pl = lo_px[n_lo[ok] - 1], lo_px[n_lo[ok] - 2]
+        c = close[ok]
+        bull = (lh > ph) & (ll > pl) & (c > lh)
+        bear = (ll < pl) & (lh < ph) & (c < ll)
+        out[ok] = np.where(bull, BULLISH, np.where(bear, BEARISH, NEUTRAL))
+    return pd.Series(out, index=df.index, name="structure")
+
+
+# =====================================================
+# Streaming swing tracker
+# =====================================================
+class SwingTracker:
+    """
+    Swing highs / lows and H1 structure maintained one candle at a time.
+
+    Window max / min come from monotonic deques, so update() is O(1)
+    amortized. highs / lows hold the filtered swing lists and structure
+    always equals get_h1_structure(all candles so far).
+    """
+
+    def __init__(self, left=2, right=2, min_dist=0.003):
+        self.left = left
+        self.right = right
+        self.min_dist = min_dist
+        self.width = left + right + 1
+        self.buf = deque(maxlen=right + 1)  # (ts, high, low) of the newest bars
+        self.max_q = deque()  # (pos, high), highs decreasing
+        self.min_q = deque()  # (pos, low), lows increasing
+        self.count = 0
+        self.highs = []
+        self.lows = []
+        self.structure = NEUTRAL
+
+    def _push(self, q, pos, x, worse):
+        while q and worse(q[-1][1], x):
+            q.pop()
+        q.append((pos, x))
+        while q[0][0] <= pos - self.width:
+            q.popleft()
+
+    def _add(self, swings, ts, p):
+        if not swings or abs(p - swings[-1][1]) / swings[-1][1] > self.min_dist:
+            swings.append((ts, p))
+
+    def update(self, ts, h, l, c):
+        pos = self.count
+        self.count += 1
+        self.buf.append((ts, h, l))
+        self._push(self.max_q, pos, h, lambda a, b: a <= b)
+        self._push(self.min_q, pos, l, lambda a, b: a >= b)
+
+        # the bar `right` candles back now has its full window
+        if pos - self.right >= self.left:
+            cts, ch, cl = self.buf[0]
+            if ch == self.max_q[0][1]:
+                self._add(self.highs, cts, ch)
+            if cl == self.min_q[0][1]:
+                self._add(self.lows, cts, cl)
+
+        if len(self.highs) < 2 or len(self.lows) < 2:
+            self.structure = NEUTRAL
+        else:
+            self.structure = classify(
+                self.highs[-1][1],
+                self.highs[-2][1],
+                self.lows[-1][1],
+                self.lows[-2][1],
+                c,
+            )
+        return self.structure
+
+    def advance(self, df, t):
+        # ingest every candle of df opened at or before t that is not seen yet
+        while self.count < len(df) and df.index[self.count] <= t:
+            row = df.iloc[self.count]
+            self.update(df.index[self.count], row["high"], row["low"], row["close"])
+        return self.structure
+
+
+# =====================================================
+# Batch mode : range breakout (h1_ict_2)
+# =====================================================
+def label_breakout(df, lookback=48, min_bars=40):
+    """
+    BULLISH / BEARISH when the close breaks the high / low of the previous
+    lookback bars, after every bar of df. Fewer than min_bars bars of history
+    is NEUTRAL.
+    """
+    high = df["high"].rolling(lookback, min_periods=1).max().shift(1).to_numpy()
+    low = df["low"].rolling(lookback, min_periods=1).min().shift(1).to_numpy()
+    close = df["close"].to_numpy(dtype=float)
+    valid = np.arange(len(df)) + 1 >= min_bars
+
+    out = np.full(len(df), NEUTRAL, dtype=object)
+    with np.errstate(invalid="ignore"):
+        out[valid & (close > high)] = BULLISH
+        out[valid & ~(close > high) & (close < low)] = BEARISH
+    return pd.Series(out, index=df.index, name="structure")
@@ -0,0 +1,134 @@
+import random
+
+# =====================================================
+# Interval treap (key = (bottom, seq), augmented with max top)
+# =====================================================
+_rng = random.Random(0)
+
+
+class _Node:
+    __slots__ = ("key", "zone", "top", "max_top", "prio", "left", "right")
+
+    def __init__(self, key, zone):
+        self.key = key
+        self.zone = zone
+        self.top = zone["top"]
+        self.max_top = zone["top"]
+        self.prio = _rng.random()
+        self.left = None
+        self.right = None
+
+
+def _pull(node):
+    node.max_top = node.top
+    if node.left is not None and node.left.max_top > node.max_top:
+        node.max_top = node.left.max_top
+    if node.right is not None and node.right.max_top > node.max_top:
+        node.max_top = node.right.max_top
+    return node
+
+
+def _split(node, key):
+    # -> (keys < key, keys >= key)
+    if node is None:
+        return None, None
+    if node.key < key:
+        node.right, right = _split(node.right, key)
+        return _pull(node), right
+    left, node.left = _split(node.left, key)
+    return left, _pull(node)
+
+
+def _merge(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if a.prio > b.prio:
+        a.right = _merge(a.right, b)
+        return _pull(a)
+    b.left = _merge(a, b.left)
+    return _pull(b)
+
+
+def _erase(node, key):
+    if node is None:
+        return None
+    if key == node.key:
+        return _merge(node.left, node.right)
+    if key < node.key:
+        node.left = _erase(node.left, key)
+    else:
+        node.right = _erase(node.right, key)
+    return _pull(node)
+
+
+def _collect(node, lo, hi, out):
+    # every zone with bottom <= hi and top >= lo
+    if node is None or node.max_top < lo:
+        return
+    _collect(node.left, lo, hi, out)
+    if node.key[0] <= hi:
+        if node.top >= lo:
+            out.append((node.key[1], node.zone))
+        _collect(node.right, lo, hi, out)
+
+
+# =====================================================
+# Zone index
+# =====================================================
+class ZoneIndex:
+    """
+    Active POI zones indexed by price.
+
+    insert / consume are O(log n) and stab / overlap are O(log n + k), where
+    k is the number of zones returned. Results come back in insertion order,
+    which is the order the backtests used to scan their POI lists in.
+
+    group(zone) maps a zone to its "used" id. Consuming a zone consumes every
+    zone with the same id, including ones inserted later, so the id must be
+    stable across zone objects (e.g. poi_id), never id(zone): CPython reuses
+    the id of a collected dict and a fresh zone would be dropped as used.
+    """
+
+    def __init__(self, group):
+        self.group = group
+        self.root = None
+        self.seq = 0
+        self.keys = {}  # group id -> keys of live zones
+        self.used = set()
+
+    def __len__(self):
+        return sum(len(k) for k in self.keys.values())
+
+    def insert(self, zone):
+        gid = self.group(zone)
+        if gid in self.used:
+            return None
+        key = (zone["bottom"], self.seq)
+        self.seq += 1
+        left, right = _split(self.root, key)
+        self.root = _merge(_merge(left, _Node(key, zone)), right)
+        self.keys.setdefault(gid, []).append(key)
+        return key
+
+    def extend(self, zones):
+        for zone in zones:
+            self.insert(zone)
+
+    def consume(self, zone):
+        gid = self.group(zone)
+        self.used.add(gid)
+        for key in self.keys.pop(gid, []):
+            self.root = _erase(self.root, key)
+
+    def overlap(self, low, high):
+        # zones touched anywhere inside a bar's [low, high] range
+        out = []
+        _collect(self.root, low, high, out)
+        out.sort(key=lambda x: x[0])
+        return [zone for _, zone in out]
+
+    def stab(self, price):
+        # zones with bottom <= price <= top
+        return self.overlap(price, price)
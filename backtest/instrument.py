@@ -0,0 +1,168 @@
+import cProfile
+import json
+import os
+import pstats
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from functools import wraps
+
+# =====================================================
+# Setting
+# =====================================================
+# BACKTEST_PROFILE=off | summary | cprofile
+# BACKTEST_PROFILE_JSON=<path> appends one JSON line per run
+MODES = ("off", "summary", "cprofile")
+PROFILE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "profile"
+)
+
+_OFF = nullcontext()
+
+
+# =====================================================
+# Instrument
+# =====================================================
+class Instrument:
+    """
+    Stage timers and counters for a backtest run.
+
+    "off" makes stage() / count() no-ops, "summary" times every stage and
+    prints a breakdown plus bars/second when the run ends, "cprofile"
+    additionally profiles the whole run and writes a .prof file under
+    PROFILE_DIR (open it with pstats or snakeviz). Nested stages are timed
+    independently.
+    """
+
+    def __init__(self, mode="off", json_path=None):
+        self.set_mode(mode, json_path)
+
+    def set_mode(self, mode, json_path=None):
+        if mode not in MODES:
+            raise ValueError(f"unknown profile mode {mode!r}, expected one of {MODES}")
+        self.mode = mode
+        self.enabled = mode != "off"
+        self.json_path = json_path
+        self.reset()
+
+    def reset(self):
+        self.times = {}  # stage -> [calls, seconds]
+        self.counters = {}
+
+    @contextmanager
+    def _timer(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry = self.times.setdefault(name, [0, 0.0])
+            entry[0] += 1
+            entry[1] += time.perf_counter() - start
+
+    def stage(self, name):
+        return self._timer(name) if self.enabled else _OFF
+
+    def timed(self, name=None):
+        # decorator form of stage(); the function name is the default stage
+        def wrap(fn):
+            label = name or fn.__name__
+
+            @wraps(fn)
+            def inner(*args, **kwargs):
+                with self.stage(label):
+                    return fn(*args, **kwargs)
+
+            return inner
+
+        return wrap
+
+    def count(self, name, n=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    # -------------------------------------------------
+    # Whole runs
+    # -------------------------------------------------
+    @contextmanager
+    def run(self, name):
+        """
+        Wrap one backtest run: reset, time it, then report.
+
+        bars/second comes from the "bars" counter (the engine counts every
+        M5 bar it visits).
+        """
+        if not self.enabled:
+            yield self
+            return
+        self.reset()
+        profiler = cProfile.Profile() if self.mode == "cprofile" else None
+        start = time.perf_counter()
+        if profiler:
+            profiler.enable()
+        try:
+            yield self
+        finally:
+            if profiler:
+                profiler.disable()
+            wall = time.perf_counter() - start
+            summary = self.summary(name, wall)
+            self.report(summary)
+            if profiler:
+                self._dump_profile(profiler, name)
+            if self.json_path:
+                self.dump(summary, self.json_path)
+
+    def summary(self, name, wall):
+        bars = self.counters.get("bars", 0)
+        return {
+            "name": name,
+            "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "mode": self.mode,
+            "wall": wall,
+            "bars": bars,
+            "bars_per_sec": bars / wall if wall else None,
+            "stages": {
+                stage: {"calls": calls, "seconds": seconds}
+                for stage, (calls, seconds) in self.times.items()
+            },
+            "counters": dict(self.counters),
+        }
+
+    def report(self, summary):
+        wall = summary["wall"]
+        print(f"\n⏱️  {summary['name']}: {wall:.3f}s")
+        print(f"{'stage':<20}{'calls':>10}{'seconds':>12}{'share':>9}")
+        stages = sorted(summary["stages"].items(), key=lambda kv: -kv[1]["seconds"])
+        for stage, s in stages:
+            share = s["seconds"] / wall * 100 if wall else 0.0
+            print(f"{stage:<20}{s['calls']:>10,}{s['seconds']:>12.4f}{share:>8.1f}%")
+        for counter, n in summary["counters"].items():
+            print(f"{counter:<20}{n:>10,}")
+        if summary["bars"]:
+            print(f"bars/sec: {summary['bars_per_sec']:,.0f}")
+
+    def dump(self, summary, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "a") as f:
+            f.write(json.dumps(summary) + "\n")
+
+    def _dump_profile(self, profiler, name):
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        safe = "".join(ch if ch.isalnum() else "_" for ch in name)
+        path = os.path.join(PROFILE_DIR, f"{safe}_{stamp}.prof")
+        profiler.dump_stats(path)
+        print(f"\n📄 cProfile stats: {path}")
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(15)
+
+
+# one process-wide instance, configured from the environment
+instrument = Instrument(
+    os.environ.get("BACKTEST_PROFILE", "off"),
+    os.environ.get("BACKTEST_PROFILE_JSON"),
+)
+stage = instrument.stage
+timed = instrument.timed
+count = instrument.count
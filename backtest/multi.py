@@ -0,0 +1,125 @@
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backtest.sweep import load_target, trade_stats
+from candle.schema import now_ms
+from candle.store import CandleStore
+from live.ratelimit import limited_info, share_budget, use_budget
+
+# =====================================================
+# Setting
+# =====================================================
+TIMEFRAMES = {"df_h1": "1h", "df_m5": "5m", "df_m1": "1m"}
+SYMBOLS = ["BTC", "ETH", "SOL"]
+
+
+# =====================================================
+# Data
+# =====================================================
+def load_frames(symbol, days=90, store=None):
+    # every worker reads the same on-disk candle store; only missing bars hit the API
+    store = store or CandleStore(connect=limited_info)
+    start = now_ms() - 86400 * 1000 * days
+    frames = {
+        name: store.load(symbol, interval, start)
+        for name, interval in TIMEFRAMES.items()
+    }
+    missing = [TIMEFRAMES[name] for name, df in frames.items() if df is None]
+    if missing:
+        raise ValueError(f"no {symbol} candles for {', '.join(missing)}")
+    return frames
+
+
+# =====================================================
+# Worker
+# =====================================================
+def run_symbol(target, symbol, days=90, params=None):
+    # -> (summary row, trade list) for one symbol; errors stay in the row
+    start = time.perf_counter()
+    row = {"symbol": symbol}
+    try:
+        frames = load_frames(symbol, days)
+        fn, module = load_target(target)
+        params = params or {}
+        results = fn(**frames, **params)
+        rr = params.get("rr", getattr(module, "RISK_REWARD_RATIO", 1.0))
+        row.update(trade_stats(results, rr))
+    except Exception as e:
+        # fetch errors (429s included) land here, not in a generic message
+        return {**row, "error": f"{type(e).__name__}: {e}"}, []
+    row["seconds"] = time.perf_counter() - start
+    return row, [{"symbol": symbol, **trade} for trade in results]
+
+
+# =====================================================
+# Fan-out
+# =====================================================
+def run_symbols(
+    target, symbols, days=90, params=None, max_workers=None, on_result=None
+):
+    """
+    Run target over every symbol in a process pool.
+
+    target is "module:function" (see backtest.sweep). Each worker loads its
+    symbol through the shared candle store, so repeated runs only fetch new
+    bars, and every worker's backfill draws from one rate-limit budget
+    served by this process. Rows are passed to on_result as each symbol
+    finishes; returns (summary, trades) frames.
+    """
+    rows, trades = [], []
+    budget = share_budget()
+    with ProcessPoolExecutor(
+        max_workers=max_workers or os.cpu_count(),
+        initializer=use_budget,
+        initargs=(budget,),
+    ) as pool:
+        futures = [
+            pool.submit(run_symbol, target, symbol, days, params) for symbol in symbols
+        ]
+        for fut in as_completed(futures):
+            row, symbol_trades = fut.result()
+            rows.append(row)
+            trades += symbol_trades
+            if on_result:
+                on_result(row)
+
+    summary = pd.DataFrame(rows)
+    if "total_r" in summary:
+        summary = summary.sort_values("total_r", ascending=False)
+    return summary.reset_index(drop=True), pd.DataFrame(trades)
+
+
+def print_row(row):
+    if "error" in row:
+        print(f"❌ {row['symbol']}: {row['error']}")
+    else:
+        print(
+            f"✅ {row['symbol']}: {row['trades']} trades | "
+            f"WinRate {row['win_rate']:.2f}% | {row['total_r']:+.2f}R"
+        )
+
+
+def print_report(summary):
+    print("\n" + summary.to_string())
+    done = summary[summary["trades"].notna()] if "trades" in summary else summary[:0]
+    total = int(done["trades"].sum()) if len(done) else 0
+    wins = int(done["wins"].sum()) if len(done) else 0
+    total_r = done["total_r"].sum() if len(done) else 0.0
+    print(
+        f"\nsymbols: {len(summary)} | trades: {total} | "
+        f"WinRate: {(wins / total * 100 if total else 0):.2f}% | total: {total_r:+.2f}R"
+    )
+
+
+# =====================================================
+if __name__ == "__main__":
+    symbols = sys.argv[1:] or SYMBOLS
+    print(f"🚀 Backtesting {len(symbols)} symbols on {os.cpu_count()} cores...")
+    summary, trades = run_symbols(
+        "backtest.ict.h1_poi_m1_m5:backtest", symbols, on_result=print_row
+    )
+    print_report(summary)
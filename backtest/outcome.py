@@ -0,0 +1,182 @@
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional
+    njit = None
+
+WIN, LOSE, OPEN = 1, -1, 0
+RESULT_NAMES = {WIN: "WIN", LOSE: "LOSE", OPEN: "OPEN"}
+
+
+# =====================================================
+# Sparse-table first passage search
+# =====================================================
+class FirstPassage:
+    """
+    Range-max / range-min sparse tables over one high/low series.
+
+    first_at_or_above(start, level) returns, for every query, the first index
+    j >= start with high[j] >= level (len(high) if never). Queries are arrays
+    and are answered with O(log n) vectorized binary-lifting steps.
+    """
+
+    def __init__(self, high, low):
+        self.high = np.ascontiguousarray(high, dtype=float)
+        self.low = np.ascontiguousarray(low, dtype=float)
+        self.n = len(self.high)
+        self.max_table = self._build(self.high, np.maximum)
+        self.min_table = self._build(self.low, np.minimum)
+
+    @staticmethod
+    def _build(x, op):
+        # table[k][i] = op(x[i : i + 2**k]), only where the window fits
+        table = [x]
+        k = 1
+        while (1 << k) <= len(x):
+            prev = table[-1]
+            half = 1 << (k - 1)
+            table.append(op(prev[:-half], prev[half:]))
+            k += 1
+        return table
+
+    def _lift(self, table, start, end, blocked):
+        # move pos forward while the next 2**k bars are all blocked
+        pos = np.array(start, dtype=np.int64, ndmin=1)
+        if self.n == 0:
+            return pos
+        for k in range(len(table) - 1, -1, -1):
+            step = 1 << k
+            ok = pos + step <= end
+            vals = table[k][np.where(ok, pos, 0)]
+            pos = np.where(ok & blocked(vals), pos + step, pos)
+        return pos
+
+    def first_at_or_above(self, start, level, end=None):
+        level = np.asarray(level, dtype=float)
+        end = self.n if end is None else end
+        return self._lift(self.max_table, start, end, lambda m: m < level)
+
+    def first_at_or_below(self, start, level, end=None):
+        level = np.asarray(level, dtype=float)
+        end = self.n if end is None else end
+        return self._lift(self.min_table, start, end, lambda m: m > level)
+
+
+# =====================================================
+# Outcome resolution
+# =====================================================
+def _first_hits(fp, start, long, tp, sl, end=None):
+    # index of the first bar touching tp / sl for every entry
+    tp_hit = np.where(
+        long,
+        fp.first_at_or_above(start, tp, end),
+        fp.first_at_or_below(start, tp, end),
+    )
+    sl_hit = np.where(
+        long,
+        fp.first_at_or_below(start, sl, end),
+        fp.first_at_or_above(start, sl, end),
+    )
+    return tp_hit, sl_hit
+
+
+def resolve_outcomes(
+    fp,
+    start,
+    side,
+    tp,
+    sl,
+    ambiguous="tp",
+    m1=None,
+    bar_times=None,
+    bar_ms=None,
+    engine="numpy",
+    end=None,
+):
+    """
+    First-touch TP vs SL for arrays of entries.
+
+    start: first bar index to scan (entry bar + 1), side: "LONG"/"SHORT" or
+    +1/-1. Returns (result, exit_idx) arrays with result WIN / LOSE / OPEN.
+
+    ambiguous decides bars that touch both levels: "tp" (the old loop's
+    behaviour, TP checked first), "sl", or "m1" to replay the bar on the 1m
+    series. "m1" needs m1=(FirstPassage, open_times_ms), bar_times (open time
+    of every base bar in ms) and bar_ms (base bar length); ties that survive
+    the 1m replay fall back to "tp". engine="numba" runs the compiled
+    forward scan instead when numba is installed (ambiguous="tp" only).
+    end, if given, stops the scan before that bar; entries still open there
+    are OPEN with exit_idx == end.
+    """
+    start = np.atleast_1d(np.asarray(start, dtype=np.int64))
+    side = np.atleast_1d(np.asarray(side))
+    long = (side == "LONG") | (side == 1)
+    tp = np.atleast_1d(np.asarray(tp, dtype=float))
+    sl = np.atleast_1d(np.asarray(sl, dtype=float))
+
+    if (
+        engine == "numba"
+        and scan_outcomes is not None
+        and ambiguous == "tp"
+        and end is None
+    ):
+        return scan_outcomes(fp.high, fp.low, start, long, tp, sl)
+
+    end = fp.n if end is None else end
+    tp_hit, sl_hit = _first_hits(fp, start, long, tp, sl, end)
+    result = np.where(
+        tp_hit < sl_hit, WIN, np.where(sl_hit < tp_hit, LOSE, OPEN)
+    ).astype(np.int64)
+    exit_idx = np.minimum(tp_hit, sl_hit)
+
+    # both levels inside the same bar
+    tie = (tp_hit == sl_hit) & (tp_hit < end)
+    result[tie] = LOSE if ambiguous == "sl" else WIN
+    if ambiguous == "m1" and tie.any():
+        m1_fp, m1_times = m1
+        k = np.nonzero(tie)[0]
+        t0 = bar_times[exit_idx[k]]
+        lo = np.searchsorted(m1_times, t0, side="left")
+        hi = np.searchsorted(m1_times, t0 + bar_ms, side="left")
+        m1_tp, m1_sl = _first_hits(m1_fp, lo, long[k], tp[k], sl[k], hi)
+        result[k[m1_sl < m1_tp]] = LOSE
+
+    return result, exit_idx
+
+
+# =====================================================
+# Optional numba path (plain forward scan, same rules as ambiguous="tp")
+# =====================================================
+if njit is not None:
+
+    @njit(cache=True)
+    def scan_outcomes(high, low, start, long, tp, sl):
+        n = len(high)
+        result = np.zeros(len(start), np.int64)
+        exit_idx = np.full(len(start), n, np.int64)
+        for e in range(len(start)):
+            for j in range(start[e], n):
+                if long[e]:
+                    if high[j] >= tp[e]:
+                        result[e] = 1
+                    elif low[j] <= sl[e]:
+                        result[e] = -1
+                else:
+                    if low[j] <= tp[e]:
+                        result[e] = 1
+                    elif high[j] >= sl[e]:
+                        result[e] = -1
+                if result[e] != 0:
+                    exit_idx[e] = j
+                    break
+        return result, exit_idx
+
+else:
+    scan_outcomes = None
+
+
+def resolve_trade(fp, start, side, tp, sl, ambiguous="tp"):
+    # single-trade helper for the sequential backtest loops
+    result, _ = resolve_outcomes(fp, start, side, tp, sl, ambiguous)
+    return RESULT_NAMES[int(result[0])]
@@ -0,0 +1,218 @@
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from importlib import import_module
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# =====================================================
+# Parameter spaces
+# =====================================================
+# space: {name: [v1, v2, ...]} for discrete choices or (lo, hi) for a range.
+# Ranges are only valid for random / Latin-hypercube sampling; an int range
+# samples ints in [lo, hi].
+def grid(space):
+    names = list(space)
+    return [dict(zip(names, vals)) for vals in itertools.product(*space.values())]
+
+
+def _scale(values, u):
+    if isinstance(values, tuple):
+        lo, hi = values
+        if isinstance(lo, int) and isinstance(hi, int):
+            return [int(lo + x * (hi - lo + 1)) for x in u]
+        return [float(lo + x * (hi - lo)) for x in u]
+    return [values[int(x * len(values))] for x in u]
+
+
+def random_samples(space, n, seed=0):
+    rng = np.random.default_rng(seed)
+    cols = {name: _scale(values, rng.random(n)) for name, values in space.items()}
+    return [{name: cols[name][k] for name in space} for k in range(n)]
+
+
+def latin_hypercube(space, n, seed=0):
+    # every parameter's range is cut into n strata and each stratum is used once
+    rng = np.random.default_rng(seed)
+    cols = {
+        name: _scale(values, (rng.permutation(n) + rng.random(n)) / n)
+        for name, values in space.items()
+    }
+    return [{name: cols[name][k] for name in space} for k in range(n)]
+
+
+# =====================================================
+# Shared candle frames
+# =====================================================
+class SharedFrames:
+    """
+    Candle frames copied once into shared memory.
+
+    spec is a small picklable handle; workers call attach(spec) and get
+    DataFrames backed by the same pages instead of a pickled copy per task.
+    """
+
+    def __init__(self, frames):
+        self.blocks = []
+        self.spec = {}
+        for name, df in frames.items():
+            values = df.to_numpy(dtype=float).T
+            index = df.index.as_unit("ns").asi8  # attach() reads ns
+            self.spec[name] = (
+                self._share(values),
+                self._share(index),
+                values.shape,
+                list(df.columns),
+                str(df.index.tz) if df.index.tz is not None else None,
+            )
+
+    def _share(self, arr):
+        shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+        np.ndarray(arr.shape, arr.dtype, buffer=shm.buf)[...] = arr
+        self.blocks.append(shm)
+        return shm.name
+
+    def close(self):
+        for shm in self.blocks:
+            shm.close()
+            shm.unlink()
+        self.blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attach(spec):
+    # -> ({name: DataFrame}, shared memory handles to keep alive)
+    frames, blocks = {}, []
+    for name, (values_name, index_name, shape, columns, tz) in spec.items():
+        values_shm = shared_memory.SharedMemory(name=values_name)
+        index_shm = shared_memory.SharedMemory(name=index_name)
+        blocks += [values_shm, index_shm]
+        values = np.ndarray(shape, np.float64, buffer=values_shm.buf)
+        index = pd.DatetimeIndex(
+            np.ndarray(shape[1], np.int64, buffer=index_shm.buf).view("M8[ns]"),
+            name="timestamp",
+        )
+        if tz is not None:
+            index = index.tz_localize("UTC").tz_convert(tz)
+        frames[name] = pd.DataFrame(values.T, index=index, columns=columns, copy=False)
+    return frames, blocks
+
+
+# =====================================================
+# Metrics
+# =====================================================
+def trade_stats(results, rr):
+    outcomes = [r["result"] for r in results]
+    wins = outcomes.count("WIN")
+    losses = outcomes.count("LOSE")
+    trades = wins + losses
+    total_r = wins * rr - losses
+    return {
+        "trades": trades,
+        "wins": wins,
+        "losses": losses,
+        "win_rate": wins / trades * 100 if trades else 0.0,
+        "total_r": total_r,
+        "expectancy_r": total_r / trades if trades else 0.0,
+    }
+
+
+# =====================================================
+# Worker side
+# =====================================================
+_worker = {}
+
+
+def load_target(target):
+    # "package.module:function" -> (function, module)
+    module_name, fn_name = target.split(":")
+    module = import_module(module_name)
+    return getattr(module, fn_name), module
+
+
+def _init_worker(target, spec):
+    _worker["fn"], _worker["module"] = load_target(target)
+    _worker["frames"], _worker["blocks"] = attach(spec)
+
+
+def _run_one(params):
+    start = time.perf_counter()
+    results = _worker["fn"](**_worker["frames"], **params)
+    rr = params.get("rr", getattr(_worker["module"], "RISK_REWARD_RATIO", 1.0))
+    return {
+        **params,
+        **trade_stats(results, rr),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+# =====================================================
+# Sweep
+# =====================================================
+def run_sweep(target, frames, combos, max_workers=None, on_result=None):
+    """
+    Run target(**frames, **params) for every params dict in combos.
+
+    target is "module:function" so workers can import it, e.g.
+    "backtest.ict.h1_poi_m1_m5:backtest". Frames are shared once through
+    shared memory, combinations run across a process pool (all cores by
+    default) and on_result, if given, sees every row as it completes.
+    Returns one row per combination, best total_r first.
+    """
+    rows = []
+    with SharedFrames(frames) as shared:
+        with ProcessPoolExecutor(
+            max_workers=max_workers or os.cpu_count(),
+            initializer=_init_worker,
+            initargs=(target, shared.spec),
+        ) as pool:
+            futures = [pool.submit(_run_one, params) for params in combos]
+            for fut in as_completed(futures):
+                row = fut.result()
+                rows.append(row)
+                if on_result:
+                    on_result(row)
+
+    if not rows:
+        return pd.DataFrame()
+    table = pd.DataFrame(rows)
+    return table.sort_values("total_r", ascending=False).reset_index(drop=True)
+
+
+# =====================================================
+if __name__ == "__main__":
+    from candle.store import CandleStore, get_ohlcv
+    from live.ratelimit import limited_info
+
+    store = CandleStore(connect=limited_info)
+    frames = {
+        "df_h1": get_ohlcv("BTC", "1h", 90, store=store),
+        "df_m5": get_ohlcv("BTC", "5m", 90, store=store),
+        "df_m1": get_ohlcv("BTC", "1m", 90, store=store),
+    }
+    if any(df is None for df in frames.values()):
+        print("Data collection failed")
+        sys.exit(1)
+
+    space = dict(
+        rr=[2.0, 2.5, 3.0, 4.0],
+        lookback=[20, 30, 40],
+        factor=[1.5, 2.0, 2.5],
+        min_dist=[0.002, 0.003, 0.005],
+        min_risk=[5, 10],
+    )
+    combos = grid(space)
+    print(f"🚀 Sweeping {len(combos)} combinations on {os.cpu_count()} cores...")
+    table = run_sweep("backtest.ict.h1_poi_m1_m5:backtest", frames, combos)
+    print(table.head(20).to_string())
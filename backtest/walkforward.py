@@ -0,0 +1,187 @@
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backtest.ict.engine import Bars
+from backtest.multi import load_frames
+from backtest.sweep import SharedFrames, attach, grid, load_target, trade_stats
+
+
+# =====================================================
+# Windows
+# =====================================================
+def windows(index, train_days=30, test_days=7, step_days=None):
+    """
+    Rolling (train_start, test_start, test_end) bar positions over index.
+
+    Train covers [train_start, test_start) and the out-of-sample slice
+    [test_start, test_end). Windows move by step_days (test_days by default,
+    so test slices tile the data without overlap).
+    """
+    train = pd.Timedelta(days=train_days)
+    test = pd.Timedelta(days=test_days)
+    step = pd.Timedelta(days=step_days or test_days)
+    out = []
+    t = index[0]
+    while t + train + test <= index[-1]:
+        s, m, e = index.searchsorted([t, t + train, t + train + test])
+        out.append((int(s), int(m), int(e)))
+        t += step
+    return out
+
+
+# =====================================================
+# Worker side
+# =====================================================
+# Every worker attaches the shared frames once and keeps a single Bars, so
+# each indicator array is computed once per parameter set and then reused
+# by every window (and every combination sharing those parameters).
+_worker = {}
+
+
+def _init_worker(target, spec):
+    _worker["make_engine"], _worker["module"] = load_target(target)
+    frames, _worker["blocks"] = attach(spec)
+    _worker["bars"] = Bars(**frames)
+
+
+def _evaluate(params, start, end, jit=True, keep_trades=False):
+    engine = _worker["make_engine"](jit=jit, **params)
+    trades = engine.run_bars(_worker["bars"], start, end)
+    rr = params.get("rr", getattr(_worker["module"], "RISK_REWARD_RATIO", 1.0))
+    row = {**params, **trade_stats(trades, rr)}
+    return row, trades if keep_trades else []
+
+
+# =====================================================
+# Walk-forward
+# =====================================================
+def walk_forward(
+    target,
+    frames,
+    combos,
+    train_days=30,
+    test_days=7,
+    step_days=None,
+    metric="total_r",
+    min_trades=5,
+    jit=True,
+    max_workers=None,
+    on_fold=None,
+):
+    """
+    Optimise on every train window, trade the best params on the next slice.
+
+    target is "module:make_engine" of an ICT strategy; every combination is
+    run over every train window in one process pool. The winner of a window
+    is the combination with the highest metric among those with at least
+    min_trades trades (none -> the slice is skipped). Trades still open at a
+    window's end are not counted.
+
+    Returns (folds, trades, equity): one row per window, the out-of-sample
+    trades with their R multiple, and the stitched out-of-sample equity
+    curve in R indexed by exit time. on_fold sees every fold row in order.
+    """
+    _, module = load_target(target)
+    default_rr = getattr(module, "RISK_REWARD_RATIO", 1.0)
+    times = frames["df_m5"].index
+    splits = windows(times, train_days, test_days, step_days)
+    folds, oos = [], []
+    with SharedFrames(frames) as shared:
+        with ProcessPoolExecutor(
+            max_workers=max_workers or os.cpu_count(),
+            initializer=_init_worker,
+            initargs=(target, shared.spec),
+        ) as pool:
+            train = {
+                (f, c): pool.submit(_evaluate, params, s, m, jit)
+                for f, (s, m, e) in enumerate(splits)
+                for c, params in enumerate(combos)
+            }
+
+            tests = {}
+            for f, (s, m, e) in enumerate(splits):
+                table = pd.DataFrame(
+                    [train[f, c].result()[0] for c in range(len(combos))]
+                )
+                ok = table[table["trades"] >= min_trades]
+                best = combos[ok[metric].idxmax()] if len(ok) else None
+                folds.append(
+                    {
+                        "fold": f,
+                        "train_start": times[s],
+                        "test_start": times[m],
+                        "test_end": times[e - 1],
+                        "params": best,
+                        f"train_{metric}": ok[metric].max() if len(ok) else None,
+                    }
+                )
+                if best is not None:
+                    tests[f] = pool.submit(_evaluate, best, m, e, jit, True)
+
+            for f, fold in enumerate(folds):
+                if f in tests:
+                    row, trades = tests[f].result()
+                    params = fold["params"]
+                    fold.update(
+                        {f"test_{k}": v for k, v in row.items() if k not in params}
+                    )
+                    rr = params.get("rr", default_rr)
+                    for trade in trades:
+                        r = rr if trade["result"] == "WIN" else -1.0
+                        oos.append({"fold": f, **trade, "r": r})
+                if on_fold:
+                    on_fold(fold)
+
+    trades = pd.DataFrame(oos)
+    if len(trades):
+        trades = trades.sort_values("exit_time", kind="stable").reset_index(drop=True)
+        equity = trades.set_index("exit_time")["r"].cumsum().rename("equity_r")
+    else:
+        equity = pd.Series(dtype=float, name="equity_r")
+    return pd.DataFrame(folds), trades, equity
+
+
+def print_fold(fold):
+    if fold["params"] is None:
+        print(f"⏭️  fold {fold['fold']}: no combination reached the trade minimum")
+        return
+    print(
+        f"✅ fold {fold['fold']} | test {fold['test_start']:%Y-%m-%d} ~ "
+        f"{fold['test_end']:%Y-%m-%d} | {fold['params']} | "
+        f"{fold['test_trades']} trades | {fold['test_total_r']:+.2f}R"
+    )
+
+
+# =====================================================
+if __name__ == "__main__":
+    try:
+        frames = load_frames("BTC", days=180)
+    except ValueError as e:
+        print(f"Data collection failed: {e}")
+        sys.exit(1)
+
+    space = dict(
+        rr=[2.0, 3.0, 4.0],
+        lookback=[20, 30, 40],
+        factor=[1.5, 2.0],
+        min_dist=[0.002, 0.003, 0.005],
+    )
+    combos = grid(space)
+    print(
+        f"🚀 Walk-forward over {len(combos)} combinations on {os.cpu_count()} cores..."
+    )
+    folds, trades, equity = walk_forward(
+        "backtest.ict.h1_poi_m1_m5:make_engine", frames, combos, on_fold=print_fold
+    )
+    if len(equity):
+        wins = (trades["result"] == "WIN").sum()
+        print(
+            f"\nOOS trades: {len(trades)} | WinRate: {wins / len(trades) * 100:.2f}% | "
+            f"total: {equity.iloc[-1]:+.2f}R | max drawdown: "
+            f"{(equity.cummax() - equity).max():.2f}R"
+        )
+    else:
+        print("No out-of-sample trades")
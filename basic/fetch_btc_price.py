@@ -1,40 +1,44 @@
 # fetch_btc_price.py
 import os
-import time
+import sys
 from dotenv import load_dotenv
-from hyperliquid.info import Info
 from hyperliquid.utils import constants
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from live.feed import MarketFeed
+
 # Load environment variables
 load_dotenv()
 
-# Initialize Info object for Testnet
-# No Private Key required for fetching public market data
-info = Info(constants.TESTNET_API_URL, skip_ws=True)
+# Stream market data from Testnet over the websocket
+# No Private Key required for public market data
+feed = MarketFeed(constants.TESTNET_API_URL)
+
+
+def print_price(coin, price):
+    print(f"Current BTC Price: {price:.2f} USDC")
+
 
 def fetch_btc_price():
     print("Starting BTC price monitor... (Press Ctrl+C to stop)")
     try:
-        while True:
-            # Fetch all mid prices from the exchange
-            all_mids = info.all_mids()
-            
-            # Extract BTC price
-            btc_price = all_mids.get("BTC")
-            
-            if btc_price:
-                print(f"Current BTC Price: {float(btc_price):.2f} USDC")
-            else:
-                print("BTC price data not found.")
-            
-            # Wait for 1 second before next update
-            time.sleep(1)
-            
+        # Every allMids update pushes the new BTC mid; no polling
+        feed.on("price", print_price, coin="BTC")
+        feed.watch_mids()
+        feed.start()
+
+        if feed.wait_price("BTC", timeout=10) is None:
+            print("BTC price data not found.")
+
+        feed.join()
+
     except KeyboardInterrupt:
         print("\nMonitoring stopped by user.")
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
+    finally:
+        feed.stop()
+
 
 if __name__ == "__main__":
     fetch_btc_price()
-    
\ No newline at end of file
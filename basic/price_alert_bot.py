@@ -1,32 +1,46 @@
 # price_alert_bot.py
+import asyncio
 import os
-import time
+import sys
 from dotenv import load_dotenv
-from hyperliquid.info import Info
 from hyperliquid.utils import constants
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from live.feed import MarketFeed
+from live.runner import Runner, Strategy
+
 load_dotenv()
-info = Info(constants.TESTNET_API_URL, skip_ws=True)
 
-TARGET_PRICE = 95000.0 
+TARGET_PRICE = 95000.0
+
+
+class PriceAlert(Strategy):
+    # no orders: runs in live/runner.py next to trading strategies
+    def __init__(self, name, coin="BTC", target_price=TARGET_PRICE):
+        super().__init__(name, coins=(coin,))
+        self.target_price = target_price
+
+    async def on_price(self, coin, current_price):
+        # called on every tick, straight from the websocket
+        if current_price >= self.target_price:
+            self.log(
+                f"🚨🚨 [ALERT] {coin} hit ${current_price}! Target ${self.target_price} reached! 🚨🚨"
+            )
+        else:
+            self.log(f"Current Price: ${current_price} (Target: ${self.target_price})")
+
 
 def price_alert_bot():
     print(f"--- Monitoring BTC price. Alert at: ${TARGET_PRICE} ---")
-    
-    try:
-        while True:
-            all_mids = info.all_mids()
-            current_price = float(all_mids.get("BTC", 0))
 
-            if current_price >= TARGET_PRICE:
-                print(f"🚨🚨 [ALERT] BTC hit ${current_price}! Target ${TARGET_PRICE} reached! 🚨🚨")
-            else:
-                print(f"Current Price: ${current_price} (Target: ${TARGET_PRICE})")
+    runner = Runner(MarketFeed(constants.TESTNET_API_URL))
+    runner.add(PriceAlert("price_alert"))
+    try:
+        asyncio.run(runner.run())
 
-            time.sleep(2)
-            
     except KeyboardInterrupt:
         print("\nStop monitoring.")
 
+
 if __name__ == "__main__":
-    price_alert_bot()
\ No newline at end of file
+    price_alert_bot()
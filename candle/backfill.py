@@ -0,0 +1,72 @@
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+from candle.schema import COLUMNS, INTERVAL_MS, candles_to_columns
+
+# =========================
+# Setting
+# =========================
+SNAPSHOT_LIMIT = 5000  # max candles returned by one candles_snapshot call
+MAX_WORKERS = 4
+
+
+# =========================
+# Range split
+# =========================
+def split_range(start, end, interval, chunk_bars=SNAPSHOT_LIMIT - 1):
+    # [start, end] -> consecutive chunks that each fit in one snapshot
+    step = INTERVAL_MS[interval] * chunk_bars
+    chunks = []
+    s = start
+    while s <= end:
+        e = min(s + step - 1, end)
+        chunks.append((s, e))
+        s = e + 1
+    return chunks
+
+
+# =========================
+# Stitch / gap check
+# =========================
+def stitch(parts):
+    # concatenate chunk results and sort by open time; on duplicated bars the
+    # row from the later part wins (a stored bar may have still been forming)
+    cols = {col: np.concatenate([p[col] for p in parts]) for col in COLUMNS}
+    order = np.argsort(cols["t"], kind="stable")
+    t = cols["t"][order]
+    keep = np.ones(len(t), dtype=bool)
+    keep[:-1] = t[1:] != t[:-1]
+    idx = order[keep]
+    return {col: cols[col][idx] for col in COLUMNS}
+
+
+def find_gaps(t, interval):
+    # list of (last bar before gap, first bar after gap)
+    if interval == "1M" or len(t) < 2:
+        return []
+    diffs = np.diff(t)
+    where = np.nonzero(diffs != INTERVAL_MS[interval])[0]
+    return [(int(t[i]), int(t[i + 1])) for i in where]
+
+
+# =========================
+# Backfill
+# =========================
+def backfill(info, coin, interval, start, end, max_workers=MAX_WORKERS):
+    chunks = split_range(start, end, interval)
+
+    def fetch(chunk):
+        candles = info.candles_snapshot(coin, interval, chunk[0], chunk[1])
+        return candles_to_columns(candles or [])
+
+    if len(chunks) == 1:
+        parts = [fetch(chunks[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as pool:
+            parts = list(pool.map(fetch, chunks))
+
+    cols = stitch(parts)
+    gaps = find_gaps(cols["t"], interval)
+    if gaps:
+        print(f"⚠️ {coin} {interval}: {len(gaps)} gap(s) in backfilled candles")
+    return cols
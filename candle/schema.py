@@ -0,0 +1,59 @@
+import time
+import numpy as np
+import pandas as pd
+
+# =========================
+# Candle columns
+# =========================
+COLUMNS = ["t", "o", "h", "l", "c", "v"]
+DTYPES = {
+    "t": np.int64,
+    "o": np.float64,
+    "h": np.float64,
+    "l": np.float64,
+    "c": np.float64,
+    "v": np.float64,
+}
+
+INTERVAL_MS = {
+    "1m": 60_000,
+    "3m": 3 * 60_000,
+    "5m": 5 * 60_000,
+    "15m": 15 * 60_000,
+    "30m": 30 * 60_000,
+    "1h": 3_600_000,
+    "2h": 2 * 3_600_000,
+    "4h": 4 * 3_600_000,
+    "8h": 8 * 3_600_000,
+    "12h": 12 * 3_600_000,
+    "1d": 86_400_000,
+    "3d": 3 * 86_400_000,
+    "1w": 7 * 86_400_000,
+    "1M": 30 * 86_400_000,
+}
+
+
+def now_ms():
+    return int(time.time() * 1000)
+
+
+def candles_to_columns(candles):
+    # Raw candles_snapshot rows -> dict of numpy columns
+    return {
+        col: np.array([c[col] for c in candles], dtype=DTYPES[col]) for col in COLUMNS
+    }
+
+
+def columns_to_frame(cols):
+    df = pd.DataFrame(
+        {
+            "timestamp": pd.to_datetime(cols["t"], unit="ms"),
+            "open": cols["o"],
+            "high": cols["h"],
+            "low": cols["l"],
+            "close": cols["c"],
+            "volume": cols["v"],
+        }
+    )
+    df.set_index("timestamp", inplace=True)
+    return df
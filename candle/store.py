@@ -0,0 +1,124 @@
+import json
+import os
+import numpy as np
+from hyperliquid.info import Info
+from hyperliquid.utils import constants
+
+from candle.backfill import backfill, stitch
+from candle.schema import COLUMNS, DTYPES, columns_to_frame, now_ms
+
+# =========================
+# Setting
+# =========================
+BASE_URL = constants.TESTNET_API_URL
+STORE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "candles"
+)
+
+
+# =========================
+# Candle Store
+# =========================
+class CandleStore:
+    """
+    On-disk candle cache keyed by (coin, interval).
+
+    Every column lives in its own .npy file under STORE_DIR/<coin>/<interval>/
+    and is opened memory-mapped, so a warm load is a file read. Only bars after
+    the last stored timestamp (and before the earliest covered start) are
+    requested from the API.
+
+    The Info client is only built on the first fetch, by connect(BASE_URL).
+    Backfill chunks run in parallel, so callers pass a rate-limited factory
+    (live.ratelimit.limited_info) to keep them inside the IP budget.
+    """
+
+    def __init__(self, info=None, root=STORE_DIR, connect=None):
+        self.info = info
+        self.root = root
+        self.connect = connect or (lambda base_url: Info(base_url, skip_ws=True))
+
+    def _client(self):
+        if self.info is None:
+            self.info = self.connect(BASE_URL)
+        return self.info
+
+    def _dir(self, coin, interval):
+        return os.path.join(self.root, coin.replace("/", "_"), interval)
+
+    def read(self, coin, interval):
+        path = self._dir(coin, interval)
+        if not os.path.exists(os.path.join(path, "meta.json")):
+            return None, None
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        cols = {
+            col: np.load(os.path.join(path, f"{col}.npy"), mmap_mode="r")
+            for col in COLUMNS
+        }
+        return cols, meta
+
+    def write(self, coin, interval, cols, meta):
+        path = self._dir(coin, interval)
+        os.makedirs(path, exist_ok=True)
+        # write to temp files first so a crash never leaves a half-written column
+        for col in COLUMNS:
+            tmp = os.path.join(path, f"{col}.tmp.npy")
+            np.save(tmp, np.ascontiguousarray(cols[col], dtype=DTYPES[col]))
+            os.replace(tmp, os.path.join(path, f"{col}.npy"))
+        tmp = os.path.join(path, "meta.tmp.json")
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(path, "meta.json"))
+
+    def fetch(self, coin, interval, start, end):
+        return backfill(self._client(), coin, interval, start, end)
+
+    def update(self, coin, interval, start, end):
+        cols, meta = self.read(coin, interval)
+
+        if cols is None or len(cols["t"]) == 0:
+            merged = self.fetch(coin, interval, start, end)
+            covered = start
+        else:
+            first_t, last_t = int(cols["t"][0]), int(cols["t"][-1])
+            covered = meta.get("covered_start", first_t)
+            parts = []
+            if start < covered:
+                parts.append(self.fetch(coin, interval, start, first_t - 1))
+            if end > last_t:
+                # re-request the last stored bar so a partial candle gets closed out
+                parts.append(self.fetch(coin, interval, last_t, end))
+            if not parts:
+                return cols
+            # fetched rows win over the stored copy of the same bar
+            merged = stitch([cols] + parts)
+            covered = min(covered, start)
+
+        if len(merged["t"]) == 0:
+            return merged
+
+        self.write(coin, interval, merged, {"covered_start": int(covered)})
+        return self.read(coin, interval)[0]
+
+    def load(self, coin, interval, start, end=None):
+        end = end or now_ms()
+        cols = self.update(coin, interval, start, end)
+        if len(cols["t"]) == 0:
+            return None
+        lo = np.searchsorted(cols["t"], start, side="left")
+        hi = np.searchsorted(cols["t"], end, side="right")
+        return columns_to_frame({col: cols[col][lo:hi] for col in COLUMNS})
+
+
+# =========================
+# Data collection
+# =========================
+def get_ohlcv(symbol, interval, days=15, info=None, store=None):
+    try:
+        store = store or CandleStore(info)
+        start = now_ms() - 86400 * 1000 * days
+        return store.load(symbol, interval, start)
+    except Exception as e:
+        print(f"Data Fetch Error ({interval}): {e}")
+        return None
@@ -0,0 +1,99 @@
+import numpy as np
+
+from candle.schema import INTERVAL_MS, columns_to_frame
+
+# =========================
+# Setting
+# =========================
+START_MS = 1_704_067_200_000  # 2024-01-01 00:00 UTC
+PRICE = 60_000.0
+YEAR_MS = 365 * 86_400_000
+
+# (annualised volatility, mean bars spent in the regime at 1m)
+REGIMES = [(0.35, 2_000), (0.8, 600), (1.6, 120)]
+
+
+# =========================
+# Synthetic candles
+# =========================
+def _regimes(n, rng, bar_scale):
+    # Markov volatility regime per bar; stays put for ~mean_len bars
+    sigma = np.empty(n)
+    i, k = 0, 0
+    while i < n:
+        vol, mean_len = REGIMES[k]
+        length = max(1, int(rng.exponential(mean_len / bar_scale)))
+        sigma[i : i + length] = vol
+        i += length
+        k = rng.choice([j for j in range(len(REGIMES)) if j != k])
+    return sigma
+
+
+def _gaps(n, rng, gaps, max_gap):
+    # mask of bars kept after cutting `gaps` random holes of 1..max_gap bars
+    keep = np.ones(n, dtype=bool)
+    if gaps and n > 1:
+        starts = rng.integers(1, n, gaps)
+        lengths = rng.integers(1, max_gap + 1, gaps)
+        for s, length in zip(starts, lengths):
+            keep[s : s + length] = False
+    return keep
+
+
+def synthetic_columns(
+    n, interval="1m", seed=0, price=PRICE, drift=0.0, gaps=0, max_gap=30, start=START_MS
+):
+    """
+    n candles of a geometric Brownian motion, as candle store columns.
+
+    Volatility switches between the REGIMES, wicks and volume scale with the
+    current regime, and `gaps` random holes of up to max_gap bars are cut out
+    of the series (price keeps moving through them, like an exchange outage).
+    The same arguments always give the same candles.
+    """
+    rng = np.random.default_rng(seed)
+    bar_ms = INTERVAL_MS[interval]
+    dt = bar_ms / YEAR_MS
+    sigma = _regimes(n, rng, bar_ms / INTERVAL_MS["1m"])
+
+    ret = (drift - 0.5 * sigma**2) * dt + sigma * np.sqrt(dt) * rng.standard_normal(n)
+    close = price * np.exp(np.cumsum(ret))
+    open_ = np.r_[price, close[:-1]]
+    wick = close * sigma * np.sqrt(dt)
+    high = np.maximum(open_, close) + wick * rng.exponential(0.5, n)
+    low = np.minimum(open_, close) - wick * rng.exponential(0.5, n)
+    volume = rng.lognormal(0.0, 0.5, n) * sigma * 100
+
+    keep = _gaps(n, rng, gaps, max_gap)
+    t = start + np.arange(n, dtype=np.int64) * bar_ms
+    return {
+        "t": t[keep],
+        "o": open_[keep].round(1),
+        "h": high[keep].round(1),
+        "l": low[keep].round(1),
+        "c": close[keep].round(1),
+        "v": volume[keep].round(3),
+    }
+
+
+def synthetic_ohlcv(n, interval="1m", seed=0, **kwargs):
+    # same frame layout as candle.store.get_ohlcv
+    return columns_to_frame(synthetic_columns(n, interval, seed, **kwargs))
+
+
+def resample(df, interval):
+    # aggregate a finer frame to interval; bins emptied by gaps are dropped
+    rule = f"{INTERVAL_MS[interval] // 60_000}min"
+    agg = {"open": "first", "high": "max", "low": "min", "close": "last"}
+    if "volume" in df:
+        agg["volume"] = "sum"
+    return df.resample(rule).agg(agg).dropna(subset=["open"])
+
+
+def synthetic_mtf(n, seed=0, intervals=("1m", "5m", "1h"), **kwargs):
+    """
+    n 1m candles plus their resampled higher timeframes, keyed by interval,
+    so H1 / M5 / M1 agree with each other the way exchange candles do.
+    """
+    m1 = synthetic_ohlcv(n, "1m", seed, **kwargs)
+    return {iv: m1 if iv == "1m" else resample(m1, iv) for iv in intervals}
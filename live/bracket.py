@@ -0,0 +1,214 @@
+import secrets
+from hyperliquid.utils.types import Cloid
+
+from live.bulk import statuses
+
+# =========================
+# Setting
+# =========================
+SLIPPAGE = 0.001  # Ioc entries / market exits may fill this far from their price
+CLOSE_SLIPPAGE = 0.05  # forced closes cross this far: getting flat beats the price
+CANCEL_TRIES = 2  # cancel-by-cloid attempts per leg before the position is closed
+LEGS = ("entry", "tp", "sl")
+
+
+# =========================
+# Order requests
+# =========================
+def bracket_cloids():
+    # one random id per bracket, the low bits tell the legs apart
+    base = secrets.randbits(124) << 4
+    return {leg: Cloid.from_int(base | n) for n, leg in enumerate(LEGS, 1)}
+
+
+def entry_order(coin, is_buy, sz, px, tif="Ioc", slippage=SLIPPAGE, cloid=None):
+    # Ioc entries cross by `slippage`; Gtc / Alo rest at px
+    if tif == "Ioc":
+        px = px * (1 + slippage) if is_buy else px * (1 - slippage)
+    return {
+        "coin": coin,
+        "is_buy": is_buy,
+        "sz": sz,
+        "limit_px": px,
+        "order_type": {"limit": {"tif": tif}},
+        "reduce_only": False,
+        "cloid": cloid,
+    }
+
+
+def exit_order(coin, is_buy, sz, trigger_px, tpsl, slippage=SLIPPAGE, cloid=None):
+    """
+    Reduce-only market trigger closing a position opened with is_buy.
+
+    tpsl is "tp" or "sl"; limit_px only bounds the market fill's slippage.
+    """
+    limit_px = trigger_px * (1 - slippage) if is_buy else trigger_px * (1 + slippage)
+    return {
+        "coin": coin,
+        "is_buy": not is_buy,
+        "sz": sz,
+        "limit_px": limit_px,
+        "order_type": {
+            "trigger": {"triggerPx": trigger_px, "isMarket": True, "tpsl": tpsl}
+        },
+        "reduce_only": True,
+        "cloid": cloid,
+    }
+
+
+# =========================
+# Brackets
+# =========================
+class Brackets:
+    """
+    Entries with exchange-side take-profit / stop-loss.
+
+    open() sends the entry and its TP / SL triggers as one normalTpsl action:
+    the exits only arm once the entry fills and are dropped with it, so they
+    fire at exchange speed even if the bot dies. protect() attaches TP / SL
+    to a position that is already open (positionTpsl). Every leg carries a
+    cloid, so move() re-prices both exits in one batchModify and cancel()
+    pulls both in one cancel-by-cloid.
+
+    The exchange still answers each leg on its own, so one leg can fail
+    while the other goes through. move() then puts the moved leg back at its
+    old price, or cancels it if that fails; cancel() retries a leg that
+    would not cancel. A leg that can be neither restored nor cancelled ends
+    in close(): a reduce-only Ioc that flattens the position, so the
+    remaining exit has nothing left to trade. When move() / cancel() return,
+    the bracket's tp / sl are the prices resting on the exchange (None for a
+    cancelled leg), or the position was sent a close; the status rows of
+    every action are returned, a failed close included.
+
+    Methods block on the exchange; run them through Gateway.submit.
+    A bracket is a dict: {"coin", "is_buy", "sz", "tp", "sl", "cloids",
+    "status" (entry status, "closed" after close()), "rows" (per-leg
+    BulkOrders status rows)}.
+    """
+
+    def __init__(self, bulk, slippage=SLIPPAGE):
+        self.bulk = bulk
+        self.slippage = slippage
+
+    def _exits(self, bracket):
+        return [
+            exit_order(
+                bracket["coin"],
+                bracket["is_buy"],
+                bracket["sz"],
+                bracket[leg],
+                leg,
+                self.slippage,
+                bracket["cloids"][leg],
+            )
+            for leg in ("tp", "sl")
+            if bracket[leg] is not None
+        ]
+
+    def _bracket(self, coin, is_buy, sz, tp, sl):
+        return {
+            "coin": coin,
+            "is_buy": is_buy,
+            "sz": sz,
+            "tp": tp,
+            "sl": sl,
+            "cloids": bracket_cloids(),
+        }
+
+    def open(self, coin, is_buy, sz, px, tp=None, sl=None, tif="Ioc"):
+        bracket = self._bracket(coin, is_buy, sz, tp, sl)
+        entry = entry_order(
+            coin, is_buy, sz, px, tif, self.slippage, bracket["cloids"]["entry"]
+        )
+        exits = self._exits(bracket)
+        rows = self.bulk.place([entry, *exits], "normalTpsl" if exits else "na")
+        bracket.update(status=rows[0]["status"], rows=rows)
+        return bracket
+
+    def protect(self, coin, is_buy, sz, tp=None, sl=None):
+        # TP / SL for an open position (is_buy = the position's side)
+        bracket = self._bracket(coin, is_buy, sz, tp, sl)
+        rows = self.bulk.place(self._exits(bracket), "positionTpsl")
+        bracket.update(status="open", rows=rows)
+        return bracket
+
+    def move(self, bracket, tp=None, sl=None):
+        """
+        Re-price the exits of a bracket in one batchModify.
+
+        Only the legs given change; each keeps its cloid. A move the
+        exchange applies to one leg only is undone (see the class
+        docstring). Returns the status rows of every action sent and
+        updates the bracket in place.
+        """
+        moved = {**bracket, "tp": tp, "sl": sl}
+        exits = self._exits(moved)
+        if not exits:
+            return []
+        rows = self.bulk.replace([(order["cloid"], order) for order in exits])
+        done = [leg for leg, row in zip(_legs(moved), rows) if row["ok"]]
+        if len(done) == len(rows) or not done:
+            bracket.update({leg: moved[leg] for leg in done})
+            return rows
+
+        # one leg moved, the other did not: put the moved leg back, and
+        # cancel it if it had no old price or will not go back
+        restore = [leg for leg in done if bracket[leg] is not None]
+        old = {leg: bracket[leg] if leg in restore else None for leg in ("tp", "sl")}
+        undo = self._exits({**bracket, **old})
+        back = self.bulk.replace([(order["cloid"], order) for order in undo])
+        rows += back
+        stuck = [leg for leg in done if leg not in restore]
+        stuck += [leg for leg, row in zip(restore, back) if not row["ok"]]
+        if stuck:
+            rows += self._drop(bracket, stuck)
+        return rows
+
+    def cancel(self, bracket):
+        # both exits in one cancel-by-cloid action, then the fallbacks
+        return self._drop(bracket, _legs(bracket))
+
+    def close(self, bracket):
+        """
+        Flatten the bracket's position with a reduce-only Ioc at the mid.
+
+        Crosses CLOSE_SLIPPAGE so it fills in a fast market; reduce_only
+        caps it at what is left of the position.
+        """
+        coin = bracket["coin"]
+        try:
+            px = float(self.bulk.info.all_mids()[coin])
+        except Exception as e:
+            request = {"coin": coin, "cloid": None}
+            return statuses([request], {"status": "err", "response": str(e)})
+        order = entry_order(
+            coin, not bracket["is_buy"], bracket["sz"], px, "Ioc", CLOSE_SLIPPAGE
+        )
+        rows = self.bulk.place([{**order, "reduce_only": True}])
+        if rows[0]["ok"]:
+            bracket["status"] = "closed"
+        return rows
+
+    def _drop(self, bracket, legs):
+        # cancel `legs`, retrying the ones that fail, and close if any stays
+        rows = []
+        for _ in range(CANCEL_TRIES):
+            if not legs:
+                return rows
+            sent = self.bulk.cancel_by_cloid(
+                [
+                    {"coin": bracket["coin"], "cloid": bracket["cloids"][leg]}
+                    for leg in legs
+                ]
+            )
+            rows += sent
+            for leg, row in zip(legs, sent):
+                if row["ok"]:
+                    bracket[leg] = None
+            legs = [leg for leg, row in zip(legs, sent) if not row["ok"]]
+        return rows + self.close(bracket) if legs else rows
+
+
+def _legs(bracket):
+    # exits present in a bracket, in _exits order
+    return [leg for leg in ("tp", "sl") if bracket[leg] is not None]
@@ -0,0 +1,179 @@
+from hyperliquid.utils.types import Cloid
+from live.meta import MetaCache
+
+# =========================
+# Setting
+# =========================
+# orders / cancels per signed action; keeps every request well under the
+# exchange's payload limit
+MAX_BATCH = 40
+
+
+def chunked(items, size=MAX_BATCH):
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def as_cloid(cloid):
+    if cloid is None or isinstance(cloid, Cloid):
+        return cloid
+    return Cloid.from_int(cloid) if isinstance(cloid, int) else Cloid.from_str(cloid)
+
+
+# =========================
+# Per-order status
+# =========================
+def _row(request, status):
+    # one exchange status entry -> flat report row
+    row = {
+        "coin": request["coin"],
+        "oid": request.get("oid"),
+        "cloid": str(request["cloid"]) if request.get("cloid") else None,
+    }
+    if status == "success":
+        return {**row, "ok": True, "status": "canceled"}
+    if isinstance(status, str):
+        # grouped TP / SL children: "waitingForFill" / "waitingForTrigger"
+        return {**row, "ok": True, "status": status}
+    if isinstance(status, dict) and "error" not in status:
+        kind, detail = next(iter(status.items()))
+        detail = detail if isinstance(detail, dict) else {}
+        return {**row, "ok": True, "status": kind, "oid": detail.get("oid", row["oid"])}
+    error = status.get("error") if isinstance(status, dict) else status
+    return {**row, "ok": False, "status": "error", "error": str(error)}
+
+
+def statuses(requests, result):
+    """
+    Zip a batch response with the requests that produced it.
+
+    A rejected batch (status "err" or a missing status list) marks every
+    request of the batch as an error with the exchange's message.
+    """
+    if isinstance(result, dict) and result.get("status") == "ok":
+        data = result["response"].get("data", {})
+        found = data.get("statuses")
+        if found is not None and len(found) == len(requests):
+            return [_row(r, s) for r, s in zip(requests, found)]
+    error = result.get("response", result) if isinstance(result, dict) else result
+    return [_row(r, {"error": error}) for r in requests]
+
+
+def summarize(rows):
+    ok = sum(row["ok"] for row in rows)
+    return {"total": len(rows), "ok": ok, "failed": len(rows) - ok}
+
+
+# =========================
+# Bulk order management
+# =========================
+class BulkOrders:
+    """
+    Batched order management on top of one Exchange.
+
+    Every operation is split into MAX_BATCH-sized signed actions and returns
+    one status row per order: {"coin", "oid", "cloid", "ok", "status"
+    (resting / filled / canceled / waitingForFill / error), "error"}. Run it through
+    Gateway.submit to keep it off the caller's thread.
+    """
+
+    def __init__(self, exchange, address=None, max_batch=MAX_BATCH, meta=None):
+        self.exchange = exchange
+        self.info = exchange.info
+        self.address = address or exchange.account_address or exchange.wallet.address
+        self.max_batch = max_batch
+        self.meta = meta or MetaCache(self.info)
+
+    def _batches(self, requests, send, size=None):
+        rows = []
+        for batch in chunked(requests, size or self.max_batch):
+            try:
+                result = send(batch)
+            except Exception as e:
+                result = {"status": "err", "response": str(e)}
+            rows += statuses(batch, result)
+        return rows
+
+    # -------------------------
+    # Place
+    # -------------------------
+    def place(self, orders, grouping="na"):
+        """
+        orders are SDK OrderRequest dicts: coin, is_buy, sz, limit_px,
+        order_type, reduce_only and an optional cloid (str, int or Cloid).
+        sz / limit_px are rounded to the coin's lot / tick size first.
+        Grouped orders (normalTpsl / positionTpsl) always go out as one
+        action, so an entry is never split from its TP / SL.
+        """
+        orders = [
+            {**self.meta.normalize(o), "cloid": as_cloid(o.get("cloid"))}
+            for o in orders
+        ]
+        for o in orders:
+            if o["cloid"] is None:
+                del o["cloid"]
+            o.setdefault("reduce_only", False)
+        return self._batches(
+            orders,
+            lambda batch: self.exchange.bulk_orders(batch, grouping=grouping),
+            len(orders) if grouping != "na" else None,
+        )
+
+    # -------------------------
+    # Cancel
+    # -------------------------
+    def cancel(self, orders):
+        # orders: dicts with coin and oid (open_orders rows work as-is)
+        requests = [{"coin": o["coin"], "oid": o["oid"]} for o in orders]
+        return self._batches(requests, self.exchange.bulk_cancel)
+
+    def cancel_by_cloid(self, orders):
+        # orders: dicts with coin and cloid
+        requests = [{"coin": o["coin"], "cloid": as_cloid(o["cloid"])} for o in orders]
+        return self._batches(requests, self.exchange.bulk_cancel_by_cloid)
+
+    def open_orders(self, coins=None):
+        orders = self.info.open_orders(self.address)
+        if coins is not None:
+            orders = [o for o in orders if o["coin"] in set(coins)]
+        return orders
+
+    def cancel_all(self, coins=None):
+        # every resting order of the account (or of `coins`), batched
+        return self.cancel(self.open_orders(coins))
+
+    # -------------------------
+    # Replace
+    # -------------------------
+    def replace(self, replacements):
+        """
+        Cancel-and-replace in one signed batchModify per chunk.
+
+        replacements: [(oid or cloid of the resting order, new OrderRequest)].
+        Each row reports the new order's status.
+        """
+        modifies = []
+        for target, order in replacements:
+            order = {
+                "reduce_only": False,
+                **self.meta.normalize(order),
+                "cloid": as_cloid(order.get("cloid")),
+            }
+            target = target if isinstance(target, int) else as_cloid(target)
+            modifies.append({"oid": target, "order": order})
+
+        rows = []
+        for batch in chunked(modifies, self.max_batch):
+            try:
+                result = self.exchange.bulk_modify_orders_new(batch)
+            except Exception as e:
+                result = {"status": "err", "response": str(e)}
+            requests = [
+                {
+                    "coin": m["order"]["coin"],
+                    "oid": m["oid"],
+                    "cloid": m["order"]["cloid"],
+                }
+                for m in batch
+            ]
+            rows += statuses(requests, result)
+        return rows
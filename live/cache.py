@@ -0,0 +1,118 @@
+import copy
+import threading
+import time
+
+from live.ratelimit import SingleFlight
+
+# =========================
+# Setting
+# =========================
+# seconds a response stays fresh, per info endpoint
+TTLS = {
+    "allMids": 1.0,
+    "clearinghouseState": 2.0,
+    "spotClearinghouseState": 2.0,
+    "openOrders": 2.0,
+}
+# endpoints that describe the account: dropped when one of our fills arrives
+USER_ENDPOINTS = ("clearinghouseState", "spotClearinghouseState", "openOrders")
+
+
+# =========================
+# Cached Info
+# =========================
+class CachedInfo:
+    """
+    Read-through cache over Info for the reads every bot repeats.
+
+    all_mids / user_state / spot_user_state / open_orders are served from
+    memory while younger than their TTL; a miss is single-flight (the same
+    SingleFlight the rate limiter coalesces with), so any number of
+    concurrent callers share one request. Every caller gets its own copy of
+    the response, so mutating it never leaks into the cache or into another
+    strategy. Everything else is passed
+    straight to the wrapped Info. watch(feed, address) drops the account
+    entries the moment one of our fills or order updates arrives, so a
+    cached balance is never older than our own last trade.
+    """
+
+    def __init__(self, info, ttls=None):
+        self.info = info
+        self.ttls = {**TTLS, **(ttls or {})}
+        self.lock = threading.Lock()
+        self.entries = {}  # (endpoint, *args) -> (time.monotonic(), value)
+        self.flights = SingleFlight()
+        self.epoch = 0  # bumped by every invalidation
+        self.stats = {"hits": 0, "misses": 0, "shared": 0, "invalidated": 0}
+
+    def __getattr__(self, name):
+        # any Info method without a cache entry
+        return getattr(self.info, name)
+
+    # -------------------------
+    # Read-through
+    # -------------------------
+    def get(self, endpoint, fn, *args):
+        key = (endpoint, *args)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttls[endpoint]:
+                self.stats["hits"] += 1
+                return copy.deepcopy(entry[1])
+        value, shared = self.flights.do(key, lambda: self._load(key, fn, args))
+        with self.lock:
+            self.stats["shared" if shared else "misses"] += 1
+        # waiters already hold a copy; the stored value never leaves the cache
+        return value if shared else copy.deepcopy(value)
+
+    def _load(self, key, fn, args):
+        with self.lock:
+            epoch = self.epoch
+        started = time.monotonic()
+        value = fn(*args)
+        with self.lock:
+            # an invalidation during the request: the value may predate it, so
+            # hand it to the waiters but do not keep it
+            if self.epoch == epoch:
+                self.entries[key] = (started, value)
+        return value
+
+    def all_mids(self, dex=""):
+        return self.get("allMids", self.info.all_mids, dex)
+
+    def user_state(self, address, dex=""):
+        return self.get("clearinghouseState", self.info.user_state, address, dex)
+
+    def spot_user_state(self, address):
+        return self.get("spotClearinghouseState", self.info.spot_user_state, address)
+
+    def open_orders(self, address, dex=""):
+        return self.get("openOrders", self.info.open_orders, address, dex)
+
+    # -------------------------
+    # Invalidation
+    # -------------------------
+    def invalidate(self, endpoints=None, address=None):
+        # endpoints None = all; address None = every address
+        def match(key):
+            if endpoints is not None and key[0] not in endpoints:
+                return False
+            return address is None or key[1].lower() == address.lower()
+
+        with self.lock:
+            self.epoch += 1
+            for key in [k for k in self.entries if match(k)]:
+                del self.entries[key]
+                self.stats["invalidated"] += 1
+        # later callers start a fresh request instead of joining a stale one
+        self.flights.forget(match)
+
+    def invalidate_user(self, address=None):
+        self.invalidate(USER_ENDPOINTS, address)
+
+    def watch(self, feed, address):
+        # our fills / order updates on the feed -> drop that account's entries
+        feed.on("userFills", lambda coin, fill: self.invalidate_user(address))
+        feed.on("orderUpdates", lambda coin, update: self.invalidate_user(address))
+        feed.watch_fills(address)
+        feed.watch_orders(address)
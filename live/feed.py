@@ -0,0 +1,213 @@
+import threading
+import time
+from collections import defaultdict
+from hyperliquid.utils import constants
+from hyperliquid.websocket_manager import WebsocketManager, subscription_to_identifier
+
+# =========================
+# Setting
+# =========================
+BASE_URL = constants.TESTNET_API_URL
+CHANNELS = (
+    "allMids",
+    "l2Book",
+    "trades",
+    "candle",
+    "price",
+    "userFills",
+    "orderUpdates",
+)
+
+
+# =========================
+# Market Feed
+# =========================
+class MarketFeed:
+    """
+    Streaming market data over the Hyperliquid websocket.
+
+    watch_*() subscribes to allMids / l2Book / trades / candle. Every message
+    updates an in-memory table (mids, books, last trades, latest candles) and
+    is fanned out to the callbacks registered with on(). "price" is the
+    freshest price per coin from whichever channel moved last (mid, book mid
+    or trade), so a strategy reacts to the first tick instead of the next
+    poll.
+
+    Callbacks run on the websocket thread and should return quickly.
+    """
+
+    def __init__(self, base_url=BASE_URL):
+        self.ws = WebsocketManager(base_url)
+        self.ws.daemon = True
+        self.lock = threading.Lock()
+        self.changed = threading.Condition(self.lock)
+        self.mids = {}
+        self.books = {}  # coin -> {"bid", "ask", "time"}
+        self.trades = {}  # coin -> last trade
+        self.candles = {}  # (coin, interval) -> latest candle
+        self.prices = {}  # coin -> freshest price
+        self.updated = {}  # coin -> time.monotonic() of the last price update
+        self.callbacks = defaultdict(list)  # (channel, coin or None) -> [fn]
+        self.subscriptions = {}  # SDK identifier -> subscription id
+        self.started = False
+
+    # -------------------------
+    # Lifecycle
+    # -------------------------
+    def start(self):
+        if not self.started:
+            self.ws.start()
+            self.started = True
+        return self
+
+    def stop(self):
+        if self.started:
+            self.ws.stop()
+            self.started = False
+
+    def join(self):
+        # block the caller until the socket closes (Ctrl+C still works)
+        while self.ws.is_alive():
+            self.ws.join(1)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # -------------------------
+    # Subscriptions
+    # -------------------------
+    def subscribe(self, subscription):
+        """
+        Subscribe once per channel / coin / user: repeating a watch returns
+        the first subscription id, so messages are never handled twice and
+        userFills / orderUpdates (one per socket in the SDK) never raise.
+        Subscriptions made before the socket opens are queued by the SDK.
+        """
+        identifier = subscription_to_identifier(subscription)
+        with self.lock:
+            if identifier not in self.subscriptions:
+                self.subscriptions[identifier] = self.ws.subscribe(
+                    subscription, self._on_message
+                )
+            return self.subscriptions[identifier]
+
+    def watch_mids(self):
+        return self.subscribe({"type": "allMids"})
+
+    def watch_book(self, coin):
+        return self.subscribe({"type": "l2Book", "coin": coin})
+
+    def watch_trades(self, coin):
+        return self.subscribe({"type": "trades", "coin": coin})
+
+    def watch_candles(self, coin, interval):
+        return self.subscribe({"type": "candle", "coin": coin, "interval": interval})
+
+    def watch_fills(self, user):
+        return self.subscribe({"type": "userFills", "user": user})
+
+    def watch_orders(self, user):
+        return self.subscribe({"type": "orderUpdates", "user": user})
+
+    def on(self, channel, callback, coin=None):
+        """
+        Register callback(coin, value) for a channel, for one coin or all.
+
+        value is the mid (allMids), {"bid", "ask", "time"} (l2Book), the
+        trade dict (trades), the candle dict (candle), the new price
+        (price), one of our fills (userFills, live fills only, not the
+        snapshot sent on subscribe) or one of our order updates
+        (orderUpdates).
+        """
+        if channel not in CHANNELS:
+            raise ValueError(f"unknown channel {channel!r}, expected one of {CHANNELS}")
+        self.callbacks[channel, coin].append(callback)
+        return callback
+
+    # -------------------------
+    # Latest values
+    # -------------------------
+    def price(self, coin):
+        with self.lock:
+            return self.prices.get(coin)
+
+    def book(self, coin):
+        with self.lock:
+            return self.books.get(coin)
+
+    def candle(self, coin, interval):
+        with self.lock:
+            return self.candles.get((coin, interval))
+
+    def age(self, coin):
+        # seconds since coin's price last moved (None before the first tick)
+        with self.lock:
+            t = self.updated.get(coin)
+        return None if t is None else time.monotonic() - t
+
+    def wait_price(self, coin, timeout=None):
+        with self.changed:
+            self.changed.wait_for(lambda: coin in self.prices, timeout)
+            return self.prices.get(coin)
+
+    # -------------------------
+    # Message handling (websocket thread)
+    # -------------------------
+    def _on_message(self, msg):
+        channel, data = msg["channel"], msg["data"]
+        events = []  # (channel, coin, value) to fan out after the table update
+        with self.changed:
+            now = time.monotonic()
+            if channel == "allMids":
+                for coin, mid in data["mids"].items():
+                    mid = float(mid)
+                    self.mids[coin] = mid
+                    events.append(("allMids", coin, mid))
+                    events += self._set_price(coin, mid, now)
+            elif channel == "l2Book":
+                coin = data["coin"]
+                bids, asks = data["levels"]
+                if bids and asks:
+                    book = {
+                        "bid": float(bids[0]["px"]),
+                        "ask": float(asks[0]["px"]),
+                        "time": data.get("time"),
+                    }
+                    self.books[coin] = book
+                    events.append(("l2Book", coin, book))
+                    events += self._set_price(
+                        coin, (book["bid"] + book["ask"]) / 2, now
+                    )
+            elif channel == "trades":
+                for trade in data:
+                    self.trades[trade["coin"]] = trade
+                    events.append(("trades", trade["coin"], trade))
+                if data:
+                    last = data[-1]
+                    events += self._set_price(last["coin"], float(last["px"]), now)
+            elif channel == "candle":
+                self.candles[data["s"], data["i"]] = data
+                events.append(("candle", data["s"], data))
+            elif channel == "userFills":
+                if not data.get("isSnapshot"):
+                    events += [("userFills", f["coin"], f) for f in data["fills"]]
+            elif channel == "orderUpdates":
+                events += [("orderUpdates", u["order"]["coin"], u) for u in data]
+            if events:
+                self.changed.notify_all()
+
+        for channel, coin, value in events:
+            for callback in self.callbacks.get((channel, coin), ()):
+                callback(coin, value)
+            for callback in self.callbacks.get((channel, None), ()):
+                callback(coin, value)
+
+    def _set_price(self, coin, price, now):
+        self.updated[coin] = now
+        if self.prices.get(coin) == price:
+            return []
+        self.prices[coin] = price
+        return [("price", coin, price)]
@@ -0,0 +1,179 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from hyperliquid.utils import constants
+from requests.adapters import HTTPAdapter
+from live import ratelimit
+from live.cache import CachedInfo
+from live.meta import MetaCache
+
+# =========================
+# Setting
+# =========================
+BASE_URL = constants.TESTNET_API_URL
+READ_WORKERS = 8
+
+
+# =========================
+# Order responses
+# =========================
+def order_statuses(result):
+    # exchange.order / bulk_orders response -> one status dict per order
+    if not isinstance(result, dict) or result.get("status") != "ok":
+        return [{"error": str(result)}]
+    data = result["response"].get("data", {})
+    return data.get("statuses", [])
+
+
+# =========================
+# Execution gateway
+# =========================
+class Gateway:
+    """
+    asyncio front end for the SDK's blocking Info / Exchange calls.
+
+    Info and Exchange share one requests.Session, so every call reuses the
+    same pool of keep-alive connections. Reads run on a thread pool and can
+    be awaited together (pre_trade); signed actions go through a single
+    writer thread, which keeps their nonces increasing and their order on
+    the wire the same as the order they were submitted in. Write methods
+    return an asyncio.Future right away, resolved with the exchange's ack.
+    Orders are rounded to the coin's tick / lot size (MetaCache) and leverage
+    is capped at the coin's maximum before they are signed. Every request
+    goes through the shared RateLimiter, orders ahead of reads, and reads
+    are served from CachedInfo; any write drops the cached account state.
+    """
+
+    def __init__(
+        self,
+        account,
+        address=None,
+        base_url=BASE_URL,
+        read_workers=READ_WORKERS,
+        exchange=None,
+        meta=None,
+        limiter=None,
+    ):
+        # both clients draw on the process-wide weight budget
+        self.limiter = limiter or ratelimit.limiter
+        self.exchange = exchange or self.limiter.exchange(
+            account, base_url, account_address=address
+        )
+        self.info = self.exchange.info
+        self.address = address or account.address
+        self.meta = meta or MetaCache(self.info)
+
+        # one keep-alive pool for reads and writes, sized for the read workers
+        session = self.exchange.session
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=read_workers + 1)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        self.info.session = session
+        # no-ops for clients built above, limits an exchange passed in
+        self.limiter.install(self.exchange)
+        self.limiter.install(self.info)
+
+        # repeated reads (mids, balances) are shared across every caller
+        self.cache = CachedInfo(self.info)
+
+        self.reads = ThreadPoolExecutor(read_workers, thread_name_prefix="gw-read")
+        self.writes = ThreadPoolExecutor(1, thread_name_prefix="gw-write")
+
+    def _run(self, pool, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(pool, partial(fn, *args, **kwargs))
+
+    def close(self):
+        self.reads.shutdown(wait=False)
+        self.writes.shutdown(wait=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    # -------------------------
+    # Reads (concurrent)
+    # -------------------------
+    def watch(self, feed):
+        # drop cached account reads as soon as our fills / order updates land
+        self.cache.watch(feed, self.address)
+
+    def read(self, fn, *args, **kwargs):
+        # any blocking Info call -> awaitable on the read pool
+        return self._run(self.reads, fn, *args, **kwargs)
+
+    async def user_state(self):
+        return await self._run(self.reads, self.cache.user_state, self.address)
+
+    async def balance(self):
+        state = await self.user_state()
+        return float(state["withdrawable"])
+
+    async def all_mids(self):
+        return await self._run(self.reads, self.cache.all_mids)
+
+    async def mid(self, coin):
+        return float((await self.all_mids())[coin])
+
+    async def open_orders(self):
+        return await self._run(self.reads, self.cache.open_orders, self.address)
+
+    async def pre_trade(self, coin, leverage=None, is_cross=False):
+        """
+        Balance, mid and (optionally) the leverage update in one round.
+
+        All three are in flight at the same time; returns {"balance", "mid",
+        "leverage"} with the raw update_leverage response (None when
+        leverage is not given).
+        """
+        jobs = [self.balance(), self.mid(coin), self._run(self.reads, self.meta.ensure)]
+        if leverage is not None:
+            jobs.append(self.update_leverage(leverage, coin, is_cross))
+        balance, mid, _, *rest = await asyncio.gather(*jobs)
+        return {"balance": balance, "mid": mid, "leverage": rest[0] if rest else None}
+
+    # -------------------------
+    # Writes (single ordered lane, non-blocking)
+    # -------------------------
+    def submit(self, fn, *args, **kwargs):
+        # any signed Exchange call -> Future of its response
+        return self._run(self.writes, self._write, fn, *args, **kwargs)
+
+    def order(
+        self, coin, is_buy, sz, limit_px, order_type, reduce_only=False, cloid=None
+    ):
+        return self.submit(
+            self._order, coin, is_buy, sz, limit_px, order_type, reduce_only, cloid
+        )
+
+    def cancel(self, coin, oid):
+        return self.submit(self.exchange.cancel, coin, oid)
+
+    def update_leverage(self, leverage, coin, is_cross=True):
+        return self.submit(self._update_leverage, leverage, coin, is_cross)
+
+    # writer-thread bodies: normalise against meta right before signing
+    def _write(self, fn, *args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.cache.invalidate_user(self.address)
+
+    def _order(self, coin, is_buy, sz, limit_px, order_type, reduce_only, cloid):
+        return self.exchange.order(
+            coin,
+            is_buy,
+            self.meta.size(coin, sz),
+            self.meta.price(coin, limit_px),
+            order_type,
+            reduce_only=reduce_only,
+            cloid=cloid,
+        )
+
+    def _update_leverage(self, leverage, coin, is_cross):
+        max_leverage = self.meta.max_leverage(coin)
+        if max_leverage:
+            leverage = min(leverage, max_leverage)
+        return self.exchange.update_leverage(leverage, coin, is_cross)
@@ -0,0 +1,176 @@
+import math
+import threading
+import time
+
+# =========================
+# Setting
+# =========================
+META_TTL = 600  # seconds before perp / spot meta is reloaded
+MISS_REFRESH = 60  # at most one reload per this many seconds for unknown coins
+SIG_FIGS = 5  # prices: at most 5 significant figures ...
+PERP_DECIMALS = 6  # ... and at most (6 perp / 8 spot) - szDecimals decimals
+SPOT_DECIMALS = 8
+SPOT_OFFSET = 10000  # spot asset ids start here
+EPS = 1e-9  # float noise allowance when flooring sizes
+
+
+# =========================
+# Rounding (pure, per asset precision)
+# =========================
+def _step(value, step, direction):
+    units = value / step
+    if direction == "down":
+        units = math.floor(units + EPS)
+    elif direction == "up":
+        units = math.ceil(units - EPS)
+    else:
+        units = round(units)
+    return units * step
+
+
+def price_tick(px, sz_decimals, spot=False):
+    """
+    Smallest valid price increment around px.
+
+    Hyperliquid accepts at most SIG_FIGS significant figures and
+    (PERP_DECIMALS / SPOT_DECIMALS) - szDecimals decimals; integer prices are
+    always valid, so the tick never exceeds 1.
+    """
+    decimals = (SPOT_DECIMALS if spot else PERP_DECIMALS) - sz_decimals
+    sig_tick = 10.0 ** (math.floor(math.log10(abs(px))) - SIG_FIGS + 1)
+    return min(max(sig_tick, 10.0**-decimals), 1.0)
+
+
+def round_price(px, sz_decimals, spot=False, direction=None):
+    # direction: None (nearest), "down" or "up"
+    if px <= 0:
+        return 0.0
+    decimals = (SPOT_DECIMALS if spot else PERP_DECIMALS) - sz_decimals
+    px = _step(px, price_tick(px, sz_decimals, spot), direction)
+    return round(px, max(decimals, 0))
+
+
+def round_size(sz, sz_decimals, direction="down"):
+    # sizes floor by default so an order never exceeds the intended notional
+    return round(_step(sz, 10.0**-sz_decimals, direction), sz_decimals)
+
+
+# =========================
+# Metadata cache
+# =========================
+class MetaCache:
+    """
+    Perp and spot metadata, loaded once and refreshed every `ttl` seconds.
+
+    Indexes every coin name the SDK accepts ("BTC", "@107", "HYPE/USDC") to
+    {"asset", "sz_decimals", "max_leverage", "spot"}, so sizing and price
+    normalisation are dict lookups. An unknown coin forces an early reload
+    (new listings) before raising, but at most once per `miss_refresh`
+    seconds, so a typo or delisted coin in a loop costs no extra weight.
+    """
+
+    def __init__(self, info, ttl=META_TTL, miss_refresh=MISS_REFRESH):
+        self.info = info
+        self.ttl = ttl
+        self.miss_refresh = miss_refresh
+        self.missed = None  # time.monotonic() of the last reload for a miss
+        self.lock = threading.Lock()
+        self.loading = threading.Lock()  # one reload at a time
+        self.assets = {}
+        self.loaded = None  # time.monotonic() of the last load
+
+    # -------------------------
+    # Loading
+    # -------------------------
+    def refresh(self):
+        meta, spot_meta = self.info.meta(), self.info.spot_meta()
+        assets = {}
+        for asset, a in enumerate(meta["universe"]):
+            assets[a["name"]] = {
+                "asset": asset,
+                "sz_decimals": a["szDecimals"],
+                "max_leverage": a.get("maxLeverage"),
+                "spot": False,
+            }
+        tokens = {t["index"]: t for t in spot_meta["tokens"]}
+        for pair in spot_meta["universe"]:
+            base, quote = (tokens[i] for i in pair["tokens"])
+            entry = {
+                "asset": pair["index"] + SPOT_OFFSET,
+                "sz_decimals": base["szDecimals"],
+                "max_leverage": None,
+                "spot": True,
+            }
+            assets[pair["name"]] = entry
+            assets.setdefault(f"{base['name']}/{quote['name']}", entry)
+        with self.lock:
+            self.assets = assets
+            self.loaded = time.monotonic()
+        return self
+
+    def stale(self):
+        return self.loaded is None or time.monotonic() - self.loaded > self.ttl
+
+    def ensure(self):
+        if self.stale():
+            with self.loading:
+                if self.stale():
+                    self.refresh()
+        return self
+
+    def get(self, coin):
+        self.ensure()
+        entry = self.assets.get(coin)
+        if entry is None:
+            with self.loading:
+                entry = self.assets.get(coin)
+                now = time.monotonic()
+                if entry is None and (
+                    self.missed is None or now - self.missed >= self.miss_refresh
+                ):
+                    self.missed = now
+                    entry = self.refresh().assets.get(coin)
+            if entry is None:
+                raise ValueError(f"unknown coin {coin!r}")
+        return entry
+
+    # -------------------------
+    # Lookups
+    # -------------------------
+    def asset(self, coin):
+        return self.get(coin)["asset"]
+
+    def sz_decimals(self, coin):
+        return self.get(coin)["sz_decimals"]
+
+    def max_leverage(self, coin):
+        return self.get(coin)["max_leverage"]
+
+    # -------------------------
+    # Normalisation
+    # -------------------------
+    def price(self, coin, px, direction=None):
+        entry = self.get(coin)
+        return round_price(px, entry["sz_decimals"], entry["spot"], direction)
+
+    def size(self, coin, sz, direction="down"):
+        return round_size(sz, self.get(coin)["sz_decimals"], direction)
+
+    def size_for(self, coin, notional, px):
+        # largest valid size whose value at px does not exceed notional
+        return self.size(coin, notional / px)
+
+    def normalize(self, order):
+        # SDK OrderRequest dict -> copy with exchange-valid sz / limit_px /
+        # triggerPx
+        coin = order["coin"]
+        order = {
+            **order,
+            "sz": self.size(coin, order["sz"]),
+            "limit_px": self.price(coin, order["limit_px"]),
+        }
+        trigger = order["order_type"].get("trigger")
+        if trigger is not None:
+            trigger = {**trigger, "triggerPx": self.price(coin, trigger["triggerPx"])}
+            order["order_type"] = {**order["order_type"], "trigger": trigger}
+        return order
@@ -0,0 +1,199 @@
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from live.ratelimit import request_cost
+
+# =========================
+# Setting
+# =========================
+WEIGHT_LIMIT = 1200  # server-side budget per window, like the real API
+WINDOW = 60
+MIDS = {"BTC": "95000.5", "ETH": "3500.1"}
+
+
+# =========================
+# Canned /info responses
+# =========================
+def info_response(server, payload):
+    kind = payload.get("type")
+    if kind == "meta":
+        return {
+            "universe": [
+                {"name": "BTC", "szDecimals": 5, "maxLeverage": 50},
+                {"name": "ETH", "szDecimals": 4, "maxLeverage": 50},
+            ]
+        }
+    if kind == "spotMeta":
+        return {
+            "universe": [
+                {"name": "PURR/USDC", "tokens": [1, 0], "index": 0},
+            ],
+            "tokens": [
+                {"name": "USDC", "szDecimals": 8, "weiDecimals": 8, "index": 0},
+                {"name": "PURR", "szDecimals": 0, "weiDecimals": 5, "index": 1},
+            ],
+        }
+    if kind == "allMids":
+        return dict(server.mids)
+    if kind == "clearinghouseState":
+        return {"withdrawable": str(server.balance), "assetPositions": []}
+    if kind == "openOrders":
+        return list(server.open_orders)
+    if kind == "candleSnapshot":
+        return list(server.candles)
+    return {}
+
+
+def order_status(order, i, grouping):
+    # Ioc fills at its limit, grouped TP / SL wait for it, the rest rests
+    oid = 1000 + i
+    if "trigger" in order["t"] and grouping in ("normalTpsl", "positionTpsl"):
+        return "waitingForFill" if grouping == "normalTpsl" else "waitingForTrigger"
+    if order["t"].get("limit", {}).get("tif") == "Ioc":
+        return {"filled": {"oid": oid, "totalSz": order["s"], "avgPx": order["p"]}}
+    return {"resting": {"oid": oid}}
+
+
+def exchange_response(server, action):
+    kind = action["type"]
+    if kind == "order":
+        statuses = [
+            order_status(o, i, action.get("grouping"))
+            for i, o in enumerate(action["orders"])
+        ]
+    elif kind == "batchModify":
+        statuses = [
+            {"resting": {"oid": 1000 + i}} for i in range(len(action["modifies"]))
+        ]
+    elif kind in ("cancel", "cancelByCloid"):
+        statuses = ["success"] * len(action["cancels"])
+    else:
+        return {"status": "ok", "response": {"type": "default"}}
+    for i in server._rejected(kind):
+        statuses[i] = {"error": f"Order {i} rejected by the mock."}
+    return {"status": "ok", "response": {"type": kind, "data": {"statuses": statuses}}}
+
+
+# =========================
+# Mock server
+# =========================
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        server = self.server.mock
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if server.latency:
+            time.sleep(server.latency)
+        if server._throttle(self.path, payload):
+            self._reply(429, None)
+        elif self.path == "/info":
+            self._reply(200, info_response(server, payload))
+        else:
+            self._reply(200, exchange_response(server, payload["action"]))
+
+    def _reply(self, code, body):
+        data = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class MockHttpServer:
+    """
+    Local stand-in for the Hyperliquid REST API (/info and /exchange).
+
+    Enforces its own weight budget per window and answers 429 once it is
+    spent, the way the exchange does; fail_next(n) forces the next n
+    requests to 429 regardless, and reject_next(kind, *positions) answers an
+    error for those orders of the next `kind` action ("order", "batchModify",
+    "cancelByCloid", ...) while the rest succeed. `log` keeps (path, type,
+    weight, status) of every request. Point Info / Exchange / Gateway at
+    base_url.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, limit=WEIGHT_LIMIT, window=WINDOW):
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.mock = self
+        self.host, self.port = self.httpd.server_address
+        self.limit = limit
+        self.window = window
+        self.latency = 0.0
+        self.mids = dict(MIDS)
+        self.balance = 1000.0
+        self.open_orders = []
+        self.candles = []  # every candleSnapshot answer
+        self.lock = threading.Lock()
+        self.spent = []  # (time, weight) inside the window
+        self.forced = 0
+        self.rejects = {}  # action type -> [positions to reject, per action]
+        self.log = []
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def fail_next(self, n=1):
+        with self.lock:
+            self.forced += n
+
+    def reject_next(self, kind, *positions):
+        with self.lock:
+            self.rejects.setdefault(kind, []).append(positions)
+
+    def _rejected(self, kind):
+        with self.lock:
+            queued = self.rejects.get(kind)
+            return queued.pop(0) if queued else ()
+
+    def _throttle(self, path, payload):
+        weight, _ = request_cost(path, payload)
+        kind = payload.get("type") or payload.get("action", {}).get("type")
+        now = time.monotonic()
+        with self.lock:
+            self.spent = [(t, w) for t, w in self.spent if now - t < self.window]
+            used = sum(w for _, w in self.spent)
+            if self.forced or used + weight > self.limit:
+                self.forced = max(self.forced - 1, 0)
+                self.log.append((path, kind, weight, 429))
+                return True
+            self.spent.append((now, weight))
+            self.log.append((path, kind, weight, 200))
+            return False
+
+
+# =========================
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8766
+    with MockHttpServer(port=port) as server:
+        print(f"🧪 Mock REST API on {server.base_url} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            print("\nMock server stopped.")
@@ -0,0 +1,255 @@
+import base64
+import hashlib
+import json
+import os
+import random
+import socket
+import struct
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from hyperliquid.websocket_manager import (
+    subscription_to_identifier,
+    ws_msg_to_identifier,
+)
+
+# =========================
+# Setting
+# =========================
+GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"  # RFC 6455 handshake constant
+WELCOME = "Websocket connection established."
+
+
+# =========================
+# Frames (RFC 6455, text / close / ping only)
+# =========================
+def encode_frame(payload, opcode=0x1):
+    n = len(payload)
+    if n < 126:
+        header = struct.pack("!BB", 0x80 | opcode, n)
+    elif n < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, n)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, n)
+    return header + payload
+
+
+def _recv_exact(sock, n):
+    buf = b""
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            raise ConnectionError("client closed the socket")
+        buf += chunk
+    return buf
+
+
+def read_frame(sock):
+    # -> (opcode, payload); client frames are always masked
+    b0, b1 = _recv_exact(sock, 2)
+    n = b1 & 0x7F
+    if n == 126:
+        (n,) = struct.unpack("!H", _recv_exact(sock, 2))
+    elif n == 127:
+        (n,) = struct.unpack("!Q", _recv_exact(sock, 8))
+    mask = _recv_exact(sock, 4) if b1 & 0x80 else b"\0\0\0\0"
+    data = _recv_exact(sock, n)
+    return b0 & 0x0F, bytes(b ^ mask[i % 4] for i, b in enumerate(data))
+
+
+# =========================
+# Mock server
+# =========================
+class MockWsServer:
+    """
+    Local stand-in for the Hyperliquid websocket, for running the live
+    scripts and MarketFeed without the exchange.
+
+    Clients subscribe / unsubscribe / ping with the real message format;
+    publish(channel, data) pushes a message to every client subscribed to
+    it. Point MarketFeed (or Info(skip_ws=False)) at base_url.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind((host, port))
+        self.host, self.port = self.sock.getsockname()
+        self.clients = {}  # socket -> set of subscription identifiers
+        self.lock = threading.Lock()
+        # frames from different threads must not interleave
+        self.send_lock = threading.Lock()
+        self.running = False
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        self.sock.listen()
+        self.running = True
+        threading.Thread(target=self._accept, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.running = False
+        with self.lock:
+            clients = list(self.clients)
+            self.clients.clear()
+        for client in clients:
+            try:
+                client.sendall(encode_frame(b"", 0x8))
+            except OSError:
+                pass
+            client.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def subscribers(self):
+        with self.lock:
+            return sum(len(subs) for subs in self.clients.values())
+
+    def publish(self, channel, data):
+        msg = {"channel": channel, "data": data}
+        identifier = ws_msg_to_identifier(msg)
+        frame = encode_frame(json.dumps(msg).encode())
+        with self.lock:
+            targets = [c for c, subs in self.clients.items() if identifier in subs]
+        for client in targets:
+            self._send(client, frame)
+
+    # -------------------------
+    # Connection handling
+    # -------------------------
+    def _accept(self):
+        while self.running:
+            try:
+                client, _ = self.sock.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(client,), daemon=True).start()
+
+    def _handshake(self, client):
+        request = b""
+        while b"\r\n\r\n" not in request:
+            chunk = client.recv(4096)
+            if not chunk:
+                raise ConnectionError("client closed during handshake")
+            request += chunk
+        headers = dict(
+            line.split(": ", 1)
+            for line in request.decode().split("\r\n")[1:]
+            if ": " in line
+        )
+        key = {k.lower(): v for k, v in headers.items()}["sec-websocket-key"]
+        accept = base64.b64encode(hashlib.sha1((key + GUID).encode()).digest())
+        client.sendall(
+            b"HTTP/1.1 101 Switching Protocols\r\n"
+            b"Upgrade: websocket\r\nConnection: Upgrade\r\n"
+            b"Sec-WebSocket-Accept: " + accept + b"\r\n\r\n"
+        )
+
+    def _send(self, client, frame):
+        try:
+            with self.send_lock:
+                client.sendall(frame)
+        except OSError:
+            self._drop(client)
+
+    def _drop(self, client):
+        with self.lock:
+            self.clients.pop(client, None)
+        client.close()
+
+    def _serve(self, client):
+        try:
+            self._handshake(client)
+            with self.lock:
+                self.clients[client] = set()
+            self._send(client, encode_frame(WELCOME.encode()))
+            while self.running:
+                opcode, payload = read_frame(client)
+                if opcode == 0x8:  # close
+                    self._send(client, encode_frame(b"", 0x8))
+                    break
+                if opcode == 0x9:  # ping
+                    self._send(client, encode_frame(payload, 0xA))
+                    continue
+                if opcode == 0x1:
+                    self._on_text(client, json.loads(payload))
+        except (ConnectionError, OSError, ValueError):
+            pass
+        finally:
+            self._drop(client)
+
+    def _on_text(self, client, msg):
+        method = msg.get("method")
+        if method == "ping":
+            self._send(client, encode_frame(b'{"channel": "pong"}'))
+            return
+        if method not in ("subscribe", "unsubscribe"):
+            return
+        identifier = subscription_to_identifier(msg["subscription"])
+        with self.lock:
+            subs = self.clients.get(client)
+            if subs is None:
+                return
+            if method == "subscribe":
+                subs.add(identifier)
+            else:
+                subs.discard(identifier)
+        response = {"channel": "subscriptionResponse", "data": msg}
+        self._send(client, encode_frame(json.dumps(response).encode()))
+
+
+# =========================
+# Random-walk market
+# =========================
+def random_walk(server, prices, interval=0.1, seed=None, stop=None):
+    """
+    Publish allMids, l2Book and trades for prices ({coin: start price})
+    every `interval` seconds until stop (a threading.Event) is set.
+    """
+    rng = random.Random(seed)
+    prices = dict(prices)
+    stop = stop or threading.Event()
+    while not stop.is_set():
+        now = int(time.time() * 1000)
+        for coin, px in prices.items():
+            px = round(px * (1 + rng.gauss(0, 0.0005)), 1)
+            prices[coin] = px
+            spread = max(round(px * 0.0001, 1), 0.1)
+            server.publish(
+                "l2Book",
+                {
+                    "coin": coin,
+                    "time": now,
+                    "levels": [
+                        [{"px": f"{px - spread / 2:.1f}", "sz": "1.0", "n": 1}],
+                        [{"px": f"{px + spread / 2:.1f}", "sz": "1.0", "n": 1}],
+                    ],
+                },
+            )
+            side = "B" if rng.random() < 0.5 else "A"
+            trade = {"coin": coin, "side": side, "px": f"{px:.1f}", "sz": "0.01"}
+            server.publish("trades", [{**trade, "time": now, "tid": now}])
+        server.publish("allMids", {"mids": {c: f"{p:.1f}" for c, p in prices.items()}})
+        stop.wait(interval)
+
+
+# =========================
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    with MockWsServer(port=port) as server:
+        print(f"🧪 Mock websocket on {server.base_url} (Ctrl+C to stop)")
+        try:
+            random_walk(server, {"BTC": 95000.0, "ETH": 3500.0})
+        except KeyboardInterrupt:
+            print("\nMock server stopped.")
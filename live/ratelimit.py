@@ -0,0 +1,383 @@
+import copy
+import heapq
+import itertools
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from multiprocessing.managers import BaseManager
+from hyperliquid.api import API
+from hyperliquid.exchange import Exchange
+from hyperliquid.info import Info
+from hyperliquid.utils.error import ClientError
+
+# =========================
+# Setting
+# =========================
+WEIGHT_LIMIT = 1200  # Hyperliquid REST budget per IP ...
+WINDOW = 60  # ... per rolling minute
+RESERVE = 120  # weight each lower priority class leaves for the ones above it
+MAX_RETRIES = 3
+BACKOFF = 1.0  # seconds, doubled per retry after a 429
+SLACK = 0.25  # seconds a token is held past the window (clock / transit skew)
+
+# priorities: lower runs first
+WRITE, READ, BACKFILL = 0, 1, 2
+
+# info request types and their weights (everything else is 20)
+LIGHT_INFO = {
+    "l2Book",
+    "allMids",
+    "clearinghouseState",
+    "orderStatus",
+    "spotClearinghouseState",
+    "exchangeStatus",
+}
+INFO_WEIGHTS = {"userRole": 60}
+# responses that cost one extra weight per this many returned items
+ITEM_WEIGHTS = {
+    "candleSnapshot": 60,
+    "userFills": 20,
+    "userFillsByTime": 20,
+    "historicalOrders": 20,
+    "fundingHistory": 20,
+}
+BACKFILL_INFO = set(ITEM_WEIGHTS)
+
+
+# =========================
+# Request cost
+# =========================
+def request_cost(url_path, payload):
+    """
+    (weight, priority) of one API.post call.
+
+    Exchange actions weigh 1 + one per 40 batched orders / cancels and run
+    first; history-style info reads (candles, fills) run last.
+    """
+    if url_path == "/exchange":
+        action = payload.get("action", {})
+        batch = action.get("orders") or action.get("cancels") or action.get("modifies")
+        return 1 + len(batch or ()) // 40, WRITE
+    kind = payload.get("type")
+    if kind in LIGHT_INFO:
+        return 2, READ
+    weight = INFO_WEIGHTS.get(kind, 20)
+    return weight, BACKFILL if kind in BACKFILL_INFO else READ
+
+
+def response_cost(payload, result):
+    # weight charged after the fact for item-priced info responses
+    per = ITEM_WEIGHTS.get(payload.get("type"))
+    if per is None or not isinstance(result, list):
+        return 0
+    return len(result) // per
+
+
+# =========================
+# Single-flight
+# =========================
+class SingleFlight:
+    """
+    Concurrent calls with the same key share one execution.
+
+    The first caller runs fn; callers arriving while it is in flight wait
+    for its result and get their own deep copy, so no caller can mutate
+    another's value. forget(match) detaches in-flight keys: later callers
+    start a fresh call instead of joining one that predates a change.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.inflight = {}  # key -> Future
+
+    def do(self, key, fn):
+        # -> (result, shared) where shared is True for a waiter
+        with self.lock:
+            shared = self.inflight.get(key)
+            if shared is None:
+                self.inflight[key] = future = Future()
+        if shared is not None:
+            return copy.deepcopy(shared.result()), True
+        try:
+            result = fn()
+        except BaseException as e:
+            self._settle(key, future)
+            future.set_exception(e)
+            raise
+        self._settle(key, future)
+        future.set_result(result)
+        return result, False
+
+    def _settle(self, key, future):
+        with self.lock:
+            if self.inflight.get(key) is future:
+                del self.inflight[key]
+
+    def forget(self, match=None):
+        # match(key) -> bool; None detaches every in-flight key
+        with self.lock:
+            for key in [k for k in self.inflight if match is None or match(k)]:
+                del self.inflight[key]
+
+
+# =========================
+# Rate limiter
+# =========================
+class RateLimiter:
+    """
+    Weight budget shared by every Info / Exchange client in the process.
+
+    A token bucket of `limit` weight where spent tokens come back `window`
+    seconds later, which is exactly the rolling budget the exchange counts,
+    so a full-speed caller never trips a 429. Callers queue by (priority,
+    arrival): order / cancel traffic jumps ahead of market-data reads, and
+    each lower class stops RESERVE weight earlier, so a backfill can never
+    starve an order. Identical info reads that are in flight at the same
+    time are coalesced into one request. A 429 pauses all traffic and the
+    call is retried with exponential backoff.
+
+    The budget is per process until share() moves it into a manager process.
+    Workers then call use(budget) with the returned proxy, and every process
+    draws from that one budget.
+    """
+
+    def __init__(
+        self,
+        limit=WEIGHT_LIMIT,
+        window=WINDOW,
+        reserve=RESERVE,
+        max_retries=MAX_RETRIES,
+        backoff=BACKOFF,
+        slack=SLACK,
+    ):
+        self.settings = dict(limit=limit, window=window, reserve=reserve, slack=slack)
+        self.limit = limit
+        self.window = window + slack  # how long spent weight stays counted
+        self.reserve = reserve
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.cond = threading.Condition()
+        self.spent = deque()  # (time, weight) inside the last window
+        self.used = 0
+        self.paused_until = 0.0
+        self.queue = []  # heap of (priority, seq)
+        self.seq = itertools.count()
+        self.flights = SingleFlight()  # identical in-flight info reads
+        self.budget = self  # or a proxy of the shared limiter (share / use)
+        self.manager = None
+        self.stats = {
+            "requests": 0,
+            "weight": 0,
+            "waited": 0,
+            "wait_seconds": 0.0,
+            "coalesced": 0,
+            "throttled": 0,
+        }
+
+    # -------------------------
+    # Bucket
+    # -------------------------
+    def _expire(self, now):
+        while self.spent and now - self.spent[0][0] >= self.window:
+            self.used -= self.spent.popleft()[1]
+
+    def _delay(self, weight, floor, now):
+        # seconds until `weight` fits while leaving `floor` unspent (0 = now)
+        if now < self.paused_until:
+            return self.paused_until - now
+        excess = self.used + weight + floor - self.limit
+        if excess <= 0:
+            return 0.0
+        freed = 0
+        for t, w in self.spent:
+            freed += w
+            if freed >= excess:
+                return t + self.window - now
+        return self.window
+
+    def _spend(self, weight, now):
+        self.spent.append((now, weight))
+        self.used += weight
+        self.stats["weight"] += weight
+
+    def _count(self, name, value=1):
+        with self.cond:
+            self.stats[name] += value
+
+    def acquire(self, weight, priority=READ):
+        floor = self.reserve * priority
+        weight = min(weight, self.limit - floor)
+        ticket = (priority, next(self.seq))
+        start = time.monotonic()
+        with self.cond:
+            heapq.heappush(self.queue, ticket)
+            while True:
+                now = time.monotonic()
+                self._expire(now)
+                if self.queue[0] == ticket:
+                    delay = self._delay(weight, floor, now)
+                    if delay <= 0:
+                        heapq.heappop(self.queue)
+                        self._spend(weight, now)
+                        self.stats["requests"] += 1
+                        self.cond.notify_all()
+                        break
+                    self.cond.wait(delay)
+                else:
+                    self.cond.wait()
+        waited = time.monotonic() - start
+        if waited > 0.001:
+            self._count("waited")
+            self._count("wait_seconds", waited)
+
+    def charge(self, weight):
+        # weight learned after the response (item-priced reads)
+        if weight > 0:
+            with self.cond:
+                self._spend(weight, time.monotonic())
+
+    def pause(self, seconds):
+        # after a 429: hold every caller for `seconds`
+        with self.cond:
+            self.stats["throttled"] += 1
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.cond.notify_all()
+
+    # -------------------------
+    # Calls
+    # -------------------------
+    def call(self, fn, weight, priority=READ, key=None):
+        """
+        Run fn() once the budget allows it.
+
+        Calls sharing a non-None key while one is in flight wait for that
+        call's result instead of sending their own.
+        """
+        if key is None:
+            return self._send(fn, weight, priority)
+        result, shared = self.flights.do(key, lambda: self._send(fn, weight, priority))
+        if shared:
+            self._count("coalesced")
+        return result
+
+    def _send(self, fn, weight, priority):
+        for attempt in range(self.max_retries + 1):
+            self.budget.acquire(weight, priority)
+            try:
+                return fn()
+            except ClientError as e:
+                if e.status_code != 429 or attempt == self.max_retries:
+                    raise
+                # the pause holds every caller, this one retries after it
+                self.budget.pause(self.backoff * 2**attempt)
+
+    def install(self, api):
+        """
+        Route every post() of an Info / Exchange (any SDK API object)
+        through this limiter. Returns the same object.
+        """
+        if getattr(api, "limiter", None) is self:
+            return api
+        post = api.post
+
+        def limited_post(url_path, payload=None):
+            payload = payload or {}
+            weight, priority = request_cost(url_path, payload)
+            key = None
+            if url_path == "/info":
+                key = (api.base_url, json.dumps(payload, sort_keys=True))
+
+            def send():
+                # only the caller that sends pays for the items, not its waiters
+                result = post(url_path, payload)
+                self.budget.charge(response_cost(payload, result))
+                return result
+
+            return self.call(send, weight, priority, key)
+
+        api.post = limited_post
+        api.limiter = self
+        return api
+
+    # -------------------------
+    # Cross-process budget
+    # -------------------------
+    def share(self):
+        """
+        Serve the budget from a manager process and draw from it here.
+
+        Returns the budget proxy; pass it to worker processes (e.g. as a pool
+        initializer argument) and call use(budget) there.
+        """
+        if self.manager is None:
+            self.manager = _BudgetManager()
+            self.manager.start()
+            self.budget = self.manager.RateLimiter(**self.settings)
+        return self.budget
+
+    def use(self, budget):
+        # draw from a budget shared by another process (see share)
+        self.budget = budget
+
+    # -------------------------
+    # Limited clients
+    # -------------------------
+    def _meta(self, base_url):
+        # the SDK constructors load meta / spotMeta; fetch them through the
+        # budget and hand them in instead
+        api = self.install(API(base_url))
+        return api.post("/info", {"type": "meta"}), api.post(
+            "/info", {"type": "spotMeta"}
+        )
+
+    def info(self, base_url, **kwargs):
+        meta, spot_meta = self._meta(base_url)
+        kwargs.setdefault("skip_ws", True)
+        return self.install(Info(base_url, meta=meta, spot_meta=spot_meta, **kwargs))
+
+    def exchange(self, wallet, base_url, **kwargs):
+        meta, spot_meta = self._meta(base_url)
+        exchange = Exchange(wallet, base_url, meta=meta, spot_meta=spot_meta, **kwargs)
+        self.install(exchange.info)
+        return self.install(exchange)
+
+    # -------------------------
+    # Metrics
+    # -------------------------
+    def metrics(self):
+        if self.budget is not self:
+            # the shared budget's view, with what this process coalesced
+            return {**self.budget.metrics(), "coalesced": self.stats["coalesced"]}
+        with self.cond:
+            self._expire(time.monotonic())
+            return {
+                "limit": self.limit,
+                "available": self.limit - self.used,
+                "used_window": self.used,
+                "usage": self.used / self.limit,
+                "queued": len(self.queue),
+                **self.stats,
+            }
+
+
+class _BudgetManager(BaseManager):
+    pass
+
+
+_BudgetManager.register(
+    "RateLimiter", RateLimiter, exposed=("acquire", "charge", "pause", "metrics")
+)
+
+# one process-wide limiter: every client in the process shares the IP budget
+limiter = RateLimiter()
+install = limiter.install
+limited_info = limiter.info
+limited_exchange = limiter.exchange
+share_budget = limiter.share
+
+
+def use_budget(budget):
+    # pool initializer: worker processes draw from the parent's shared budget
+    limiter.use(budget)
@@ -0,0 +1,356 @@
+import asyncio
+import json
+import os
+import sys
+import traceback
+from importlib import import_module
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# =========================
+# Setting
+# =========================
+MAX_ERRORS = 5  # handler errors before a strategy is switched off
+MAX_PENDING = 1000  # unclaimed fills / order links kept for a late own()
+
+
+def _bounded_put(table, key, value):
+    # insertion-ordered dict capped at MAX_PENDING, oldest entries dropped
+    table.pop(key, None)
+    table[key] = value
+    while len(table) > MAX_PENDING:
+        del table[next(iter(table))]
+
+
+# =========================
+# Strategy base
+# =========================
+class Strategy:
+    """
+    Base class for strategies hosted by Runner.
+
+    Override any of the hooks; all run on the runner's event loop:
+      setup()                 once before the first tick (await reads here)
+      on_price(coin, price)   latest price of one of `coins`
+      on_fill(coin, fill)     a fill of an order this strategy claimed with own()
+      on_candle(coin, interval, candle)
+                              a closed candle of one of `candles`
+      run()                   optional background loop (timers, refreshes)
+      teardown()              once after the strategy stops
+    Ticks that arrive while a handler is still awaiting are coalesced to the
+    latest price per coin; closed candles and fills are delivered one by one
+    (candles, then fills, then prices). Call stop() when the strategy is
+    done. Keep per-strategy state on self.
+
+    Strategies that send orders set places_orders = True and pass the
+    status rows of every order they place to own(): a fill only reaches the
+    strategy whose order it filled, never a neighbour's or a manual trade.
+    """
+
+    places_orders = False
+
+    def __init__(self, name, coins=(), candles=()):
+        self.name = name
+        self.coins = tuple(coins)
+        self.candles = tuple(candles)  # (coin, interval) streams to close
+        self.gateway = None  # set by Runner.add
+        self.feed = None
+        self.running = False
+        self.errors = 0
+        self.ticks = 0
+        self.prices = {}  # coin -> latest undelivered price
+        self.fills = []  # undelivered (coin, fill)
+        self.closed = []  # undelivered (coin, interval, candle)
+        self.wake = None
+        self.runner = None
+
+    def own(self, rows):
+        """
+        Claim orders this strategy placed so their fills reach on_fill.
+
+        rows are BulkOrders status rows (any dicts with "oid" / "cloid").
+        Grouped TP / SL children have no oid yet; their cloid is matched to
+        the oid once the exchange reports the order.
+        """
+        if self.runner is not None:
+            self.runner.claim(self, rows)
+
+    async def setup(self):
+        pass
+
+    async def on_price(self, coin, price):
+        pass
+
+    async def on_fill(self, coin, fill):
+        pass
+
+    async def on_candle(self, coin, interval, candle):
+        pass
+
+    async def run(self):
+        pass
+
+    async def teardown(self):
+        pass
+
+    def stop(self):
+        self.running = False
+        if self.wake is not None:
+            self.wake.set()
+
+    def log(self, msg, **kwargs):
+        print(f"[{self.name}] {msg}", **kwargs)
+
+
+# =========================
+# Config
+# =========================
+def load_target(target):
+    # "package.module:Attr" -> Attr
+    module_name, attr = target.split(":")
+    return getattr(import_module(module_name), attr)
+
+
+def load_strategies(path):
+    """
+    JSON list of {"name", "target": "module:Class", "params": {...}} ->
+    strategy instances, each built as Class(name, **params).
+    """
+    with open(path) as f:
+        config = json.load(f)
+    return [
+        load_target(entry["target"])(entry["name"], **entry.get("params", {}))
+        for entry in config
+    ]
+
+
+# =========================
+# Runner
+# =========================
+class Runner:
+    """
+    Many strategies on one event loop, one MarketFeed and one Gateway.
+
+    The feed watches each coin's book once however many strategies trade
+    it, and every order, read and rate-limit token goes through the shared
+    gateway, so sockets, sessions and API weight stay flat as strategies
+    are added. Each strategy runs in its own task with its own mailbox: a
+    slow or failing strategy only delays or stops itself. A handler that
+    raises is logged; after `max_errors` the strategy is switched off.
+
+    Fills are routed by order id to the strategy that owns the order. Two
+    order-placing strategies on the same coin are rejected: one account has
+    one netted position per coin, so neither could tell its exposure apart.
+    """
+
+    def __init__(self, feed, gateway=None, max_errors=MAX_ERRORS):
+        self.feed = feed
+        self.gateway = gateway
+        self.max_errors = max_errors
+        self.strategies = []
+        self.by_coin = {}  # coin -> [strategies]
+        self.by_candle = {}  # (coin, interval) -> [strategies]
+        self.forming = {}  # (coin, interval) -> latest candle (websocket thread)
+        self.traders = {}  # coin -> the order-placing strategy on it
+        self.owners = {}  # oid (int) / cloid (str) -> strategy
+        self.links = {}  # cloid -> oid, seen before the cloid was claimed
+        self.unclaimed = {}  # oid -> fills seen before the oid was claimed
+        self.loop = None
+
+    def add(self, strategy):
+        if strategy.places_orders:
+            for coin in strategy.coins:
+                other = self.traders.get(coin)
+                if other is not None:
+                    raise ValueError(
+                        f"{strategy.name!r} and {other.name!r} both trade {coin}; "
+                        "one account nets them into a single position"
+                    )
+            self.traders.update(dict.fromkeys(strategy.coins, strategy))
+        strategy.gateway = self.gateway
+        strategy.feed = self.feed
+        strategy.runner = self
+        self.strategies.append(strategy)
+        for coin in strategy.coins:
+            self.by_coin.setdefault(coin, []).append(strategy)
+        for key in strategy.candles:
+            self.by_candle.setdefault(tuple(key), []).append(strategy)
+        return strategy
+
+    def status(self):
+        return {
+            s.name: {"running": s.running, "errors": s.errors, "ticks": s.ticks}
+            for s in self.strategies
+        }
+
+    # -------------------------
+    # Feed -> mailboxes
+    # -------------------------
+    def _on_price(self, coin, price):
+        # websocket thread: drop coins nobody trades before hopping threads
+        if coin in self.by_coin:
+            self.loop.call_soon_threadsafe(self._deliver, coin, price)
+
+    def _on_fill(self, coin, fill):
+        self.loop.call_soon_threadsafe(self._route_fill, fill)
+
+    def _on_order(self, coin, update):
+        # orderUpdates carry the cloid -> oid link for grouped TP / SL children
+        order = update["order"]
+        if order.get("cloid"):
+            self.loop.call_soon_threadsafe(self._link, order["cloid"], order["oid"])
+
+    def _on_candle(self, coin, candle):
+        # a candle stream moving to a new open time closes the previous candle
+        key = (coin, candle["i"])
+        if key not in self.by_candle:
+            return
+        last = self.forming.get(key)
+        self.forming[key] = candle
+        if last is not None and candle["t"] > last["t"]:
+            self.loop.call_soon_threadsafe(self._deliver_candle, key, last)
+
+    def _deliver_candle(self, key, candle):
+        for s in self.by_candle[key]:
+            if s.running:
+                s.closed.append((*key, candle))
+                s.wake.set()
+
+    def _deliver(self, coin, price):
+        for s in self.by_coin[coin]:
+            if s.running:
+                s.prices[coin] = price
+                s.wake.set()
+
+    # -------------------------
+    # Order ownership (event loop)
+    # -------------------------
+    def claim(self, s, rows):
+        for row in rows:
+            if row.get("cloid"):
+                cloid = str(row["cloid"]).lower()
+                self.owners[cloid] = s
+                if cloid in self.links:
+                    self._own_oid(s, self.links.pop(cloid))
+            if row.get("oid") is not None:
+                self._own_oid(s, row["oid"])
+
+    def _own_oid(self, s, oid):
+        self.owners[oid] = s
+        for fill in self.unclaimed.pop(oid, ()):
+            self._deliver_fill(s, fill)
+
+    def _link(self, cloid, oid):
+        cloid = cloid.lower()
+        owner = self.owners.get(cloid)
+        if owner is not None:
+            self._own_oid(owner, oid)
+        else:
+            _bounded_put(self.links, cloid, oid)
+
+    def _route_fill(self, fill):
+        owner = self.owners.get(fill["oid"])
+        if owner is None and fill.get("cloid"):
+            owner = self.owners.get(fill["cloid"].lower())
+        if owner is not None:
+            self._deliver_fill(owner, fill)
+        else:
+            # our own order whose response is still in flight, or a manual trade
+            _bounded_put(
+                self.unclaimed,
+                fill["oid"],
+                self.unclaimed.get(fill["oid"], []) + [fill],
+            )
+
+    def _deliver_fill(self, s, fill):
+        if s.running:
+            s.fills.append((fill["coin"], fill))
+            s.wake.set()
+
+    # -------------------------
+    # Hosting
+    # -------------------------
+    async def _call(self, s, hook, *args):
+        try:
+            await hook(*args)
+            return True
+        except Exception as e:
+            s.errors += 1
+            s.log(f"❌ {hook.__name__} failed ({s.errors}/{self.max_errors}): {e}")
+            traceback.print_exc()
+            if s.errors >= self.max_errors:
+                s.log("⛔ too many errors, strategy stopped")
+                s.stop()
+            return False
+
+    async def _host(self, s):
+        s.wake = asyncio.Event()
+        s.running = True
+        if not await self._call(s, s.setup):
+            s.stop()
+        background = asyncio.create_task(self._call(s, s.run))
+        try:
+            while s.running:
+                await s.wake.wait()
+                s.wake.clear()
+                closed, s.closed = s.closed, []
+                for coin, interval, candle in closed:
+                    await self._call(s, s.on_candle, coin, interval, candle)
+                fills, s.fills = s.fills, []
+                prices, s.prices = s.prices, {}
+                for coin, fill in fills:
+                    await self._call(s, s.on_fill, coin, fill)
+                for coin, price in prices.items():
+                    if not s.running:
+                        break
+                    s.ticks += 1
+                    await self._call(s, s.on_price, coin, price)
+        finally:
+            s.running = False
+            background.cancel()
+            await self._call(s, s.teardown)
+
+    async def run(self):
+        # until every strategy has stopped
+        self.loop = asyncio.get_running_loop()
+        self.feed.on("price", self._on_price)
+        self.feed.on("userFills", self._on_fill)
+        self.feed.on("orderUpdates", self._on_order)
+        self.feed.on("candle", self._on_candle)
+        if self.gateway is not None:
+            self.gateway.watch(self.feed)
+        for coin in self.by_coin:
+            self.feed.watch_book(coin)
+        for coin, interval in self.by_candle:
+            self.feed.watch_candles(coin, interval)
+        self.feed.start()
+        try:
+            await asyncio.gather(*(self._host(s) for s in self.strategies))
+        finally:
+            self.feed.stop()
+
+
+# =========================
+if __name__ == "__main__":
+    import eth_account
+    from dotenv import load_dotenv
+    from live.feed import MarketFeed
+    from live.gateway import BASE_URL, Gateway
+
+    load_dotenv()
+    config = sys.argv[1] if len(sys.argv) > 1 else "strategy/strategies.json"
+    account = eth_account.Account.from_key(os.getenv("HYPER_TESTNET_PRIVATE_KEY"))
+    gateway = Gateway(account, os.getenv("HYPER_TESTNET_ACCOUNT_ADDRESS"), BASE_URL)
+    runner = Runner(MarketFeed(BASE_URL), gateway)
+    for strategy in load_strategies(config):
+        runner.add(strategy)
+    print(
+        f"🚀 Hosting {len(runner.strategies)} strategies on {len(runner.by_coin)} coins"
+    )
+    try:
+        asyncio.run(runner.run())
+    except KeyboardInterrupt:
+        print("\nRunner stopped.")
+    finally:
+        gateway.close()
+        print(json.dumps(runner.status(), indent=2))
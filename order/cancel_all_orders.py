@@ -1,45 +1,50 @@
 import os
+import sys
 import eth_account
 from dotenv import load_dotenv
-from hyperliquid.info import Info
-from hyperliquid.exchange import Exchange
 from hyperliquid.utils import constants
 
-COIN_NAME="BTC"
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from live.bulk import BulkOrders, summarize
+from live.ratelimit import limited_exchange
+
+COINS = None  # None = every coin, or e.g. ["BTC", "ETH"]
 
 load_dotenv()
 MY_ADDRESS = os.getenv("HYPER_TESTNET_ACCOUNT_ADDRESS")
 API_KEY = os.getenv("HYPER_TESTNET_PRIVATE_KEY")
 base_url = constants.TESTNET_API_URL
 
-info = Info(base_url, skip_ws=True)
 account = eth_account.Account.from_key(API_KEY)
-exchange = Exchange(account, base_url, account_address=MY_ADDRESS)
+exchange = limited_exchange(account, base_url, account_address=MY_ADDRESS)
+bulk = BulkOrders(exchange, MY_ADDRESS)
+
 
 def cancel_all_orders():
     print("--- Fetching Open Orders to Cancel ---")
     try:
-        open_orders = info.open_orders(address=MY_ADDRESS)
-        
-        coin_orders = [o for o in open_orders if o['coin'] == COIN_NAME]
-        
-        if not coin_orders:
-            print("No open BTC orders found to cancel.")
+        open_orders = bulk.open_orders(COINS)
+
+        if not open_orders:
+            print("No open orders found to cancel.")
             return
 
-        for order in coin_orders:
-            oid = order['oid'] # Order ID
-            print(f"Canceling Order ID: {oid}...")
-            
-            cancel_result = exchange.cancel(COIN_NAME, oid)
-            
-            if cancel_result["status"] == "ok":
-                print(f"✅ Successfully canceled order {oid}")
+        print(f"Canceling {len(open_orders)} orders in batches...")
+        rows = bulk.cancel(open_orders)
+        for row in rows:
+            if row["ok"]:
+                print(f"✅ Successfully canceled {row['coin']} order {row['oid']}")
             else:
-                print(f"❌ Failed to cancel order {oid}: {cancel_result}")
+                print(
+                    f"❌ Failed to cancel {row['coin']} order {row['oid']}: {row['error']}"
+                )
+
+        result = summarize(rows)
+        print(f"Canceled {result['ok']}/{result['total']} ({result['failed']} failed)")
 
     except Exception as e:
         print(f"Error during cancellation: {e}")
 
+
 if __name__ == "__main__":
-    cancel_all_orders()
\ No newline at end of file
+    cancel_all_orders()
@@ -1,10 +1,12 @@
+import asyncio
 import os
+import sys
 import eth_account
 from dotenv import load_dotenv
-from hyperliquid.info import Info
-from hyperliquid.exchange import Exchange
 from hyperliquid.utils import constants
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from live.gateway import Gateway
 
 load_dotenv()
 MY_ADDRESS = os.getenv("HYPER_TESTNET_ACCOUNT_ADDRESS")
@@ -19,28 +21,25 @@ ISOLATED = False
 LONG = True
 SHORT = False
 
-info = Info(base_url=BASE_URL, skip_ws=True)
-
 account = eth_account.Account.from_key(API_KEY)
-exchange = Exchange(account, base_url=BASE_URL, account_address=MY_ADDRESS)
+gateway = Gateway(account, MY_ADDRESS, BASE_URL)
 
 
-def place_perp_order():
+async def place_perp_order():
     try:
         print("Setting leverage to 10x...")
-        exchange.update_leverage(leverage=LEVERAGE, name=COIN_NAME, is_cross=ISOLATED)
-
-        all_mids = info.all_mids()
-        coin_price = float(all_mids.get(COIN_NAME))
+        # the leverage update and the mid read go out together
+        state = await gateway.pre_trade(COIN_NAME, LEVERAGE, is_cross=ISOLATED)
+        coin_price = state["mid"]
 
-        limit_price = int(coin_price * 0.9)
+        limit_price = gateway.meta.price(COIN_NAME, coin_price * 0.9)
         quantity = 0.01
 
         print(f"Current BTC: ${coin_price}")
         print(f"Targeting Buy at: ${limit_price}")
 
-        order_result = exchange.order(
-            name=COIN_NAME,
+        order_result = await gateway.order(
+            COIN_NAME,
             is_buy=LONG,
             sz=quantity,
             limit_px=limit_price,
@@ -58,7 +57,9 @@ def place_perp_order():
 
     except Exception as e:
         print(f"Error: {e}")
+    finally:
+        gateway.close()
 
 
 if __name__ == "__main__":
-    place_perp_order()
+    asyncio.run(place_perp_order())
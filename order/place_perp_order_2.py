@@ -1,10 +1,13 @@
+import asyncio
 import os
+import sys
 import eth_account
 from dotenv import load_dotenv
-from hyperliquid.info import Info
-from hyperliquid.exchange import Exchange
 from hyperliquid.utils import constants
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from live.gateway import Gateway
+
 load_dotenv()
 MY_ADDRESS = os.getenv("HYPER_TESTNET_ACCOUNT_ADDRESS")
 API_KEY = os.getenv("HYPER_TESTNET_PRIVATE_KEY")
@@ -19,31 +22,24 @@ SHORT = False
 CROSS = True
 ISOLATED = False
 
-info = Info(base_url=BASE_URL, skip_ws=True)
 account = eth_account.Account.from_key(API_KEY)
-exchange = Exchange(account, base_url=BASE_URL, account_address=MY_ADDRESS)
-
-
-def get_withdrawable_balance():
-    user_state = info.user_state(MY_ADDRESS)
-    balance = float(user_state["withdrawable"])
-    return balance
+gateway = Gateway(account, MY_ADDRESS, BASE_URL)
 
 
-def place_perp_order():
+async def place_perp_order():
     try:
-        exchange.update_leverage(leverage=LEVERAGE, name=COIN_NAME, is_cross=ISOLATED)
+        # leverage update, balance and mid are independent: one concurrent round
+        state = await gateway.pre_trade(COIN_NAME, LEVERAGE, is_cross=ISOLATED)
 
-        balance = get_withdrawable_balance()
+        balance = state["balance"]
         print(f"Current Balance: {balance:.2f} USDC")
 
-        all_mids = info.all_mids()
-        coin_price = float(all_mids.get(COIN_NAME))
+        coin_price = state["mid"]
 
         order_value = balance * PERCENT_TO_USE * LEVERAGE
-        quantity = round(order_value / coin_price, 4)
+        quantity = gateway.meta.size_for(COIN_NAME, order_value, coin_price)
 
-        limit_price = int(coin_price * 0.99)
+        limit_price = gateway.meta.price(COIN_NAME, coin_price * 0.99)
 
         if quantity <= 0:
             print("❌ Calculated quantity is too small.")
@@ -52,8 +48,8 @@ def place_perp_order():
         print(f"Targeting: {PERCENT_TO_USE*100}% of balance with {LEVERAGE}x leverage")
         print(f"Order Details: Buying {quantity} {COIN_NAME} at ${limit_price}")
 
-        order_result = exchange.order(
-            name=COIN_NAME,
+        order_result = await gateway.order(
+            COIN_NAME,
             is_buy=LONG,
             sz=quantity,
             limit_px=limit_price,
@@ -67,7 +63,9 @@ def place_perp_order():
 
     except Exception as e:
         print(f"Error: {e}")
+    finally:
+        gateway.close()
 
 
 if __name__ == "__main__":
-    place_perp_order()
+    asyncio.run(place_perp_order())
@@ -1,10 +1,13 @@
+import asyncio
 import os
+import sys
 import eth_account
 from dotenv import load_dotenv
-from hyperliquid.info import Info
-from hyperliquid.exchange import Exchange
 from hyperliquid.utils import constants
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from live.gateway import Gateway
+
 load_dotenv()
 MY_ADDRESS = os.getenv("HYPER_TESTNET_ACCOUNT_ADDRESS")
 API_KEY = os.getenv("HYPER_TESTNET_PRIVATE_KEY")
@@ -15,33 +18,27 @@ SPOT_COIN = "HYPE/USDC"  # spot /USDC
 PERCENT_TO_USE = 0.1  # 10%
 BUY = True
 
-info = Info(base_url=BASE_URL, skip_ws=True)
 account = eth_account.Account.from_key(API_KEY)
-exchange = Exchange(account, base_url=BASE_URL, account_address=MY_ADDRESS)
-
-
-def get_spot_balance():
-    user_state = info.user_state(MY_ADDRESS)
-    return float(user_state["withdrawable"])
+gateway = Gateway(account, MY_ADDRESS, BASE_URL)
 
 
-def place_spot_order():
+async def place_spot_order():
     try:
-        balance = get_spot_balance()
-        all_mids = info.all_mids()
-        coin_price = float(all_mids.get(SPOT_COIN))
+        # balance and mid in one concurrent round
+        state = await gateway.pre_trade(SPOT_COIN)
+        balance, coin_price = state["balance"], state["mid"]
 
         order_value = balance * PERCENT_TO_USE
-        quantity = round(order_value / coin_price, 2)
+        quantity = gateway.meta.size_for(SPOT_COIN, order_value, coin_price)
 
-        limit_price = round(coin_price * 0.99, 4)
+        limit_price = gateway.meta.price(SPOT_COIN, coin_price * 0.99)
 
         print(f"--- Spot Order: {SPOT_COIN} ---")
         print(f"Balance: {balance:.2f} USDC | Order Value: {order_value:.2f} USDC")
         print(f"Price: {limit_price} | Quantity: {quantity}")
 
-        order_result = exchange.order(
-            name=SPOT_COIN,
+        order_result = await gateway.order(
+            SPOT_COIN,
             is_buy=BUY,
             sz=quantity,
             limit_px=limit_price,
@@ -55,7 +52,9 @@ def place_spot_order():
 
     except Exception as e:
         print(f"Error: {e}")
+    finally:
+        gateway.close()
 
 
 if __name__ == "__main__":
-    place_spot_order()
+    asyncio.run(place_spot_order())
@@ -1,30 +1,37 @@
+import asyncio
 import os
+import sys
 import time
 import eth_account
 from dotenv import load_dotenv
-from hyperliquid.info import Info
-from hyperliquid.exchange import Exchange
 from hyperliquid.utils import constants
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from live.bracket import Brackets
+from live.bulk import BulkOrders
+from live.feed import MarketFeed
+from live.gateway import Gateway
+from live.runner import Runner, Strategy
+
 load_dotenv()
 MY_ADDRESS = os.getenv("HYPER_TESTNET_ACCOUNT_ADDRESS")
 API_KEY = os.getenv("HYPER_TESTNET_PRIVATE_KEY")
 BASE_URL = constants.TESTNET_API_URL
 
-info = Info(BASE_URL, skip_ws=True)
-account = eth_account.Account.from_key(API_KEY)
-exchange = Exchange(account, BASE_URL, account_address=MY_ADDRESS)
-
 # --- 전략 설정 ---
 COIN_NAME = "BTC"
 TIMEFRAME = "1d"
 PERCENT_TO_USE = 0.1
 LEVERAGE = 10
+TAKE_PROFIT = 0.02  # exits as a fraction of the entry price, None = no leg
+STOP_LOSS = 0.01
+RETRY_DELAY = 10  # seconds before re-arming after a failed entry
+BALANCE_REFRESH = 30  # seconds between background balance reads
 
 
-def get_breakout_target():
+def get_breakout_target(info, coin=COIN_NAME, timeframe=TIMEFRAME):
 
-    candles = info.candles_snapshot(COIN_NAME, TIMEFRAME, 0, int(time.time() * 1000))
+    candles = info.candles_snapshot(coin, timeframe, 0, int(time.time() * 1000))
 
     if len(candles) < 2:
         return None
@@ -32,63 +39,118 @@ def get_breakout_target():
     yesterday = candles[-2]
     yesterday_high = float(yesterday["h"])
 
-    print(f"Yesterday's High: ${yesterday_high}")
+    print(f"{coin} Yesterday's High: ${yesterday_high}")
     return yesterday_high
 
 
-def run_strategy():
-    try:
-        target_price = get_breakout_target()
-        if not target_price:
+class DailyBreakout(Strategy):
+    """
+    Buy once when the price breaks above the previous daily high.
+
+    The entry goes out as a bracket (live.bracket): the Ioc buy plus its
+    take-profit / stop-loss triggers in one action, so the exits rest on the
+    exchange and fire without this process.
+
+    Runs standalone (python strategy/daily_breakout.py) or as one of many
+    instances in live/runner.py, e.g. one per coin.
+    """
+
+    places_orders = True
+
+    def __init__(
+        self,
+        name,
+        coin=COIN_NAME,
+        timeframe=TIMEFRAME,
+        percent=PERCENT_TO_USE,
+        leverage=LEVERAGE,
+        retry_delay=RETRY_DELAY,
+        take_profit=TAKE_PROFIT,
+        stop_loss=STOP_LOSS,
+    ):
+        super().__init__(name, coins=(coin,))
+        self.coin = coin
+        self.timeframe = timeframe
+        self.percent = percent
+        self.leverage = leverage
+        self.retry_delay = retry_delay
+        self.take_profit = take_profit
+        self.stop_loss = stop_loss
+        self.brackets = None
+        self.target_price = None
+        self.balance = None
+        self.retry_at = 0.0
+
+    async def setup(self):
+        gateway = self.gateway
+        self.brackets = Brackets(
+            BulkOrders(gateway.exchange, gateway.address, meta=gateway.meta)
+        )
+        self.target_price = await gateway.read(
+            get_breakout_target, gateway.info, self.coin, self.timeframe
+        )
+        if not self.target_price:
+            self.stop()
             return
 
-        exchange.update_leverage(LEVERAGE, COIN_NAME, is_cross=False)
-
-        print(f"🚀 Strategy Started. Target: Above ${target_price}")
+        # leverage update, balance and mid go out together
+        state = await gateway.pre_trade(self.coin, self.leverage, is_cross=False)
+        self.balance = state["balance"]
+        self.log(f"🚀 Strategy Started. Target: Above ${self.target_price}")
 
+    async def run(self):
+        # keep the sizing input warm so the entry itself is a single order call
         while True:
-            all_mids = info.all_mids()
-            current_price = float(all_mids.get(COIN_NAME))
-
-            print(
-                f"Current {COIN_NAME}: ${current_price} | Target: ${target_price}",
-                end="\r",
-            )
-
-            if current_price > target_price:
-                print(
-                    f"\n✨ Breakout Detected! Price ${current_price} > Target ${target_price}"
-                )
+            await asyncio.sleep(BALANCE_REFRESH)
+            self.balance = await self.gateway.balance()
+
+    async def on_price(self, coin, current_price):
+        # each l2Book tick updates the mid; the first one above target fires the entry
+        self.log(
+            f"Current {coin}: ${current_price} | Target: ${self.target_price}",
+            end="\r",
+        )
+        if current_price <= self.target_price or time.monotonic() < self.retry_at:
+            return
 
-                user_state = info.user_state(MY_ADDRESS)
-                balance = float(user_state["withdrawable"])
+        self.log(
+            f"\n✨ Breakout Detected! Price ${current_price} > Target ${self.target_price}"
+        )
 
-                order_value = balance * PERCENT_TO_USE * LEVERAGE
-                quantity = round(order_value / current_price, 4)
+        meta = self.gateway.meta
+        order_value = self.balance * self.percent * self.leverage
+        quantity = meta.size_for(coin, order_value, current_price)
 
-                limit_px = int(current_price * 1.001)
+        tp = current_price * (1 + self.take_profit) if self.take_profit else None
+        sl = current_price * (1 - self.stop_loss) if self.stop_loss else None
 
-                print(f"Placing Order: {quantity} {COIN_NAME}...")
+        self.log(f"Placing Order: {quantity} {coin} | TP {tp} | SL {sl}...")
 
-                order_result = exchange.order(
-                    name=COIN_NAME,
-                    is_buy=True,
-                    sz=quantity,
-                    limit_px=limit_px,
-                    order_type={"limit": {"tif": "Ioc"}},
-                )
+        bracket = await self.gateway.submit(
+            self.brackets.open, coin, True, quantity, current_price, tp=tp, sl=sl
+        )
+        self.own(bracket["rows"])
 
-                if order_result["status"] == "ok":
-                    print("✅ Entry Success! Breaking out of loop.")
-                    break
-                else:
-                    print(f"❌ Entry Failed: {order_result}")
+        if bracket["status"] == "filled":
+            self.log("✅ Entry Success! TP / SL resting on the exchange.")
+            self.stop()
+        else:
+            self.log(f"❌ Entry Failed: {bracket['rows']}")
+            self.retry_at = time.monotonic() + self.retry_delay
 
-            time.sleep(10)
 
+async def run_strategy():
+    account = eth_account.Account.from_key(API_KEY)
+    gateway = Gateway(account, MY_ADDRESS, BASE_URL)
+    runner = Runner(MarketFeed(BASE_URL), gateway)
+    runner.add(DailyBreakout("daily_breakout"))
+    try:
+        await runner.run()
     except Exception as e:
         print(f"\nError: {e}")
+    finally:
+        gateway.close()
 
 
 if __name__ == "__main__":
-    run_strategy()
+    asyncio.run(run_strategy())
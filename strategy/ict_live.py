@@ -0,0 +1,270 @@
+import asyncio
+import os
+import statistics
+import sys
+import time
+from collections import deque
+import eth_account
+from dotenv import load_dotenv
+from hyperliquid.utils import constants
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backtest.ict.h1_poi_m1_m5 import (
+    MIN_DIST,
+    MIN_RISK,
+    POI_PARAMS,
+    RISK_REWARD_RATIO,
+    poi_id,
+)
+from backtest.ict.poi import POITracker
+from backtest.ict.signals import CHoCHStream, EngulfingStream
+from backtest.ict.structure import BULLISH, NEUTRAL, SwingTracker
+from backtest.ict.zone_index import ZoneIndex
+from live.bracket import Brackets
+from live.bulk import BulkOrders
+from live.feed import MarketFeed
+from live.gateway import Gateway
+from live.runner import Runner, Strategy
+
+load_dotenv()
+MY_ADDRESS = os.getenv("HYPER_TESTNET_ACCOUNT_ADDRESS")
+API_KEY = os.getenv("HYPER_TESTNET_PRIVATE_KEY")
+BASE_URL = constants.TESTNET_API_URL
+
+# --- Settings ---
+COIN_NAME = "BTC"
+PERCENT_TO_USE = 0.05
+LEVERAGE = 5
+HISTORY = {"1h": 500, "5m": 100, "1m": 100}  # closed bars loaded at startup
+BUFFER = 500  # closed bars kept per interval
+BALANCE_REFRESH = 30
+
+INTERVAL_MS = {"1h": 3_600_000, "5m": 300_000, "1m": 60_000}
+
+
+def candle_row(candle):
+    # websocket / snapshot candle -> (open time, o, h, l, c)
+    return (
+        candle["t"],
+        float(candle["o"]),
+        float(candle["h"]),
+        float(candle["l"]),
+        float(candle["c"]),
+    )
+
+
+class ICTLive(Strategy):
+    """
+    h1_poi_m1_m5 on live candles.
+
+    H1 closes feed POITracker (displacement OB / FVG zones into a ZoneIndex)
+    and SwingTracker (H1 structure); M5 closes feed the engulfing trigger and
+    M1 closes the CHoCH trigger. Every closed M1 bar runs one decision: the
+    trend picks the side, the zones under the close are stabbed and the
+    first trigger that fired sets the stop, as Engine does on the backtest's
+    M5 clock (live runs on the M1 clock and only sees closed H1 bars). Each
+    step is O(1) in the history length; decision latencies are kept in
+    `latency`.
+
+    An entry goes out as a live.bracket bracket: the Ioc limit and its
+    reduce-only TP / SL triggers in one normalTpsl action, so the exits live
+    on the exchange. One position at a time: a closing fill of its own
+    bracket re-arms, and so does a flat position on the balance refresh
+    (a pre-existing position, a manual close).
+
+    min_risk is in price units and the default MIN_RISK was tuned on BTC;
+    other coins pass their own (strategy/strategies.json does for SOL).
+    """
+
+    places_orders = True
+
+    def __init__(
+        self,
+        name,
+        coin=COIN_NAME,
+        rr=RISK_REWARD_RATIO,
+        min_risk=MIN_RISK,
+        min_dist=MIN_DIST,
+        percent=PERCENT_TO_USE,
+        leverage=LEVERAGE,
+        **poi_params,
+    ):
+        super().__init__(
+            name, coins=(coin,), candles=[(coin, iv) for iv in INTERVAL_MS]
+        )
+        self.coin = coin
+        self.rr = rr
+        self.min_risk = min_risk
+        self.percent = percent
+        self.leverage = leverage
+        self.pois = POITracker("displacement", **{**POI_PARAMS, **poi_params})
+        self.trend = SwingTracker(min_dist=min_dist)
+        self.zones = ZoneIndex(group=poi_id)
+        self.choch = CHoCHStream()
+        self.engulf = EngulfingStream()
+        self.engulf_fresh = False  # an M5 close not yet seen by a decision
+        self.bars = {iv: deque(maxlen=BUFFER) for iv in INTERVAL_MS}
+        self.last_t = dict.fromkeys(INTERVAL_MS)  # open time of the last fed bar
+        self.position = None
+        self.balance = None
+        self.brackets = None
+        self.latency = deque(maxlen=10_000)  # seconds per M1 decision
+
+    # -------------------------
+    # Bars
+    # -------------------------
+    def add_bar(self, interval, row):
+        # -> False for a bar already fed: the feed is live during setup(), so a
+        # close queued then can also be the last bar of the history snapshot
+        t, o, h, l, c = row
+        last = self.last_t[interval]
+        if last is not None and t <= last:
+            return False
+        self.last_t[interval] = t
+        self.bars[interval].append(row)
+        if interval == "1h":
+            self.zones.extend(self.pois.update(t, o, h, l, c))
+            self.trend.update(t, h, l, c)
+        elif interval == "5m":
+            self.engulf.update(o, h, l, c)
+            self.engulf_fresh = True
+        else:
+            self.choch.update(o, h, l, c)
+        return True
+
+    async def load_history(self, interval):
+        now = int(time.time() * 1000)
+        start = now - HISTORY[interval] * INTERVAL_MS[interval]
+        candles = await self.gateway.read(
+            self.gateway.info.candles_snapshot, self.coin, interval, start, now
+        )
+        # the last snapshot candle is still forming
+        return [candle_row(c) for c in candles if c["T"] < now]
+
+    # -------------------------
+    # Decision (M1 close)
+    # -------------------------
+    def decide(self, price):
+        # -> (zone, side, sl, tp) or None
+        if self.position is not None or self.trend.structure == NEUTRAL:
+            return None
+        want = "LONG" if self.trend.structure == BULLISH else "SHORT"
+        for zone in self.zones.stab(price):
+            side = zone["side"]
+            if side != want:
+                continue
+            ok, sl = self.choch.signal(side)
+            if not ok and self.engulf_fresh:
+                ok, sl = self.engulf.signal(side)
+            if not ok:
+                continue
+            risk = abs(price - sl)
+            if risk < self.min_risk:
+                continue
+            tp = price + risk * self.rr if side == "LONG" else price - risk * self.rr
+            return zone, side, sl, tp
+        return None
+
+    async def enter(self, zone, side, price, sl, tp):
+        is_buy = side == "LONG"
+        sz = self.gateway.meta.size_for(
+            self.coin, self.balance * self.percent * self.leverage, price
+        )
+        if sz <= 0:
+            self.log("❌ Calculated quantity is too small.")
+            return
+
+        self.log(f"✨ {side} {sz} @ {price} | SL {sl} | TP {tp} ({zone['type']})")
+        bracket = await self.gateway.submit(
+            self.brackets.open, self.coin, is_buy, sz, price, tp=tp, sl=sl
+        )
+        self.own(bracket["rows"])
+
+        if bracket["status"] == "filled":
+            self.position = {"side": side, "entry": price, "bracket": bracket}
+            self.zones.consume(zone)
+            self.log("✅ Entry filled, TP / SL resting on the exchange.")
+        else:
+            self.log(f"❌ Entry not filled: {bracket['rows']}")
+
+    # -------------------------
+    # Hooks
+    # -------------------------
+    async def setup(self):
+        gateway = self.gateway
+        self.brackets = Brackets(
+            BulkOrders(gateway.exchange, gateway.address, meta=gateway.meta)
+        )
+        histories = await asyncio.gather(*map(self.load_history, INTERVAL_MS))
+        for interval, rows in zip(INTERVAL_MS, histories):
+            for row in rows:
+                self.add_bar(interval, row)
+        self.engulf_fresh = False
+
+        state = await gateway.pre_trade(self.coin, self.leverage, is_cross=False)
+        self.balance = state["balance"]
+        if await self.has_position():
+            self.position = {"side": None}
+            self.log("⚠️ Existing position: waiting for it to close.")
+        self.log(
+            f"🚀 ICT live on {self.coin}: {len(self.zones)} zones, "
+            f"H1 {self.trend.structure}"
+        )
+
+    async def has_position(self):
+        positions = (await self.gateway.user_state())["assetPositions"]
+        return any(
+            p["position"]["coin"] == self.coin and float(p["position"]["szi"])
+            for p in positions
+        )
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(BALANCE_REFRESH)
+            self.balance = await self.gateway.balance()
+            if self.position is not None and not await self.has_position():
+                self.log("🏁 Position is flat, re-armed.")
+                self.position = None
+
+    async def on_candle(self, coin, interval, candle):
+        start = time.perf_counter()
+        if not self.add_bar(interval, candle_row(candle)) or interval != "1m":
+            return
+        price = self.bars["1m"][-1][4]
+        decision = self.decide(price)
+        self.engulf_fresh = False
+        self.latency.append(time.perf_counter() - start)
+        if decision is not None:
+            zone, side, sl, tp = decision
+            await self.enter(zone, side, price, sl, tp)
+
+    async def on_fill(self, coin, fill):
+        # only fills of our own orders arrive here: a TP / SL fill closes
+        if self.position is not None and fill.get("dir", "").startswith("Close"):
+            self.log(f"🏁 Position closed @ {fill['px']} ({fill.get('closedPnl')})")
+            self.position = None
+
+    async def teardown(self):
+        if self.latency:
+            lat = sorted(self.latency)
+            self.log(
+                f"decision latency p50 {statistics.median(lat) * 1e6:.0f}µs | "
+                f"p99 {lat[int(len(lat) * 0.99)] * 1e6:.0f}µs ({len(lat)} bars)"
+            )
+
+
+async def run_strategy():
+    account = eth_account.Account.from_key(API_KEY)
+    gateway = Gateway(account, MY_ADDRESS, BASE_URL)
+    runner = Runner(MarketFeed(BASE_URL), gateway)
+    runner.add(ICTLive(f"ict_{COIN_NAME}"))
+    try:
+        await runner.run()
+    except Exception as e:
+        print(f"\nError: {e}")
+    finally:
+        gateway.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_strategy())
@@ -0,0 +1,79 @@
+import os
+import sys
+import eth_account
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from live.bracket import Brackets
+from live.bulk import BulkOrders
+from live.mock_http import MockHttpServer
+from live.ratelimit import limited_exchange
+
+
+@pytest.fixture
+def mock():
+    account = eth_account.Account.create()
+    with MockHttpServer() as server:
+        yield server, Brackets(BulkOrders(limited_exchange(account, server.base_url)))
+
+
+def actions(server, since):
+    return [kind for path, kind, _, _ in server.log[since:] if path == "/exchange"]
+
+
+def opened(brackets):
+    return brackets.open("BTC", True, 0.01, 95000.0, tp=97000.0, sl=94000.0)
+
+
+def test_move_both_legs(mock):
+    server, brackets = mock
+    bracket = opened(brackets)
+    rows = brackets.move(bracket, tp=98000.0, sl=94500.0)
+    assert [row["ok"] for row in rows] == [True, True]
+    assert (bracket["tp"], bracket["sl"]) == (98000.0, 94500.0)
+
+
+def test_half_move_is_reverted(mock):
+    server, brackets = mock
+    bracket = opened(brackets)
+    since = len(server.log)
+    server.reject_next("batchModify", 1)  # the SL leg
+    brackets.move(bracket, tp=98000.0, sl=94500.0)
+    assert actions(server, since) == ["batchModify", "batchModify"]
+    assert (bracket["tp"], bracket["sl"]) == (97000.0, 94000.0)
+
+
+def test_half_move_cancels_when_revert_fails(mock):
+    server, brackets = mock
+    bracket = opened(brackets)
+    since = len(server.log)
+    server.reject_next("batchModify", 1)
+    server.reject_next("batchModify", 0)  # the TP will not go back
+    brackets.move(bracket, tp=98000.0, sl=94500.0)
+    assert actions(server, since) == ["batchModify", "batchModify", "cancelByCloid"]
+    assert (bracket["tp"], bracket["sl"]) == (None, 94000.0)
+    assert bracket["status"] == "filled"
+
+
+def test_cancel_retries_a_failed_leg(mock):
+    server, brackets = mock
+    bracket = opened(brackets)
+    since = len(server.log)
+    server.reject_next("cancelByCloid", 0)
+    rows = brackets.cancel(bracket)
+    assert actions(server, since) == ["cancelByCloid", "cancelByCloid"]
+    assert len(rows) == 3
+    assert (bracket["tp"], bracket["sl"]) == (None, None)
+
+
+def test_stuck_leg_closes_the_position(mock):
+    server, brackets = mock
+    bracket = opened(brackets)
+    since = len(server.log)
+    server.reject_next("cancelByCloid", 1)
+    server.reject_next("cancelByCloid", 0)
+    rows = brackets.cancel(bracket)
+    assert actions(server, since) == ["cancelByCloid", "cancelByCloid", "order"]
+    assert rows[-1]["status"] == "filled"
+    assert bracket["status"] == "closed"
+    assert (bracket["tp"], bracket["sl"]) == (None, 94000.0)
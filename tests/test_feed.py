@@ -0,0 +1,72 @@
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from live.feed import MarketFeed
+from live.mock_ws import MockWsServer
+
+USER = "0x" + "ab" * 20
+
+
+def book(coin, bid, ask):
+    return {
+        "coin": coin,
+        "time": 0,
+        "levels": [
+            [{"px": str(bid), "sz": "1.0", "n": 1}],
+            [{"px": str(ask), "sz": "1.0", "n": 1}],
+        ],
+    }
+
+
+def wait_for(check, timeout=5.0):
+    end = time.monotonic() + timeout
+    while not check():
+        assert time.monotonic() < end, "timed out"
+        time.sleep(0.01)
+
+
+def test_repeated_watch_subscribes_once():
+    with MockWsServer() as server, MarketFeed(server.base_url) as feed:
+        first = feed.watch_book("BTC")
+        assert feed.watch_book("BTC") == first
+        feed.watch_fills(USER)
+        feed.watch_fills(USER)  # the SDK raises on a second userFills
+        feed.watch_orders(USER)
+        feed.watch_orders(USER)
+        wait_for(lambda: server.subscribers() == 3)
+
+        got = []
+        feed.on("l2Book", lambda coin, value: got.append(value), coin="BTC")
+        server.publish("l2Book", book("BTC", 100.0, 101.0))
+        assert feed.wait_price("BTC", timeout=5) == 100.5
+        time.sleep(0.1)
+        assert len(got) == 1
+
+
+def test_prices_and_fanout():
+    with MockWsServer() as server, MarketFeed(server.base_url) as feed:
+        feed.watch_mids()
+        feed.watch_fills(USER)
+        wait_for(lambda: server.subscribers() == 2)
+
+        prices, fills = [], []
+        done = threading.Event()
+        feed.on("price", lambda coin, px: prices.append((coin, px)))
+        feed.on("userFills", lambda coin, fill: (fills.append(fill), done.set()))
+
+        server.publish("allMids", {"mids": {"BTC": "95000.5", "ETH": "3500.1"}})
+        # the snapshot sent on subscribe is history, not a new fill
+        snapshot = {"coin": "BTC", "px": "1", "sz": "1", "tid": 1}
+        server.publish(
+            "userFills", {"user": USER, "isSnapshot": True, "fills": [snapshot]}
+        )
+        fill = {"coin": "ETH", "px": "3500.1", "sz": "0.1", "tid": 2}
+        server.publish("userFills", {"user": USER, "fills": [fill]})
+
+        assert done.wait(5)
+        assert feed.price("BTC") == 95000.5
+        assert sorted(prices) == [("BTC", 95000.5), ("ETH", 3500.1)]
+        assert fills == [fill]
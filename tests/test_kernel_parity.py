@@ -0,0 +1,47 @@
+import os
+import sys
+from importlib import import_module
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backtest.ict.engine import Bars
+from candle.synthetic import synthetic_mtf
+
+# Engine(jit=True) runs backtest.ict.kernel.ict_loop; it has to give the
+# Python loop's trades bit for bit on every ICT script.
+SCRIPTS = ["h1_ict_1", "h1_ict_2", "h1_poi_m1_m5", "h1_fvg_m1"]
+SEEDS = range(6)
+MINUTES = 30 * 1440
+
+
+def typed(trades):
+    # equal values of different types (np.float64 vs float) are a mismatch
+    return [{k: (type(v).__name__, v) for k, v in t.items()} for t in trades]
+
+
+def run(script, bars, jit, single=True):
+    engine = import_module(f"backtest.ict.{script}").make_engine(jit=jit)
+    engine.single_position = single
+    return typed(engine.run_bars(Bars(*bars))), engine.open_trade
+
+
+@pytest.fixture(scope="module", params=SEEDS)
+def bars(request):
+    frames = synthetic_mtf(MINUTES, request.param, gaps=5)
+    return frames["1h"], frames["5m"], frames["1m"]
+
+
+@pytest.mark.parametrize("single", [True, False])
+@pytest.mark.parametrize("script", SCRIPTS)
+def test_kernel_matches_loop(bars, script, single):
+    assert run(script, bars, jit=True, single=single) == run(
+        script, bars, jit=False, single=single
+    )
+
+
+def test_frames_produce_trades():
+    # guard against the comparison above passing on empty trade lists
+    frames = synthetic_mtf(MINUTES, 0, gaps=5)
+    for script in SCRIPTS:
+        trades, _ = run(script, (frames["1h"], frames["5m"], frames["1m"]), jit=False)
+        assert trades, script
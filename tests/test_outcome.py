@@ -0,0 +1,187 @@
+import os
+import sys
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backtest.outcome import (
+    LOSE,
+    OPEN,
+    WIN,
+    FirstPassage,
+    resolve_outcomes,
+    scan_outcomes,
+)
+
+SEEDS = range(20)
+M1_PER_BAR = 5
+BAR_MS = M1_PER_BAR * 60_000
+
+
+# =====================================================
+# Brute-force reference
+# =====================================================
+def first_touch(high, low, lo, hi, is_long, tp, sl):
+    # -> (bar touching tp, bar touching sl) scanning [lo, hi); hi if never
+    tp_at = sl_at = hi
+    for j in range(lo, hi):
+        if tp_at == hi and (high[j] >= tp if is_long else low[j] <= tp):
+            tp_at = j
+        if sl_at == hi and (low[j] <= sl if is_long else high[j] >= sl):
+            sl_at = j
+    return tp_at, sl_at
+
+
+def brute(high, low, start, long, tp, sl, ambiguous="tp", m1=None, end=None):
+    # bar-by-bar scan; same-bar TP / SL decided by `ambiguous`
+    end = len(high) if end is None else end
+    results, exits = [], []
+    for s, is_long, t, stop in zip(start, long, tp, sl):
+        tp_at, sl_at = first_touch(high, low, s, end, is_long, t, stop)
+        j = min(tp_at, sl_at)
+        if j == end:
+            result = OPEN
+        elif tp_at != sl_at:
+            result = WIN if tp_at < sl_at else LOSE
+        elif ambiguous == "sl":
+            result = LOSE
+        elif ambiguous == "m1":
+            m1_high, m1_low = m1
+            lo, hi = j * M1_PER_BAR, (j + 1) * M1_PER_BAR
+            m1_tp, m1_sl = first_touch(m1_high, m1_low, lo, hi, is_long, t, stop)
+            result = LOSE if m1_sl < m1_tp else WIN
+        else:
+            result = WIN
+        results.append(result)
+        exits.append(j)
+    return np.array(results), np.array(exits)
+
+
+# =====================================================
+# Data
+# =====================================================
+def market(seed, bars=200):
+    # integer-grid 1m bars and their M1_PER_BAR aggregates, so base bars
+    # touching both levels are frequent and the 1m replay has work to do
+    rng = np.random.default_rng(seed)
+    n = bars * M1_PER_BAR
+    close = 100 + np.cumsum(rng.integers(-2, 3, n))
+    m1_high = close + rng.integers(0, 5, n)
+    m1_low = close - rng.integers(0, 5, n)
+    high = m1_high.reshape(bars, M1_PER_BAR).max(axis=1).astype(float)
+    low = m1_low.reshape(bars, M1_PER_BAR).min(axis=1).astype(float)
+    return high, low, m1_high.astype(float), m1_low.astype(float)
+
+
+def entries(seed, high, low, count=300):
+    rng = np.random.default_rng(seed + 1000)
+    n = len(high)
+    start = rng.integers(0, n + 1, count)
+    long = rng.random(count) < 0.5
+    # levels around the mid of the bar before entry, like an entry at its close
+    prev = np.clip(start - 1, 0, n - 1)
+    ref = np.round((high[prev] + low[prev]) / 2)
+    up, down = rng.integers(1, 6, count), rng.integers(1, 6, count)
+    tp = np.where(long, ref + up, ref - up).astype(float)
+    sl = np.where(long, ref - down, ref + down).astype(float)
+    return start, long, tp, sl
+
+
+def m1_args(m1_high, m1_low):
+    times = np.arange(len(m1_high), dtype=np.int64) * 60_000
+    bar_times = np.arange(len(m1_high) // M1_PER_BAR, dtype=np.int64) * BAR_MS
+    return dict(
+        m1=(FirstPassage(m1_high, m1_low), times), bar_times=bar_times, bar_ms=BAR_MS
+    )
+
+
+# =====================================================
+# Tests
+# =====================================================
+@pytest.mark.parametrize("seed", SEEDS)
+def test_first_passage_matches_scan(seed):
+    high, low, _, _ = market(seed)
+    fp = FirstPassage(high, low)
+    rng = np.random.default_rng(seed)
+    start = rng.integers(0, len(high) + 1, 200)
+    level = rng.integers(80, 130, 200).astype(float)
+    above = [
+        next((j for j in range(s, len(high)) if high[j] >= v), len(high))
+        for s, v in zip(start, level)
+    ]
+    below = [
+        next((j for j in range(s, len(low)) if low[j] <= v), len(low))
+        for s, v in zip(start, level)
+    ]
+    assert fp.first_at_or_above(start, level).tolist() == above
+    assert fp.first_at_or_below(start, level).tolist() == below
+
+
+@pytest.mark.parametrize("ambiguous", ["tp", "sl", "m1"])
+@pytest.mark.parametrize("seed", SEEDS)
+def test_resolve_matches_brute_force(seed, ambiguous):
+    high, low, m1_high, m1_low = market(seed)
+    start, long, tp, sl = entries(seed, high, low)
+    extra = m1_args(m1_high, m1_low) if ambiguous == "m1" else {}
+    got = resolve_outcomes(
+        FirstPassage(high, low),
+        start,
+        long.astype(int) * 2 - 1,
+        tp,
+        sl,
+        ambiguous,
+        **extra,
+    )
+    want = brute(high, low, start, long, tp, sl, ambiguous, (m1_high, m1_low))
+    assert got[0].tolist() == want[0].tolist()
+    assert got[1].tolist() == want[1].tolist()
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_resolve_with_end(seed):
+    high, low, _, _ = market(seed)
+    start, long, tp, sl = entries(seed, high, low)
+    end = len(high) // 2
+    start = np.minimum(start, end)  # walk-forward entries sit inside the window
+    side = np.where(long, "LONG", "SHORT")
+    got = resolve_outcomes(FirstPassage(high, low), start, side, tp, sl, end=end)
+    want = brute(high, low, start, long, tp, sl, end=end)
+    assert got[0].tolist() == want[0].tolist()
+    assert got[1].tolist() == want[1].tolist()
+
+
+@pytest.mark.skipif(scan_outcomes is None, reason="numba not installed")
+@pytest.mark.parametrize("seed", SEEDS)
+def test_numba_matches_numpy(seed):
+    high, low, _, _ = market(seed)
+    start, long, tp, sl = entries(seed, high, low)
+    fp = FirstPassage(high, low)
+    side = np.where(long, "LONG", "SHORT")
+    fast = resolve_outcomes(fp, start, side, tp, sl, engine="numba")
+    slow = resolve_outcomes(fp, start, side, tp, sl)
+    assert fast[0].tolist() == slow[0].tolist()
+    assert fast[1].tolist() == slow[1].tolist()
+
+
+def test_same_bar_hit_resolved_both_ways():
+    # bar 1 spans both levels: the 1m replay decides which came first
+    high = np.array([101.0, 106.0, 101.0])
+    low = np.array([99.0, 94.0, 99.0])
+    fp = FirstPassage(high, low)
+    args = (fp, [1], ["LONG"], [105.0], [95.0])
+    for ambiguous, want in (("tp", WIN), ("sl", LOSE)):
+        result, exit_idx = resolve_outcomes(*args, ambiguous)
+        assert result.tolist() == [want] and exit_idx.tolist() == [1]
+
+    times = np.arange(15, dtype=np.int64) * 60_000
+    bar_times = np.arange(3, dtype=np.int64) * BAR_MS
+    flat_h, flat_l = np.full(15, 101.0), np.full(15, 99.0)
+    for dip_first, want in ((True, LOSE), (False, WIN)):
+        m1_h, m1_l = flat_h.copy(), flat_l.copy()
+        m1_l[6 if dip_first else 8] = 94.0
+        m1_h[8 if dip_first else 6] = 106.0
+        m1 = (FirstPassage(m1_h, m1_l), times)
+        result, exit_idx = resolve_outcomes(
+            *args, "m1", m1=m1, bar_times=bar_times, bar_ms=BAR_MS
+        )
+        assert result.tolist() == [want] and exit_idx.tolist() == [1]
@@ -0,0 +1,281 @@
+import os
+import sys
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backtest.ict.poi import POITracker, find_pois_displacement, find_pois_ict
+from candle.synthetic import synthetic_ohlcv
+
+# The row-by-row find_h1_pois loops the vectorized detectors replaced, kept
+# as the reference: h1_ict_1 / h1_ict_2 (ict) and h1_poi_m1_m5 / h1_fvg_m1
+# (displacement) only differed in zone names and the FVG branch.
+SEEDS = range(20)
+SIZES = [10, 28, 29, 30, 31, 60, 400]
+
+
+# =====================================================
+# Reference implementations
+# =====================================================
+def ref_pois_ict(df, n=24, fvg_type="FVG", ob_type="OB"):
+    pois = []
+
+    if len(df) < n + 5:
+        return pois
+
+    for i in range(n, len(df)):
+        c1, c2, c3 = df.iloc[i - 2], df.iloc[i - 1], df.iloc[i]
+        prev_bodies = abs(
+            df["close"].iloc[i - (n + 1) : i - 1] - df["open"].iloc[i - (n + 1) : i - 1]
+        )
+        avg_body = prev_bodies.mean()
+        if abs(c2["close"] - c2["open"]) < (avg_body * 2.0):
+            continue
+        is_long_gap = c3["low"] > c1["high"]
+        is_short_gap = c3["high"] < c1["low"]
+        if not (is_long_gap or is_short_gap):
+            continue
+
+        if (
+            is_long_gap
+            and c1["close"] > c1["open"]
+            and c2["close"] > c2["open"]
+            and c3["close"] > c3["open"]
+        ):
+            fvg_t, fvg_b = c3["low"], c1["high"]
+            for j in range(i - n, i - 2):
+                prev = df.iloc[j]
+                if prev["close"] < prev["open"]:
+                    u_t, u_b = prev["high"], max(prev["open"], prev["close"])
+                    top, bot = min(fvg_t, u_t), max(fvg_b, u_b)
+                    if top > bot:
+                        pois.append(
+                            {
+                                "side": "LONG",
+                                "type": fvg_type,
+                                "top": top,
+                                "bottom": bot,
+                            }
+                        )
+                        break
+        elif (
+            is_short_gap
+            and c1["close"] < c1["open"]
+            and c2["close"] < c2["open"]
+            and c3["close"] < c3["open"]
+        ):
+            fvg_t, fvg_b = c1["low"], c3["high"]
+            for j in range(i - n, i - 2):
+                prev = df.iloc[j]
+                if prev["close"] > prev["open"]:
+                    l_t, l_b = min(prev["open"], prev["close"]), prev["low"]
+                    top, bot = min(fvg_t, l_t), max(fvg_b, l_b)
+                    if top > bot:
+                        pois.append(
+                            {
+                                "side": "SHORT",
+                                "type": fvg_type,
+                                "top": top,
+                                "bottom": bot,
+                            }
+                        )
+                        break
+
+        if is_long_gap and (
+            (
+                c1["close"] < c1["open"]
+                and c2["close"] > c2["open"]
+                and c3["close"] > c3["open"]
+            )
+            or (
+                c1["close"] > c1["open"]
+                and c2["close"] > c2["open"]
+                and c3["close"] < c3["open"]
+            )
+        ):
+            pois.append(
+                {
+                    "side": "LONG",
+                    "type": ob_type,
+                    "top": c1["high"],
+                    "bottom": c1["low"],
+                }
+            )
+        elif is_short_gap and (
+            (
+                c1["close"] > c1["open"]
+                and c2["close"] < c2["open"]
+                and c3["close"] < c3["open"]
+            )
+            or (
+                c1["close"] < c1["open"]
+                and c2["close"] < c2["open"]
+                and c3["close"] > c3["open"]
+            )
+        ):
+            pois.append(
+                {
+                    "side": "SHORT",
+                    "type": ob_type,
+                    "top": c1["high"],
+                    "bottom": c1["low"],
+                }
+            )
+    return pois
+
+
+def is_displacement(c, prev, factor=2.0):
+    bodies = (prev["close"] - prev["open"]).abs()
+    return abs(c["close"] - c["open"]) >= bodies.mean() * factor
+
+
+def ref_pois_displacement(df, lookback=30, fvg=True):
+    pois = []
+
+    for i in range(lookback, len(df)):
+        c1, c2, c3 = df.iloc[i - 2], df.iloc[i - 1], df.iloc[i]
+        prev = df.iloc[i - lookback : i - 1]
+
+        if not is_displacement(c2, prev):
+            continue
+
+        bull_gap = c3["low"] > c1["high"]
+        bear_gap = c3["high"] < c1["low"]
+        if not (bull_gap or bear_gap):
+            continue
+
+        colors = [
+            c1["close"] > c1["open"],
+            c2["close"] > c2["open"],
+            c3["close"] > c3["open"],
+        ]
+        bulls = sum(colors)
+        bears = 3 - bulls
+
+        # ---------- OB ----------
+        if bulls == 2 or bears == 2:
+            pois.append(
+                {
+                    "type": "OB",
+                    "side": "LONG" if bulls == 2 else "SHORT",
+                    "top": c1["high"],
+                    "bottom": c1["low"],
+                    "created": df.index[i],
+                }
+            )
+            continue
+
+        if not fvg:
+            continue
+
+        # ---------- Enhanced FVG ----------
+        if bulls == 3 and bull_gap:
+            fvg_top, fvg_bot = c3["low"], c1["high"]
+            for j in range(i - lookback, i - 2):
+                p = df.iloc[j]
+                if p["close"] < p["open"]:
+                    wt, wb = p["high"], max(p["open"], p["close"])
+                    top, bot = min(fvg_top, wt), max(fvg_bot, wb)
+                    if top > bot:
+                        pois.append(
+                            {
+                                "type": "FVG",
+                                "side": "LONG",
+                                "top": top,
+                                "bottom": bot,
+                                "created": df.index[i],
+                            }
+                        )
+                        break
+
+        if bears == 3 and bear_gap:
+            fvg_top, fvg_bot = c1["low"], c3["high"]
+            for j in range(i - lookback, i - 2):
+                p = df.iloc[j]
+                if p["close"] > p["open"]:
+                    wt, wb = min(p["open"], p["close"]), p["low"]
+                    top, bot = min(fvg_top, wt), max(fvg_bot, wb)
+                    if top > bot:
+                        pois.append(
+                            {
+                                "type": "FVG",
+                                "side": "SHORT",
+                                "top": top,
+                                "bottom": bot,
+                                "created": df.index[i],
+                            }
+                        )
+                        break
+    return pois
+
+
+# =====================================================
+# Data
+# =====================================================
+def frame(n, seed):
+    # synthetic H1 candles with ~5% dojis (open == close)
+    df = synthetic_ohlcv(n, "1h", seed)
+    doji = np.random.default_rng(seed).random(len(df)) < 0.05
+    df.loc[doji, "open"] = df.loc[doji, "close"]
+    return df
+
+
+def records(zones, keys):
+    return [{k: z[k] for k in keys} for z in zones]
+
+
+KEYS = ["type", "side", "top", "bottom"]
+DETECTORS = [
+    # (reference, vectorized, keys compared)
+    (
+        lambda df: ref_pois_ict(df, fvg_type="FVG_Wick_Overlap", ob_type="OB_Pattern"),
+        lambda df: find_pois_ict(df, fvg_type="FVG_Wick_Overlap", ob_type="OB_Pattern"),
+        KEYS,
+    ),
+    (ref_pois_ict, find_pois_ict, KEYS),
+    (ref_pois_displacement, find_pois_displacement, KEYS + ["created"]),
+    (
+        lambda df: ref_pois_displacement(df, fvg=False),
+        lambda df: find_pois_displacement(df, fvg=False),
+        KEYS + ["created"],
+    ),
+]
+DETECTOR_IDS = ["h1_ict_1", "h1_ict_2", "h1_poi_m1_m5", "h1_fvg_m1"]
+
+
+# =====================================================
+# Tests
+# =====================================================
+@pytest.mark.parametrize("ref, fast, keys", DETECTORS, ids=DETECTOR_IDS)
+@pytest.mark.parametrize("n", SIZES)
+def test_find_pois_matches_row_by_row(ref, fast, keys, n):
+    for seed in SEEDS:
+        df = frame(n, seed)
+        want = records(ref(df), keys)
+        got = records(fast(df).to_dict("records"), keys)
+        assert got == want, f"seed {seed}"
+
+
+def test_frames_produce_zones():
+    # guards the parity test against comparing empty lists only
+    total = sum(len(find_pois_displacement(frame(400, s))) for s in SEEDS)
+    assert total > 100
+
+
+def test_zone_pos_and_created():
+    df = frame(400, 0)
+    zones = find_pois_displacement(df)
+    assert (df.index[zones["pos"]] == zones["created"]).all()
+
+
+@pytest.mark.parametrize("kind, params", [("ict", {}), ("displacement", {})])
+def test_tracker_matches_batch(kind, params):
+    df = frame(300, 1)
+    tracker = POITracker(kind, **params)
+    for ts, row in df.iterrows():
+        tracker.update(ts, row["open"], row["high"], row["low"], row["close"])
+    finder = find_pois_ict if kind == "ict" else find_pois_displacement
+    want = finder(df, **params).to_dict("records")
+    assert records(tracker.zones, KEYS + ["created", "pos"]) == records(
+        want, KEYS + ["created", "pos"]
+    )
@@ -0,0 +1,110 @@
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from hyperliquid.utils.error import ClientError
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from live.mock_http import MockHttpServer
+from live.ratelimit import BACKFILL, WRITE, RateLimiter
+
+
+@pytest.fixture
+def server():
+    with MockHttpServer() as server:
+        yield server
+
+
+def sent(server, kind):
+    # statuses of every request of one type, in order
+    return [status for _, k, _, status in server.log if k == kind]
+
+
+def test_429_is_retried(server):
+    limiter = RateLimiter(max_retries=2, backoff=0.01)
+    info = limiter.info(server.base_url)
+    server.fail_next(2)
+    assert info.all_mids() == server.mids
+    assert sent(server, "allMids") == [429, 429, 200]
+    assert limiter.metrics()["throttled"] == 2
+
+
+def test_429_raises_after_max_retries(server):
+    limiter = RateLimiter(max_retries=2, backoff=0.01)
+    info = limiter.info(server.base_url)
+    server.fail_next(3)
+    with pytest.raises(ClientError) as e:
+        info.all_mids()
+    assert e.value.status_code == 429
+    assert sent(server, "allMids") == [429, 429, 429]
+
+
+def test_identical_reads_in_flight_send_once(server):
+    limiter = RateLimiter()
+    info = limiter.info(server.base_url)
+    server.latency = 0.2
+    with ThreadPoolExecutor(5) as pool:
+        results = list(pool.map(lambda _: info.all_mids(), range(5)))
+    assert sent(server, "allMids") == [200]
+    assert results == [server.mids] * 5
+    assert len({id(r) for r in results}) == 5  # every caller owns its copy
+    assert limiter.metrics()["coalesced"] == 4
+
+
+def test_candles_charged_per_60_items(server):
+    limiter = RateLimiter()
+    info = limiter.info(server.base_url)
+    server.candles = [{"t": i} for i in range(150)]
+    before = limiter.metrics()["weight"]
+    assert len(info.candles_snapshot("BTC", "1m", 0, 1)) == 150
+    assert limiter.metrics()["weight"] - before == 20 + 150 // 60
+
+
+def test_coalesced_candles_charged_once(server):
+    limiter = RateLimiter()
+    info = limiter.info(server.base_url)
+    server.candles = [{"t": i} for i in range(600)]
+    server.latency = 0.2
+    before = limiter.metrics()["weight"]
+    with ThreadPoolExecutor(3) as pool:
+        list(pool.map(lambda _: info.candles_snapshot("BTC", "1m", 0, 1), range(3)))
+    assert sent(server, "candleSnapshot") == [200]
+    assert limiter.metrics()["weight"] - before == 20 + 600 // 60
+
+
+def test_write_jumps_queued_backfill():
+    limiter = RateLimiter(limit=100, window=0.3, reserve=0, slack=0)
+    limiter.acquire(100, WRITE)  # spend the window
+    order = []
+
+    def wait(weight, priority):
+        limiter.acquire(weight, priority)
+        order.append(priority)
+
+    backfill = threading.Thread(target=wait, args=(100, BACKFILL))
+    backfill.start()
+    while limiter.metrics()["queued"] < 1:
+        time.sleep(0.001)
+    write = threading.Thread(target=wait, args=(100, WRITE))
+    write.start()
+    while limiter.metrics()["queued"] < 2:
+        time.sleep(0.001)
+    backfill.join()
+    write.join()
+    assert order == [WRITE, BACKFILL]
+
+
+def test_reserve_floors():
+    # each lower class leaves RESERVE weight per step unspent
+    limiter = RateLimiter(limit=100, window=60, reserve=20)
+    limiter.acquire(60, BACKFILL)
+    done = threading.Event()
+    waiter = threading.Thread(
+        target=lambda: (limiter.acquire(1, BACKFILL), done.set()), daemon=True
+    )
+    waiter.start()
+    assert not done.wait(0.1)  # 61 + 2 * 20 > 100
+    limiter.acquire(30, WRITE)  # a write still fits
+    assert limiter.metrics()["used_window"] == 90
@@ -0,0 +1,124 @@
+import os
+import random
+import sys
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backtest.ict.zone_index import ZoneIndex
+
+SEEDS = range(30)
+
+
+# =====================================================
+# Brute-force reference
+# =====================================================
+class ZoneList:
+    # the linear scan ZoneIndex replaced: a list in insertion order
+    def __init__(self, group):
+        self.group = group
+        self.zones = []
+        self.used = set()
+
+    def insert(self, zone):
+        if self.group(zone) not in self.used:
+            self.zones.append(zone)
+
+    def consume(self, zone):
+        gid = self.group(zone)
+        self.used.add(gid)
+        self.zones = [z for z in self.zones if self.group(z) != gid]
+
+    def overlap(self, low, high):
+        return [z for z in self.zones if z["bottom"] <= high and z["top"] >= low]
+
+
+def zone(rng, n):
+    # bounds on a coarse grid, so equal bottoms / tops are common
+    bottom = rng.randint(0, 20)
+    return {"id": n, "bottom": float(bottom), "top": float(bottom + rng.randint(0, 5))}
+
+
+def group(z):
+    return z["id"] // 2  # pairs of zones share a "used" id
+
+
+def check_tree(node):
+    # BST order on key, heap order on prio, max_top is the subtree max
+    if node is None:
+        return float("-inf")
+    tops = [node.top]
+    for child, before in ((node.left, True), (node.right, False)):
+        if child is not None:
+            assert (child.key < node.key) == before
+            assert child.prio <= node.prio
+            tops.append(check_tree(child))
+    assert node.max_top == max(tops)
+    return node.max_top
+
+
+def ids(zones):
+    return [z["id"] for z in zones]
+
+
+# =====================================================
+# Tests
+# =====================================================
+@pytest.mark.parametrize("seed", SEEDS)
+def test_random_ops_match_brute_force(seed):
+    rng = random.Random(seed)
+    index, ref = ZoneIndex(group), ZoneList(group)
+    made = []
+    for n in range(300):
+        op = rng.random()
+        if op < 0.5 or not made:
+            z = zone(rng, n)
+            made.append(z)
+            index.insert(z)
+            ref.insert(z)
+        elif op < 0.7:
+            z = rng.choice(made)
+            index.consume(z)
+            ref.consume(z)
+        else:
+            lo = rng.randint(-2, 27) + rng.choice([0.0, 0.5])
+            hi = lo + rng.choice([0, 0, 1, 3])
+            assert ids(index.overlap(lo, hi)) == ids(ref.overlap(lo, hi))
+            assert ids(index.stab(lo)) == ids(ref.overlap(lo, lo))
+        assert len(index) == len(ref.zones)
+        check_tree(index.root)
+
+
+def test_duplicate_bounds():
+    index = ZoneIndex(lambda z: z["id"])
+    zones = [{"id": n, "bottom": 10.0, "top": 12.0} for n in range(5)]
+    index.extend(zones)
+    assert ids(index.stab(10.0)) == [0, 1, 2, 3, 4]
+    assert ids(index.stab(12.0)) == [0, 1, 2, 3, 4]
+    assert index.stab(12.5) == []
+    index.consume(zones[2])
+    assert ids(index.overlap(9.0, 11.0)) == [0, 1, 3, 4]
+    check_tree(index.root)
+
+
+def test_remove_root():
+    index = ZoneIndex(lambda z: z["id"])
+    rng = random.Random(7)
+    zones = [zone(rng, n) for n in range(50)]
+    index.extend(zones)
+    alive = list(zones)
+    while index.root is not None:
+        root = index.root.zone
+        index.consume(root)
+        alive.remove(root)
+        assert index.root is None or index.root.zone is not root
+        assert ids(index.overlap(-1.0, 30.0)) == ids(alive)
+        check_tree(index.root)
+    assert len(index) == 0
+
+
+def test_consumed_group_stays_out():
+    index = ZoneIndex(lambda z: z["id"])
+    index.insert({"id": 1, "bottom": 1.0, "top": 2.0})
+    index.consume({"id": 1, "bottom": 1.0, "top": 2.0})
+    assert index.insert({"id": 1, "bottom": 5.0, "top": 6.0}) is None
+    assert index.stab(5.5) == []